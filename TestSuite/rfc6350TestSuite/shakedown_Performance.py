@@ -0,0 +1,161 @@
+#!/usr/bin/env python
+# -*- coding: UTF-8 -*-
+#-----------------------------------------------------------------------------
+"""RFC6350 performance measurements."""
+__author__ = ('Lance Finn Helsten',)
+__version__ = '1.0'
+__copyright__ = """Copyright 2011 Lance Finn Helsten (helsten@acm.org)"""
+__license__ = """
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+__docformat__ = "reStructuredText en"
+
+import sys
+import io
+import gc
+import copy
+import pickle
+import time
+import tracemalloc
+import unittest
+
+from TestSuite import utils
+from pyietflib.rfc6350 import *
+from pyietflib.rfc6350.vcard import contentline_generator
+
+def sample_cards(count):
+    """Return a UTF-8 encoded stream of `count` vCards with a realistic
+    mix of properties and parameters."""
+    ret = []
+    for i in range(count):
+        ret.append((
+            'BEGIN:VCARD\r\n'
+            'VERSION:4.0\r\n'
+            'UID:urn:uuid:4fbe8971-0bc3-424c-9c26-{0:012d}\r\n'
+            'FN:Person {0}\r\n'
+            'N:Doe{0};John;;;\r\n'
+            'BDAY:1966-08-29\r\n'
+            'GENDER:M\r\n'
+            'LANG;PREF=1:fr\r\n'
+            'ORG;TYPE=work:Viagenie\r\n'
+            'ADR;TYPE=work:;Suite D2-630;2875 Laurier;Quebec;QC;G1V 2M2;Canada\r\n'
+            'TEL;VALUE=uri;TYPE="work,voice";PREF=1:tel:+1-418-656-{1:04d}\r\n'
+            'TEL;VALUE=uri;TYPE="home,cell":tel:+1-418-262-{1:04d}\r\n'
+            'EMAIL;TYPE=work:person{0}@example.com\r\n'
+            'EMAIL;TYPE=home;PREF=1:p{0}@home.example.org\r\n'
+            'GEO;TYPE=work:geo:46.772673,-71.282945\r\n'
+            'NOTE;LANGUAGE=en:A note about card {0}.\r\n'
+            'URL;TYPE=home:http://example.org/{0}\r\n'
+            'X-SOCIALPROFILE;TYPE=twitter:http://twitter.com/p{0}\r\n'
+            'END:VCARD\r\n').format(i, i % 10000))
+    return io.BytesIO(''.join(ret).encode('UTF-8'))
+
+
+def report(name, value, unit):
+    print('{0:40s} {1:12.1f} {2}'.format(name, value, unit))
+
+
+class MemoryFootprint(unittest.TestCase):
+    """Measure the memory held by parsed vCards."""
+
+    count = 2000
+
+    def footprint(self, **options):
+        # Parse one card first so the one time loading of registries is
+        # not counted.
+        for vcard in vcard_generator(sample_cards(1)):
+            vcard['LANG'][0].parameters
+            vcard['NOTE'][0].parameters
+        stream = sample_cards(self.count)
+        gc.collect()
+        tracemalloc.start()
+        cards = list(vcard_generator(stream, **options))
+        gc.collect()
+        size = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+        return size / len(cards)
+
+    @utils.skip_unless_accept_level(utils.SHAKEDOWN)
+    def runTest(self):
+        report('vCard footprint', self.footprint(), 'bytes/card')
+        report('vCard footprint (lazy)', self.footprint(lazy=True), 'bytes/card')
+        report('vCard footprint (intern)', self.footprint(intern=True), 'bytes/card')
+        report('vCard footprint (lazy, intern)', self.footprint(lazy=True, intern=True), 'bytes/card')
+
+
+class Dispatch(unittest.TestCase):
+    """Measure building properties and parameters from the content lines
+    of the sample vCards."""
+
+    count = 200
+    repeat = 5
+
+    def best(self, func, items):
+        ret = None
+        for i in range(self.repeat):
+            start = time.perf_counter()
+            for item in items:
+                func(*item)
+            elapsed = time.perf_counter() - start
+            ret = elapsed if ret is None else min(ret, elapsed)
+        return ret * 1e9 / len(items)
+
+    @utils.skip_unless_accept_level(utils.SHAKEDOWN)
+    def runTest(self):
+        lines = [(line, linenum) for line, linenum in contentline_generator(sample_cards(self.count))
+                if not line.startswith(('BEGIN:', 'VERSION:', 'END:'))]
+        params = [(p.name, p.valuestr) for line, linenum in lines
+                for p in property_from_contentline(line).parameters]
+        property_from_contentline(*lines[0])
+        report('property_from_contentline', self.best(property_from_contentline, lines), 'ns/line')
+        lazy = [(line, linenum, True) for line, linenum in lines]
+        report('property_from_contentline (lazy)', self.best(property_from_contentline, lazy), 'ns/line')
+        report('build_parameter', self.best(build_parameter, params), 'ns/param')
+
+
+class PickleCopy(unittest.TestCase):
+    """Measure the round trip of parsed vCards through pickle, as when
+    they are moved between processes, and copying them."""
+
+    count = 2000
+    repeat = 3
+
+    def best(self, func, *args):
+        ret = None
+        for i in range(self.repeat):
+            gc.collect()
+            start = time.perf_counter()
+            func(*args)
+            elapsed = time.perf_counter() - start
+            ret = elapsed if ret is None else min(ret, elapsed)
+        return ret * 1e6 / self.count
+
+    def measure(self, lazy):
+        cards = list(vcard_generator(sample_cards(self.count), lazy=lazy))
+        data = pickle.dumps(cards, pickle.HIGHEST_PROTOCOL)
+        mode = ' (lazy)' if lazy else ''
+        report('pickle size' + mode, len(data) / self.count, 'bytes/card')
+        report('pickle.dumps' + mode, self.best(pickle.dumps, cards, pickle.HIGHEST_PROTOCOL), 'us/card')
+        report('pickle.loads' + mode, self.best(pickle.loads, data), 'us/card')
+        report('copy.copy' + mode, self.best(lambda: [copy.copy(c) for c in cards]), 'us/card')
+        report('copy.deepcopy' + mode, self.best(copy.deepcopy, cards), 'us/card')
+
+    @utils.skip_unless_accept_level(utils.SHAKEDOWN)
+    def runTest(self):
+        self.measure(False)
+        self.measure(True)
+
+
+if __name__ == '__main__':
+    utils.set_accept_level(utils.SHAKEDOWN)
+    unittest.main()
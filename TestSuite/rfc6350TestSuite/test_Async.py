@@ -0,0 +1,87 @@
+#!/usr/bin/env python
+# -*- coding: UTF-8 -*-
+#-----------------------------------------------------------------------------
+"""RFC6350 Unit Test."""
+__author__ = ('Lance Finn Helsten',)
+__version__ = '1.0'
+__copyright__ = """Copyright 2011 Lance Finn Helsten (helsten@acm.org)"""
+__license__ = """
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+__docformat__ = "reStructuredText en"
+
+import sys
+import asyncio
+import unittest
+
+import pyietflib
+from pyietflib.rfc6350 import *
+
+data = (b'BEGIN:VCARD\r\nVERSION:4.0\r\n'
+    b'FN:First Card\r\n'
+    b'NOTE:A long note that has been\r\n folded\r\n'
+    b'END:VCARD\r\n'
+    b'BEGIN:VCARD\r\nVERSION:4.0\r\n'
+    b'FN:Second Card\r\n'
+    b'END:VCARD\r\n')
+
+def stream_reader(data):
+    reader = asyncio.StreamReader()
+    reader.feed_data(data)
+    reader.feed_eof()
+    return reader
+
+async def chunks(data, size):
+    for i in range(0, len(data), size):
+        yield data[i:i + size]
+
+async def collect(agen):
+    return [v["FN"][0].value async for v in agen]
+
+class AsyncTest(unittest.TestCase):
+
+    def run_async(self, coro):
+        return asyncio.run(coro)
+
+    def test_stream_reader(self):
+        async def run():
+            return await collect(vcard_async_generator(stream_reader(data), chunksize=7))
+        self.assertEqual(["First Card", "Second Card"], self.run_async(run()))
+
+    def test_chunks(self):
+        async def run():
+            return await collect(vcard_async_generator(chunks(data, 5)))
+        self.assertEqual(["First Card", "Second Card"], self.run_async(run()))
+
+    def test_contentlines(self):
+        async def run():
+            return [l async for l in contentline_async_generator(chunks(data, 3))]
+        lines = self.run_async(run())
+        self.assertEqual(('NOTE:A long note that has beenfolded\r\n', 4), lines[3])
+        self.assertEqual(('BEGIN:VCARD\r\n', 7), lines[5])
+
+    def test_parse_vcard(self):
+        async def run():
+            return await parse_vcard_async(stream_reader(data), lazy=True)
+        x = self.run_async(run())
+        self.assertEqual("First Card", x["FN"][0].value)
+
+    def test_no_END(self):
+        async def run():
+            return await collect(vcard_async_generator(stream_reader(data[:-11])))
+        self.assertRaises(ValueError, self.run_async, run())
+
+    def test_media_type_generator(self):
+        async def run():
+            return await collect(pyietflib.media_type_generator('text/vcard', stream_reader(data)))
+        self.assertEqual(["First Card", "Second Card"], self.run_async(run()))
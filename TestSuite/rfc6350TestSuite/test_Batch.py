@@ -0,0 +1,98 @@
+#!/usr/bin/env python
+# -*- coding: UTF-8 -*-
+#-----------------------------------------------------------------------------
+"""RFC6350 Unit Test."""
+__author__ = ('Lance Finn Helsten',)
+__version__ = '1.0'
+__copyright__ = """Copyright 2011 Lance Finn Helsten (helsten@acm.org)"""
+__license__ = """
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+__docformat__ = "reStructuredText en"
+
+import sys
+import io
+import unittest
+
+from pyietflib.rfc6350 import *
+
+data = (b'BEGIN:VCARD\r\nVERSION:4.0\r\n'
+    b'FN:Simon Perreault\r\n'
+    b'item1.EMAIL;TYPE=work:simon.perreault@viagenie.ca\r\n'
+    b'EMAIL;TYPE=home;PREF=1:simon@example.com\r\n'
+    b'END:VCARD\r\n'
+    b'BEGIN:VCARD\r\nVERSION:4.0\r\n'
+    b'FN:Lance Helsten\r\n'
+    b'END:VCARD\r\n'
+    b'BEGIN:VCARD\r\nVERSION:4.0\r\n'
+    b'FN:Jane Doe\r\n'
+    b'EMAIL:jane@example.com\r\n'
+    b'END:VCARD\r\n')
+
+class BatchTest(unittest.TestCase):
+
+    def test_columns(self):
+        batch = vCardBatch(io.BytesIO(data))
+        self.assertEqual(3, len(batch))
+        self.assertEqual(['FN', 'EMAIL'], sorted(batch.columns, reverse=True))
+        email = batch.column('email')
+        self.assertEqual(3, len(email))
+        self.assertEqual([0, 0, 2], list(email.cards))
+        self.assertEqual(['item1', None, None], email.groups)
+        self.assertEqual([('TYPE', 'home'), ('PREF', '1')], email.parameters(1))
+        self.assertEqual([], email.parameters(2))
+        self.assertEqual(0, len(batch.column('TEL')))
+
+    def test_where(self):
+        batch = vCardBatch(io.BytesIO(data))
+        self.assertEqual([0, 2], list(batch.where('EMAIL', lambda v: v.endswith('@example.com'))))
+        self.assertEqual([1], list(batch.where('FN', lambda v: v.startswith('Lance'))))
+        self.assertEqual([0], list(batch.column('EMAIL').where_parameter('type', lambda v: v == 'home')))
+
+    def test_extend(self):
+        batch = vCardBatch(properties=['EMAIL'])
+        self.assertEqual(3, batch.extend(io.BytesIO(data)))
+        self.assertEqual(3, batch.extend(io.BytesIO(data)))
+        self.assertEqual(6, len(batch))
+        self.assertEqual(['EMAIL'], list(batch.columns))
+        self.assertEqual([0, 0, 2, 3, 3, 5], list(batch.column('EMAIL').cards))
+
+    def test_vcard(self):
+        batch = vCardBatch(io.BytesIO(data))
+        x = batch.vcard(0)
+        self.assertEqual(str(parse_vcard(io.BytesIO(data))), str(x))
+        self.assertEqual(['work'], x['EMAIL'][0].parameters[0].value)
+        self.assertEqual(3, len(list(batch)))
+        self.assertRaises(IndexError, batch.vcard, 3)
+
+    def test_invalid(self):
+        self.assertRaises(ValueError, vCardBatch, io.BytesIO(data[:-12]))
+        self.assertRaises(ValueError, vCardBatch, io.BytesIO(data.replace(b'4.0', b'3.0')))
+
+    def test_invalid_rollback(self):
+        batch = vCardBatch()
+        bad = (b'BEGIN:VCARD\r\nVERSION:4.0\r\n'
+            b'FN:Bad\r\n'
+            b'EMAIL:bad@example.com\r\n'
+            b'not a content line\r\n'
+            b'END:VCARD\r\n')
+        self.assertRaises(ValueError, batch.extend, io.BytesIO(data + bad))
+        self.assertEqual(3, len(batch))
+        self.assertRaises(ValueError, batch.extend, io.BytesIO(data[:-12]))
+        self.assertEqual(5, len(batch))
+        batch.extend(io.BytesIO(b'BEGIN:VCARD\r\nVERSION:4.0\r\nFN:Good\r\nEND:VCARD\r\n'))
+        self.assertEqual(6, len(batch))
+        x = batch.vcard(5)
+        self.assertEqual(['Good'], [p.value for p in x['FN']])
+        self.assertNotIn('EMAIL', x)
+        self.assertEqual([0, 0, 2, 3, 3], list(batch.column('EMAIL').cards))
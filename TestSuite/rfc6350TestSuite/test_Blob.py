@@ -0,0 +1,119 @@
+#!/usr/bin/env python
+# -*- coding: UTF-8 -*-
+#-----------------------------------------------------------------------------
+"""RFC6350 Unit Test."""
+__author__ = ('Lance Finn Helsten',)
+__version__ = '1.0'
+__copyright__ = """Copyright 2011 Lance Finn Helsten (helsten@acm.org)"""
+__license__ = """
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+__docformat__ = "reStructuredText en"
+
+import sys
+import io
+import base64
+import pickle
+import unittest
+
+from pyietflib.rfc6350 import *
+from pyietflib.rfc6350.vcard import unfold_stream
+from pyietflib.rfc6350.writer import fold_contentline
+
+photo = bytes(range(256)) * 40
+photo_uri = 'data:image/jpeg;base64,' + base64.b64encode(photo).decode('ascii')
+key_uri = 'http://www.example.com/keys/' + 'k' * 2000
+
+data = (b'BEGIN:VCARD\r\nVERSION:4.0\r\n'
+    b'FN:Simon Perreault\r\n'
+    + fold_contentline('PHOTO;MEDIATYPE=image/jpeg:' + photo_uri + '\r\n')
+    + fold_contentline('KEY:' + key_uri + '\r\n')
+    + fold_contentline('NOTE:' + 'n' * 2000 + '\r\n')
+    + b'LOGO:http://www.example.com/logo.png\r\n'
+    b'END:VCARD\r\n')
+
+def chunks(data, size):
+    for i in range(0, len(data), size):
+        yield data[i:i + size]
+
+class BlobTest(unittest.TestCase):
+
+    def test_spill(self):
+        for size in (1, 7, 100, 65536):
+            vcard = parse_vcard(chunks(data, size), spill_size=1024)
+            p = vcard['PHOTO'][0]
+            self.assertIsInstance(p.typed_value, Blob)
+            self.assertEqual(photo_uri, p.value)
+            self.assertEqual(photo, p.typed_value.read())
+            self.assertEqual(len(photo), len(p.typed_value))
+            with p.typed_value.memoryview() as view:
+                self.assertEqual(photo, bytes(view))
+            self.assertRaises(ValueError, bytes, view)
+            self.assertEqual('data:image/jpeg;base64,', p.typed_value.prefix)
+            k = vcard['KEY'][0]
+            self.assertIsInstance(k.typed_value, Blob)
+            self.assertIsNone(k.typed_value.prefix)
+            self.assertEqual(key_uri, k.value)
+            self.assertIs(p.typed_value.file, k.typed_value.file)
+            with k.typed_value.memoryview() as view:
+                self.assertEqual(key_uri.encode('ascii'), bytes(view))
+            self.assertEqual('n' * 2000, vcard['NOTE'][0].value)
+            self.assertEqual('http://www.example.com/logo.png', vcard['LOGO'][0].value)
+            self.assertEqual(data, bytes(vcard))
+
+    def test_fold_whitespace(self):
+        """Test that only the first whitespace character after a fold in a
+        spilled value is removed."""
+        text = (b'BEGIN:VCARD\r\nVERSION:4.0\r\nKEY:' + b'k' * 2000
+            + b'\r\n  k\r\n\t\tk\r\nEND:VCARD\r\n')
+        for size in (1, 7, 2003, 2004, 2005, 65536):
+            vcard = parse_vcard(chunks(text, size), spill_size=1024)
+            self.assertIsInstance(vcard['KEY'][0].typed_value, Blob)
+            self.assertEqual('k' * 2000 + ' k\tk', vcard['KEY'][0].value)
+
+    def test_not_spilled(self):
+        vcard = parse_vcard(io.BytesIO(data))
+        self.assertEqual(photo_uri, vcard['PHOTO'][0].typed_value)
+        vcard = parse_vcard(data, spill_size=1024)
+        self.assertEqual(photo_uri, vcard['PHOTO'][0].typed_value)
+
+    def test_line_numbers(self):
+        lines = list(unfold_stream(chunks(data, 5), spill_size=1024))
+        expected = list(unfold_stream(io.BytesIO(data)))
+        self.assertEqual([l[1:] for l in expected], [l[1:] for l in lines])
+        self.assertEqual('PHOTO;MEDIATYPE=image/jpeg:...\r\n', lines[3][0])
+
+    def test_pickle(self):
+        vcard = parse_vcard(io.BytesIO(data), spill_size=1024, lazy=True)
+        p = pickle.loads(pickle.dumps(vcard['PHOTO'][0]))
+        self.assertEqual(vcard['PHOTO'][0].typed_value, p.typed_value)
+        self.assertIsNot(vcard['PHOTO'][0].typed_value.file, p.typed_value.file)
+        self.assertEqual(photo_uri, p.value)
+
+    def test_invalid(self):
+        bad = data.replace(b'base64,', b'base64,!')
+        self.assertRaises(ValueError, parse_vcard, io.BytesIO(bad), spill_size=1024)
+        report = ParseReport()
+        stream = io.BytesIO(bad + b'BEGIN:VCARD\r\nVERSION:4.0\r\nFN:Lance\r\nEND:VCARD\r\n')
+        vcards = list(vcard_generator(stream, report=report, spill_size=1024))
+        self.assertEqual(['Lance'], [v['FN'][0].value for v in vcards])
+        self.assertEqual(1, len(report))
+        self.assertEqual(4, report[0].line)
+
+    def test_feed_parser(self):
+        parser = vCardFeedParser(spill_size=1024)
+        for chunk in chunks(data, 3):
+            parser.feed(chunk)
+        parser.close()
+        vcard = list(parser.read_vcards())[0]
+        self.assertEqual(photo, vcard['PHOTO'][0].typed_value.read())
@@ -0,0 +1,105 @@
+#!/usr/bin/env python
+# -*- coding: UTF-8 -*-
+#-----------------------------------------------------------------------------
+"""RFC6350 Unit Test."""
+__author__ = ('Lance Finn Helsten',)
+__version__ = '1.0'
+__copyright__ = """Copyright 2011 Lance Finn Helsten (helsten@acm.org)"""
+__license__ = """
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+__docformat__ = "reStructuredText en"
+
+import sys
+import os
+import io
+import time
+import shutil
+import tempfile
+import unittest
+
+from pyietflib.rfc6350 import *
+
+data = (b'BEGIN:VCARD\r\nVERSION:4.0\r\n'
+    b'FN:Simon Perreault\r\n'
+    b'N:Perreault;Simon;;;ing. jr,M.Sc.\r\n'
+    b'item1.EMAIL;TYPE=work:simon.perreault@viagenie.ca\r\n'
+    b'TEL;VALUE=uri;TYPE="work,voice";PREF=1:tel:+1-418-656-9254;ext=102\r\n'
+    b'X-ABC;X-PARAM=x:\xc3\xa9t\xc3\xa9\r\n'
+    b'END:VCARD\r\n'
+    b'BEGIN:VCARD\r\nVERSION:4.0\r\n'
+    b'FN:Lance Helsten\r\n'
+    b'item1.EMAIL;TYPE=work:lance@example.com\r\n'
+    b'END:VCARD\r\n')
+
+class CacheTest(unittest.TestCase):
+
+    def test_round_trip(self):
+        for lazy in (False, True):
+            vcards = list(vcard_generator(io.BytesIO(data), lazy=lazy))
+            stream = io.BytesIO()
+            self.assertEqual(2, dump_vcards(vcards, stream))
+            stream.seek(0)
+            loaded = list(load_vcards(stream, lazy=lazy))
+            self.assertEqual(b''.join([bytes(v) for v in vcards]), b''.join([bytes(v) for v in loaded]))
+            self.assertEqual('item1', loaded[1]['EMAIL'][0].group)
+            self.assertEqual(1, loaded[0]['TEL'][0].parameters[2].value)
+            self.assertEqual(('Simon',), loaded[0]['N'][0].typed_value.given)
+
+    def test_string_table(self):
+        vcards = list(vcard_generator(io.BytesIO(data)))
+        stream = io.BytesIO()
+        dump_vcards(vcards, stream)
+        self.assertEqual(1, stream.getvalue().count(b'item1'))
+        self.assertEqual(1, stream.getvalue().count(b'TYPE'))
+
+    def test_invalid(self):
+        self.assertRaises(ValueError, list, load_vcards(io.BytesIO(b'BEGIN:VCARD\r\n')))
+        stream = io.BytesIO()
+        dump_vcards(vcard_generator(io.BytesIO(data)), stream)
+        self.assertRaises(ValueError, list, load_vcards(io.BytesIO(stream.getvalue()[:-3])))
+
+
+class vCardCacheTest(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.path = os.path.join(self.directory, 'contacts.vcf')
+        with open(self.path, 'wb') as f:
+            f.write(data)
+        self.cache = vCardCache(os.path.join(self.directory, 'cache'))
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_cache(self):
+        self.assertFalse(self.cache.is_cached(self.path))
+        vcards = self.cache.load(self.path)
+        self.assertEqual(2, len(vcards))
+        self.assertTrue(self.cache.is_cached(self.path))
+        self.assertEqual(b''.join([bytes(v) for v in vcards]),
+                b''.join([bytes(v) for v in self.cache.load(self.path)]))
+
+    def test_changed(self):
+        self.cache.load(self.path)
+        with open(self.path, 'ab') as f:
+            f.write(b'BEGIN:VCARD\r\nVERSION:4.0\r\nFN:Jane Doe\r\nEND:VCARD\r\n')
+        self.assertFalse(self.cache.is_cached(self.path))
+        self.assertEqual(3, len(self.cache.load(self.path)))
+        self.assertTrue(self.cache.is_cached(self.path))
+
+    def test_incomplete(self):
+        for vcard in self.cache.vcards(self.path):
+            break
+        self.assertFalse(self.cache.is_cached(self.path))
+        self.assertEqual([], [n for n in os.listdir(self.cache.directory) if n.endswith('.tmp')])
@@ -0,0 +1,82 @@
+#!/usr/bin/env python
+# -*- coding: UTF-8 -*-
+#-----------------------------------------------------------------------------
+"""RFC6350 Unit Test."""
+__author__ = ('Lance Finn Helsten',)
+__version__ = '1.0'
+__copyright__ = """Copyright 2011 Lance Finn Helsten (helsten@acm.org)"""
+__license__ = """
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+__docformat__ = "reStructuredText en"
+
+import sys
+import time
+import unittest
+
+from pyietflib.rfc6350 import *
+from pyietflib.rfc6350.grammar import parse_abnf, vcard_v4_rules
+
+class GrammarTest(unittest.TestCase):
+
+    def test_rules(self):
+        rules = abnf_rules()
+        for text in vcard_v4_rules():
+            for name, tree in parse_abnf(text):
+                self.assertIn(name.lower(), rules)
+        self.assertEqual(('contentline', ('cat', [
+                ('rep', 0, 1, ('cat', [('rule', 'group'), ('str', '.')])),
+                ('rule', 'name'),
+                ('rep', 0, None, ('cat', [('str', ';'), ('rule', 'param')])),
+                ('str', ':'), ('rule', 'value'), ('rule', 'CRLF')])),
+                rules['contentline'])
+        self.assertEqual([('x', ('alt', [('chars', [(0x41, 0x5a)]), ('rep', 2, 3, ('rule', 'DIGIT'))]))],
+                parse_abnf('x = %x41-5A / 2*3DIGIT ; comment'))
+        self.assertRaises(ValueError, parse_abnf, 'x = "a" )')
+        self.assertRaises(ValueError, compile_rule, 'no-such-rule')
+
+    def test_contentline(self):
+        for line in ['FN:J. Doe\r\n',
+                'item1.EMAIL;TYPE=work,home;PREF=1:jdoe@example.com\r\n',
+                'N:Doe;J.;;;\r\n',
+                'NOTE:Caf\u00e9 \\, \\n\r\n',
+                'TEL;VALUE=uri;TYPE="voice,cell":tel:+1-555-555-5555\r\n',
+                'fn;language=en:x\r\n',
+                'X-FOO:\r\n']:
+            self.assertTrue(valid_contentline(line), line)
+        for line in ['X-FOO:\x01\r\n',
+                'FN:a\r\n\r\n',
+                'FN:a',
+                'BAD NAME:x\r\n',
+                'FN;LANGUAGE:x\r\n',
+                'FN;X-A="b:x\r\n',
+                'group..FN:x\r\n']:
+            self.assertFalse(valid_contentline(line), line)
+
+    def test_value(self):
+        for value, value_type in [('tel:+1-555', 'uri'), ('http://[::1]:80/a?b#c', 'uri'),
+                ('19960415', 'date'), ('--0415', 'date'), ('1996-04', 'date'),
+                ('TRUE', 'boolean'), ('1,2,-3', 'integer'), ('en-US', 'language-tag'),
+                ('-0500', 'utc-offset'), ('19961022T140000Z', 'timestamp'),
+                ('T102200', 'DATE-AND-OR-TIME'), ('anything', 'x-unknown')]:
+            self.assertTrue(valid_value(value, value_type), value)
+        for value, value_type in [('no scheme', 'uri'), ('1996-4', 'date'), ('yes', 'boolean'),
+                ('1.5', 'integer'), ('en_US', 'language-tag'), ('19961022', 'timestamp')]:
+            self.assertFalse(valid_value(value, value_type), value)
+
+    def test_linear(self):
+        # Overlapping alternatives must not backtrack on an invalid line.
+        line = 'X-A' + ';TYPE=a,b,c' * 40 + ':\x01\r\n'
+        start = time.perf_counter()
+        self.assertFalse(valid_contentline(line))
+        self.assertLess(time.perf_counter() - start, 1.0)
@@ -0,0 +1,106 @@
+#!/usr/bin/env python
+# -*- coding: UTF-8 -*-
+#-----------------------------------------------------------------------------
+"""RFC6350 Unit Test."""
+__author__ = ('Lance Finn Helsten',)
+__version__ = '1.0'
+__copyright__ = """Copyright 2011 Lance Finn Helsten (helsten@acm.org)"""
+__license__ = """
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+__docformat__ = "reStructuredText en"
+
+import sys
+import io
+import json
+import unittest
+
+from pyietflib.rfc6350 import *
+
+sample = (b'BEGIN:VCARD\r\nVERSION:4.0\r\n'
+    b'FN:Simon Perreault\r\n'
+    b'N:Perreault;Simon;;;ing. jr,M.Sc.\r\n'
+    b'BDAY:--0203\r\n'
+    b'ANNIVERSARY:20090808T1430-0500\r\n'
+    b'GENDER:M\r\n'
+    b'LANG;PREF=1:fr\r\n'
+    b'ORG;TYPE=work:Viagenie\r\n'
+    b'ADR;TYPE=work:;Suite D2-630;2875 Laurier;Quebec;QC;G1V 2M2;Canada\r\n'
+    b'TEL;VALUE=uri;TYPE="work,voice";PREF=1:tel:+1-418-656-9254;ext=102\r\n'
+    b'EMAIL;TYPE=work:simon.perreault@viagenie.ca\r\n'
+    b'item1.URL:http://nomis80.org\r\n'
+    b'CATEGORIES:a,b\\,c\r\n'
+    b'NOTE:Line\\none\\, two; three\r\n'
+    b'REV:19951031T222710Z\r\n'
+    b'CLIENTPIDMAP:1;urn:uuid:3df403f4-5924-4bb7-b077-3c711d9eb34b\r\n'
+    b'X-COUNT;VALUE=integer:1,-2\r\n'
+    b'X-SPAM:eggs\r\n'
+    b'END:VCARD\r\n')
+
+class JCardTest(unittest.TestCase):
+
+    def test_jcard(self):
+        vcard = parse_vcard(io.BytesIO(sample))
+        jcard = json.loads(vcard_to_jcard(vcard))
+        self.assertEqual('vcard', jcard[0])
+        props = dict([(p[0], p[1:]) for p in jcard[1]])
+        self.assertEqual([{}, 'text', '4.0'], props['version'])
+        self.assertEqual([{}, 'text', ['Perreault', 'Simon', '', '', ['ing. jr', 'M.Sc.']]], props['n'])
+        self.assertEqual([{}, 'date-and-or-time', '--02-03'], props['bday'])
+        self.assertEqual([{}, 'date-and-or-time', '2009-08-08T14:30-05:00'], props['anniversary'])
+        self.assertEqual([{}, 'text', 'M'], props['gender'])
+        self.assertEqual([{'pref': '1'}, 'language-tag', 'fr'], props['lang'])
+        self.assertEqual([{'type': 'work'}, 'text', 'Viagenie'], props['org'])
+        self.assertEqual([{'type': ['work', 'voice'], 'pref': '1'}, 'uri', 'tel:+1-418-656-9254;ext=102'],
+                props['tel'])
+        self.assertEqual([{'group': 'item1'}, 'uri', 'http://nomis80.org'], props['url'])
+        self.assertEqual([{}, 'text', 'a', 'b,c'], props['categories'])
+        self.assertEqual([{}, 'text', 'Line\none, two; three'], props['note'])
+        self.assertEqual([{}, 'timestamp', '1995-10-31T22:27:10Z'], props['rev'])
+        self.assertEqual([{}, 'text', ['1', 'urn:uuid:3df403f4-5924-4bb7-b077-3c711d9eb34b']],
+                props['clientpidmap'])
+        self.assertEqual([{}, 'integer', 1, -2], props['x-count'])
+        self.assertEqual([{}, 'unknown', 'eggs'], props['x-spam'])
+
+    def test_round_trip(self):
+        vcard = parse_vcard(io.BytesIO(sample))
+        for lazy in (False, True):
+            ret = jcard_to_vcard(json.loads(vcard_to_jcard(vcard)), lazy=lazy)
+            self.assertEqual(list(vcard), list(ret))
+            for name in vcard:
+                for a, b in zip(vcard[name], ret[name]):
+                    self.assertEqual(a.value, b.value, name)
+                    self.assertEqual(a.group, b.group, name)
+                    # A VALUE parameter of the default type is not kept.
+                    self.assertEqual(sorted([(n.upper(), v.strip('"')) for n, v in a.raw_parameters()
+                            if (n, v) != ('VALUE', 'uri')]),
+                            sorted([(n, v.strip('"')) for n, v in b.raw_parameters()]), name)
+            self.assertEqual(vcard_to_jcard(vcard), vcard_to_jcard(ret))
+
+    def test_stream(self):
+        vcards = list(vcard_generator(io.BytesIO(sample * 5)))
+        stream = io.BytesIO()
+        self.assertEqual(5, write_jcards(vcards, stream, buffersize=100))
+        data = stream.getvalue()
+        self.assertEqual(5, len(json.loads(data.decode('UTF-8'))))
+        for chunksize in (1, 7, 65536):
+            ret = list(jcard_generator(io.BytesIO(data), chunksize=chunksize))
+            self.assertEqual([vcard_to_jcard(v) for v in vcards], [vcard_to_jcard(v) for v in ret])
+        ret = list(jcard_generator(io.BytesIO(b' ' + vcard_to_jcard(vcards[0]).encode('UTF-8'))))
+        self.assertEqual(1, len(ret))
+        self.assertEqual([], list(jcard_generator(io.BytesIO(b'[ ]'))))
+
+    def test_invalid(self):
+        for data in [b'', b'{}', b'[["vcard",[]]', b'[["vcard",[["version",{},"text","4.0"]]] x',
+                b'[["vcard",[["fn",{},"text","x"]]]]', b'["vcard",[["version",{},"text","4.0"],["fn"]]]']:
+            self.assertRaises(ValueError, list, jcard_generator(io.BytesIO(data)))
@@ -0,0 +1,99 @@
+#!/usr/bin/env python
+# -*- coding: UTF-8 -*-
+#-----------------------------------------------------------------------------
+"""RFC6350 Unit Test."""
+__author__ = ('Lance Finn Helsten',)
+__version__ = '1.0'
+__copyright__ = """Copyright 2011 Lance Finn Helsten (helsten@acm.org)"""
+__license__ = """
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+__docformat__ = "reStructuredText en"
+
+import sys
+import os
+import io
+import shutil
+import tempfile
+import unittest
+
+from pyietflib.rfc6350 import *
+
+data = (b'BEGIN:VCARD\r\nVERSION:4.0\r\n'
+    b'FN:Simon Perreault\r\n'
+    b'item1.EMAIL;TYPE=work:simon.perreault@viagenie.ca\r\n'
+    b'TEL;VALUE=uri;TYPE="work,voice";PREF=1:tel:+1-418-656-9254;ext=102\r\n'
+    b'IMPP;PREF=1:xmpp:simon@viagenie.ca\r\n'
+    b'END:VCARD\r\n'
+    b'BEGIN:VCARD\r\nVERSION:4.0\r\n'
+    b'FN:Front Desk\r\n'
+    b'TEL;VALUE=text:+1 (418) 656-9254\r\n'
+    b'EMAIL:info@viagenie.ca\r\n'
+    b'END:VCARD\r\n'
+    b'BEGIN:VCARD\r\nVERSION:4.0\r\n'
+    b'FN:Nobody\r\n'
+    b'END:VCARD\r\n')
+
+class LookupTest(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.vcf = os.path.join(self.directory, 'contacts.vcf')
+        self.path = os.path.join(self.directory, 'contacts.vcl')
+        with open(self.vcf, 'wb') as f:
+            f.write(data)
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_normalise(self):
+        self.assertEqual('simon@example.com', normalise_value('email', 'mailto:Simon@Example.COM '))
+        self.assertEqual('14186569254', normalise_value('TEL', 'tel:+1-418-656-9254;ext=102'))
+        self.assertEqual('14186569254', normalise_value('TEL', '+1 (418) 656-9254'))
+        self.assertEqual('xmpp:simon@example.com', normalise_value('IMPP', 'XMPP:Simon@example.com'))
+        self.assertRaises(ValueError, normalise_value, 'FN', 'Simon')
+
+    def test_lookup(self):
+        with vCardReader(self.vcf) as reader, open(self.path, 'wb') as f:
+            self.assertEqual(5, write_lookup(reader, f))
+        with vCardLookup(self.path) as lookup:
+            self.assertEqual(5, len(lookup))
+            self.assertEqual([0], lookup.email('Simon.Perreault@viagenie.ca'))
+            self.assertEqual([1], lookup.email('mailto:info@viagenie.ca'))
+            self.assertEqual([0, 1], lookup.tel('+1 418 656 9254'))
+            self.assertEqual([0], lookup.impp('xmpp:simon@viagenie.ca'))
+            self.assertEqual([], lookup.impp('simon.perreault@viagenie.ca'))
+            self.assertEqual([], lookup.tel('555-1234'))
+            self.assertEqual([], lookup.tel(''))
+
+    def test_refs(self):
+        with vCardReader(self.vcf) as reader, open(self.path, 'wb') as f:
+            write_lookup(reader, f, refs=reader.starts)
+            starts = reader.starts.tolist()
+        with vCardLookup(self.path) as lookup:
+            self.assertEqual([starts[1]], lookup.find('email', 'info@viagenie.ca'))
+
+    def test_empty(self):
+        with open(self.path, 'wb') as f:
+            self.assertEqual(0, write_lookup([], f))
+        with vCardLookup(self.path) as lookup:
+            self.assertEqual(0, len(lookup))
+            self.assertEqual([], lookup.email('info@viagenie.ca'))
+
+    def test_invalid(self):
+        with open(self.path, 'wb') as f:
+            f.write(b'VCARDL\x01\x00' + b'\x02' + b'\x00' * 7 + b'\x00' * 16)
+        self.assertRaises(ValueError, vCardLookup, self.path)
+        with open(self.path, 'wb') as f:
+            f.write(b'VCARDC\x02\x00')
+        self.assertRaises(ValueError, vCardLookup, self.path)
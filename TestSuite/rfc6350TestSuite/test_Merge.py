@@ -0,0 +1,111 @@
+#!/usr/bin/env python
+# -*- coding: UTF-8 -*-
+#-----------------------------------------------------------------------------
+"""RFC6350 Unit Test."""
+__author__ = ('Lance Finn Helsten',)
+__version__ = '1.0'
+__copyright__ = """Copyright 2011 Lance Finn Helsten (helsten@acm.org)"""
+__license__ = """
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+__docformat__ = "reStructuredText en"
+
+import sys
+import io
+import unittest
+
+from pyietflib.rfc6350 import *
+
+data = (b'BEGIN:VCARD\r\nVERSION:4.0\r\n'
+    b'FN:Simon Perreault\r\n'
+    b'EMAIL;PID=1.1;PREF=2:mailto:Simon@Example.com\r\n'
+    b'TEL;PID=1.1:+1 418-656-9254\r\n'
+    b'REV:20100101T000000Z\r\n'
+    b'CLIENTPIDMAP:1;urn:uuid:3df403f4-5924-4bb7-b077-3c711d9eb34b\r\n'
+    b'END:VCARD\r\n'
+    b'BEGIN:VCARD\r\nVERSION:4.0\r\n'
+    b'FN:Lance Helsten\r\n'
+    b'UID:urn:uuid:lance\r\n'
+    b'END:VCARD\r\n'
+    b'BEGIN:VCARD\r\nVERSION:4.0\r\n'
+    b'FN:S. Perreault\r\n'
+    b'N:Perreault;Simon;;;\r\n'
+    b'EMAIL;PID=4.1;PREF=1:simon@example.com\r\n'
+    b'TEL;PID=1.2:tel:+1-418-656-9254\r\n'
+    b'REV:20120101T000000Z\r\n'
+    b'CLIENTPIDMAP:1;urn:uuid:53e374d9-337e-4727-8803-a1e9c14e0556\r\n'
+    b'CLIENTPIDMAP:2;urn:uuid:3df403f4-5924-4bb7-b077-3c711d9eb34b\r\n'
+    b'END:VCARD\r\n'
+    b'BEGIN:VCARD\r\nVERSION:4.0\r\n'
+    b'FN:Lance\r\n'
+    b'UID:urn:uuid:lance\r\n'
+    b'END:VCARD\r\n')
+
+class MergeTest(unittest.TestCase):
+
+    def vcards(self, lazy=False):
+        return list(vcard_generator(io.BytesIO(data), lazy=lazy))
+
+    def test_normalise(self):
+        self.assertEqual('simon@example.com', normalise_email(' MAILTO:Simon@Example.com'))
+        self.assertEqual('+14186569254', normalise_tel('tel:+1 (418) 656-9254'))
+        self.assertEqual('+14186569254;ext=1', normalise_tel('+1.418.656.9254;EXT=1'))
+        self.assertEqual('14186569254', normalise_tel_digits('tel:+1 (418) 656-9254;ext=1'))
+        self.assertEqual('xmpp:simon@example.com', normalise_impp(' XMPP:Simon@Example.com'))
+
+    def test_keys(self):
+        keys = list(vcard_keys(self.vcards()[0]))
+        self.assertIn(('EMAIL', 'simon@example.com'), keys)
+        self.assertIn(('PID', 'TEL', 'urn:uuid:3df403f4-5924-4bb7-b077-3c711d9eb34b', '1'), keys)
+        self.assertIn(('UID', 'urn:uuid:lance'), list(vcard_keys(self.vcards()[1])))
+
+    def test_groups(self):
+        merger = vCardMerger()
+        merger.extend(self.vcards())
+        self.assertEqual(4, len(merger))
+        self.assertEqual([[0, 2], [1, 3]], merger.groups())
+        merger.add(vCard())
+        self.assertEqual([[0, 2], [1, 3], [4]], merger.groups())
+
+    def test_transitive(self):
+        # The first and last vCards have no key in common.
+        merger = vCardMerger()
+        for line in (b'EMAIL:a@example.com', b'EMAIL:a@example.com\r\nTEL:1',
+                b'TEL:1\r\nUID:x', b'UID:x'):
+            merger.add(parse_vcard(io.BytesIO(b'BEGIN:VCARD\r\nVERSION:4.0\r\nFN:A\r\n'
+                    + line + b'\r\nEND:VCARD\r\n')))
+        self.assertEqual([[0, 1, 2, 3]], merger.groups())
+
+    def test_merge(self):
+        merger = vCardMerger()
+        merger.extend(self.vcards(lazy=True))
+        simon, lance = list(merger.merged())
+        self.assertEqual(['S. Perreault', 'Simon Perreault'], [p.value for p in simon['FN']])
+        self.assertEqual(['20120101T000000Z'], [p.value for p in simon['REV']])
+        self.assertEqual(1, len(simon['N']))
+        self.assertEqual(['1;urn:uuid:53e374d9-337e-4727-8803-a1e9c14e0556',
+                '2;urn:uuid:3df403f4-5924-4bb7-b077-3c711d9eb34b'],
+                [p.value for p in simon['CLIENTPIDMAP']])
+        self.assertEqual(1, len(simon['EMAIL']))
+        self.assertEqual('EMAIL;PID=4.1,1.2;PREF=1:simon@example.com\r\n', str(simon['EMAIL'][0]))
+        self.assertEqual(1, len(simon['TEL']))
+        self.assertEqual('TEL;PID=1.2:tel:+1-418-656-9254\r\n', str(simon['TEL'][0]))
+        self.assertEqual(['Lance Helsten', 'Lance'], [p.value for p in lance['FN']])
+        self.assertEqual(1, len(lance['UID']))
+        parse_vcard(io.BytesIO(bytes(simon)))
+
+    def test_merge_single(self):
+        vcard = self.vcards()[1]
+        merger = vCardMerger()
+        merger.add(vcard)
+        self.assertIs(vcard, next(merger.merged()))
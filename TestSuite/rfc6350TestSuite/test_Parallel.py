@@ -0,0 +1,61 @@
+#!/usr/bin/env python
+# -*- coding: UTF-8 -*-
+#-----------------------------------------------------------------------------
+"""RFC6350 Unit Test."""
+__author__ = ('Lance Finn Helsten',)
+__version__ = '1.0'
+__copyright__ = """Copyright 2011 Lance Finn Helsten (helsten@acm.org)"""
+__license__ = """
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+__docformat__ = "reStructuredText en"
+
+import sys
+import os
+import datetime
+import tempfile
+import unittest
+
+from pyietflib.rfc6350 import *
+
+class ParallelTest(unittest.TestCase):
+
+    def setUp(self):
+        fd, self.path = tempfile.mkstemp(suffix='.vcf')
+        with os.fdopen(fd, 'wb') as f:
+            for i in range(25):
+                f.write('BEGIN:VCARD\r\nVERSION:4.0\r\nFN:Card {0}\r\nBDAY;CALSCALE=gregorian:1966-08-29\r\nANNIVERSARY:20090808T1430-0500\r\nEND:VCARD\r\n'.format(i).encode('UTF-8'))
+
+    def tearDown(self):
+        os.remove(self.path)
+
+    def test_ordered(self):
+        x = list(parse_vcards_parallel(self.path, workers=2, batchsize=4))
+        self.assertEqual(['Card {0}'.format(i) for i in range(25)], [v['FN'][0].value for v in x])
+        self.assertEqual(datetime.date(1966, 8, 29), x[0]['BDAY'][0].date)
+
+    def test_unordered(self):
+        x = [v['FN'][0].value for v in parse_vcards_parallel(self.path, workers=2, ordered=False, batchsize=4)]
+        self.assertEqual(sorted(['Card {0}'.format(i) for i in range(25)]), sorted(x))
+
+    def test_lazy(self):
+        x = list(parse_vcards_parallel(self.path, workers=2, batchsize=10, lazy=True, properties=['BDAY']))
+        self.assertEqual(25, len(x))
+        self.assertEqual('4.0', x[0].version)
+        self.assertEqual(datetime.date(1966, 8, 29), x[0]['BDAY'][0].typed_value)
+        self.assertEqual('gregorian', x[0]['BDAY'][0].parameters[0].value)
+
+    def test_invalid(self):
+        with open(self.path, 'ab') as f:
+            f.write(b'BEGIN:VCARD\r\nVERSION:4.0\r\nFN\r\nEND:VCARD\r\n')
+        self.assertRaises(ValueError, list, parse_vcards_parallel(self.path, workers=2, batchsize=4))
@@ -130,3 +130,90 @@ class ParameterTest(unittest.TestCase):
 
 
 
+
+    def test_register(self):
+        from pyietflib.rfc6350 import parameter
+        class XColorParam(parameter.Parameter):
+            __slots__ = ()
+            param_name = 'X-COLOR'
+            def parse_value(self, value):
+                return value.upper()
+        pyietflib.rfc6350.register_parameter(XColorParam)
+        try:
+            p = pyietflib.rfc6350.build_parameter("x-color", 'red')
+            self.assertIsInstance(p, XColorParam)
+            self.assertEqual('X-COLOR', p.name)
+            self.assertEqual('RED', p.value)
+            self.assertRaises(KeyError, pyietflib.rfc6350.register_parameter, XColorParam)
+        finally:
+            del parameter.defined_params['X-COLOR']
+            parameter.parameter_factories.clear()
+        self.assertEqual(['red'], pyietflib.rfc6350.build_parameter("x-color", 'red').value)
+
+    def test_position(self):
+        """The line and column are only used to report an invalid value."""
+        p = pyietflib.rfc6350.build_parameter('PREF', '1', 3, 10)
+        self.assertFalse(hasattr(p, 'line'))
+        self.assertFalse(hasattr(p, 'column'))
+        with self.assertRaisesRegex(ValueError, r'parameter "PREF" \[3, 10\]\.$'):
+            pyietflib.rfc6350.build_parameter('PREF', '101', 3, 10)
+        with self.assertRaisesRegex(ValueError, r'\[4, 2\]\.$'):
+            pyietflib.rfc6350.build_parameter('X_BAD', 'x', 4, 2)
+
+    def test_intern(self):
+        import copy
+        from pyietflib.rfc6350 import parameter
+        p = pyietflib.rfc6350.build_parameter('TYPE', 'work,home', intern=True)
+        try:
+            self.assertIs(p, pyietflib.rfc6350.build_parameter('TYPE', 'work,home', intern=True))
+            self.assertIs(p, pyietflib.rfc6350.build_parameter('type', 'work,home', intern=True))
+            self.assertIsNot(p, pyietflib.rfc6350.build_parameter('TYPE', 'work,home'))
+            self.assertEqual(p, pyietflib.rfc6350.build_parameter('TYPE', 'work,home'))
+            self.assertRaises(AttributeError, setattr, p, 'value', ['work'])
+            self.assertEqual(('work', 'home'), p.value)
+            self.assertIsInstance(p.value, tuple)
+            self.assertEqual(['work', 'home'], copy.copy(p).value)
+            q = pyietflib.rfc6350.build_parameter('TYPE', 'work,home')
+            q.value = ['work']
+            self.assertEqual(['work'], q.value)
+            # The shared parameter is found without parsing the value, in
+            # any case of the name.
+            def parse_value(self, value):
+                raise AssertionError('The shared parameter was not found.')
+            parse = parameter.TypeParam.parse_value
+            parameter.TypeParam.parse_value = parse_value
+            try:
+                self.assertIs(p, pyietflib.rfc6350.build_parameter('type', 'work,home', intern=True))
+                self.assertIs(p, pyietflib.rfc6350.build_parameter('Type', 'work,home', intern=True))
+            finally:
+                parameter.TypeParam.parse_value = parse
+            x = pyietflib.rfc6350.build_parameter('x-color', 'red', intern=True)
+            self.assertIs(x, pyietflib.rfc6350.build_parameter('x-color', 'red', intern=True))
+            self.assertEqual('x-color', x.name)
+        finally:
+            parameter.interned_parameters.clear()
+
+    def test_pickle(self):
+        import pickle
+        import copy
+        from pyietflib.rfc6350 import parameter
+        p = pyietflib.rfc6350.build_parameter('PID', '1.1,2.1')
+        for q in (pickle.loads(pickle.dumps(p)), copy.copy(p), copy.deepcopy(p)):
+            self.assertIsNot(p, q)
+            self.assertIsInstance(q, type(p))
+            self.assertEqual(p, q)
+            self.assertEqual(str(p), str(q))
+            self.assertEqual('1.1,2.1', q.valuestr)
+        self.assertIs(p.value, copy.copy(p).value)
+        self.assertIsNot(p.value, copy.deepcopy(p).value)
+        p = pyietflib.rfc6350.build_parameter('TYPE', 'work', intern=True)
+        try:
+            self.assertIs(p, copy.deepcopy(p))
+            data = pickle.dumps(p)
+            self.assertIs(p, pickle.loads(data))
+            parameter.interned_parameters.clear()
+            q = pickle.loads(data)
+            self.assertIsNot(p, q)
+            self.assertIs(q, pyietflib.rfc6350.build_parameter('TYPE', 'work', intern=True))
+        finally:
+            parameter.interned_parameters.clear()
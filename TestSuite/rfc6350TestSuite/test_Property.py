@@ -21,6 +21,7 @@ limitations under the License.
 __docformat__ = "reStructuredText en"
 
 import sys
+import datetime
 import unittest
 
 from pyietflib.rfc6350 import *
@@ -155,3 +156,69 @@ class PropertyTest(unittest.TestCase):
         self.assertIsNone(p.group)
         self.assertEqual(0, len(p.parameters))
 
+
+    def test_case_insensitive(self):
+        p = property_from_contentline('fn:Lance\r\n')
+        self.assertEqual('FN', p.name)
+        p = property_from_contentline('x-Spam:Eggs\r\n')
+        self.assertEqual('x-Spam', p.name)
+        self.assertEqual('property.ExtendedProperty(x-Spam, Eggs, group=None, params=[])', repr(p))
+        p = property_from_contentline('spam:Eggs\r\n')
+        self.assertEqual('spam', p.name)
+
+    def test_register(self):
+        import pyietflib.rfc6350.property as module
+        class XSKYPE(module.Property):
+            __slots__ = ()
+            name = 'X-SKYPE'
+        register_property(XSKYPE, 'X-SKYPE')
+        try:
+            p = property_from_contentline('item1.X-Skype:lance\r\n')
+            self.assertIsInstance(p, XSKYPE)
+            self.assertEqual('X-SKYPE', p.name)
+            self.assertEqual('item1', p.group)
+            self.assertRaises(KeyError, register_property, XSKYPE, 'x-skype')
+        finally:
+            del module.defined_properties['X-SKYPE']
+            module.property_factories.clear()
+        self.assertNotIsInstance(property_from_contentline('X-Skype:lance\r\n'), XSKYPE)
+
+    def test_pickle(self):
+        import pickle
+        import copy
+        for lazy in (False, True):
+            for v in ('item1.GENDER;X-A=b:M;Male\r\n', 'x-Spam;TYPE=work:Eggs\r\n', 'spam:Eggs\r\n'):
+                p = property_from_contentline(v, lazy=lazy)
+                for q in (pickle.loads(pickle.dumps(p)), copy.copy(p), copy.deepcopy(p)):
+                    self.assertIsInstance(q, type(p))
+                    self.assertEqual(v, str(q))
+                    self.assertEqual(p.name, q.name)
+                    self.assertEqual(p.group, q.group)
+                    self.assertEqual(p.typed_value, q.typed_value)
+        p = property_from_contentline('GENDER;X-A=b:M\r\n')
+        self.assertEqual('M', pickle.loads(pickle.dumps(p)).code)
+        self.assertIs(p.parameters, copy.copy(p).parameters)
+        q = copy.deepcopy(p)
+        self.assertIsNot(p.parameters, q.parameters)
+        self.assertIsNot(p.parameters[0], q.parameters[0])
+
+    def test_lazy(self):
+        v = 'BDAY;VALUE=date;CALSCALE=gregorian:1966-08-29\r\n'
+        p = property_from_contentline(v, lazy=True)
+        self.assertEqual('1966-08-29', p.value)
+        self.assertEqual(v, str(p))
+        self.assertEqual(build_parameter('CALSCALE', 'gregorian'), p.parameters[1])
+        self.assertEqual(datetime.date(1966, 8, 29), p.date)
+        self.assertEqual(datetime.date(1966, 8, 29), p.typed_value)
+
+    def test_lazy_invalid(self):
+        p = property_from_contentline('GENDER:Spam\r\n', lazy=True)
+        self.assertEqual('Spam', p.value)
+        self.assertRaises(ValueError, getattr, p, 'code')
+        # Only the attributes set by parsing the value parse it.
+        self.assertFalse(hasattr(p, 'anything'))
+        self.assertRaises(AttributeError, getattr, p, 'date')
+        self.assertRaises(ValueError, getattr, p, 'identity')
+        p = property_from_contentline('BDAY:1966-08-29\r\n', lazy=True)
+        self.assertFalse(hasattr(p, 'code'))
+        self.assertEqual(datetime.date(1966, 8, 29), p.date)
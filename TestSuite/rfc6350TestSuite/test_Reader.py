@@ -0,0 +1,68 @@
+#!/usr/bin/env python
+# -*- coding: UTF-8 -*-
+#-----------------------------------------------------------------------------
+"""RFC6350 Unit Test."""
+__author__ = ('Lance Finn Helsten',)
+__version__ = '1.0'
+__copyright__ = """Copyright 2011 Lance Finn Helsten (helsten@acm.org)"""
+__license__ = """
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+__docformat__ = "reStructuredText en"
+
+import sys
+import os
+import tempfile
+import unittest
+
+from pyietflib.rfc6350 import *
+
+class ReaderTest(unittest.TestCase):
+
+    def setUp(self):
+        fd, self.path = tempfile.mkstemp(suffix='.vcf')
+        with os.fdopen(fd, 'wb') as f:
+            for i in range(5):
+                f.write('BEGIN:VCARD\r\nVERSION:4.0\r\nFN:Card {0}\r\nNOTE:A long\r\n  note\r\nEND:VCARD\r\n'.format(i).encode('UTF-8'))
+
+    def tearDown(self):
+        os.remove(self.path)
+
+    def test_index(self):
+        with vCardReader(self.path) as reader:
+            self.assertEqual(5, len(reader))
+            self.assertEqual(0, reader.starts[0])
+            self.assertEqual(reader.ends[0], reader.starts[1])
+            self.assertEqual(os.path.getsize(self.path), reader.ends[-1])
+
+    def test_random_access(self):
+        with vCardReader(self.path) as reader:
+            self.assertEqual('Card 3', reader[3]['FN'][0].value)
+            self.assertEqual('Card 4', reader[-1]['FN'][0].value)
+            self.assertEqual('A long note', reader[1]['NOTE'][0].value)
+            self.assertRaises(IndexError, reader.__getitem__, 5)
+
+    def test_iter(self):
+        with vCardReader(self.path) as reader:
+            self.assertEqual(['Card {0}'.format(i) for i in range(5)],
+                    [v['FN'][0].value for v in reader])
+
+    def test_no_END(self):
+        with open(self.path, 'ab') as f:
+            f.write(b'BEGIN:VCARD\r\nVERSION:4.0\r\nFN:Truncated\r\n')
+        self.assertRaises(ValueError, vCardReader, self.path)
+
+    def test_empty(self):
+        open(self.path, 'wb').close()
+        with vCardReader(self.path) as reader:
+            self.assertEqual(0, len(reader))
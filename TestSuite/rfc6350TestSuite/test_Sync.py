@@ -0,0 +1,110 @@
+#!/usr/bin/env python
+# -*- coding: UTF-8 -*-
+#-----------------------------------------------------------------------------
+"""RFC6350 Unit Test."""
+__author__ = ('Lance Finn Helsten',)
+__version__ = '1.0'
+__copyright__ = """Copyright 2011 Lance Finn Helsten (helsten@acm.org)"""
+__license__ = """
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+__docformat__ = "reStructuredText en"
+
+import sys
+import os
+import shutil
+import tempfile
+import unittest
+
+from pyietflib.rfc6350 import *
+
+def card(uid, rev, fn):
+    ret = [b'BEGIN:VCARD\r\nVERSION:4.0\r\n', b'FN:' + fn + b'\r\n']
+    if uid:
+        ret.append(b'UID:' + uid + b'\r\n')
+    if rev:
+        ret.append(b'item1.REV;X-A="b:c":' + rev + b'\r\n')
+    ret.append(b'END:VCARD\r\n')
+    return b''.join(ret)
+
+class SyncTest(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.collection = os.path.join(self.directory, 'contacts.vcf')
+        self.index = os.path.join(self.directory, 'contacts.idx')
+        self.mtime = 1000000000 * 10**9
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def write(self, *cards):
+        with open(self.collection, 'wb') as f:
+            f.write(b''.join(cards))
+        self.mtime = self.mtime + 10**9
+        os.utime(self.collection, ns=(self.mtime, self.mtime))
+
+    def changes(self):
+        return [(c.kind, c.key, c.vcard and c.vcard['FN'][0].value)
+                for c in vCardSyncIndex(self.index).changes(self.collection)]
+
+    def test_sync(self):
+        a = card(b'urn:a', b'20200101T000000Z', b'A')
+        b = card(b'urn:b', None, b'B')
+        c = card(None, None, b'C')
+        self.write(a, b, c)
+        changes = self.changes()
+        self.assertEqual([('added', 'urn:a', 'A'), ('added', 'urn:b', 'B')], changes[:2])
+        self.assertEqual('added', changes[2][0])
+        self.assertIsInstance(changes[2][1], bytes)
+        self.assertEqual([], self.changes())
+
+        # The file is touched but not changed.
+        self.write(a, b, c)
+        self.assertEqual([], self.changes())
+
+        # A changed REV, a changed value, a new vCard, and a removed vCard.
+        d = card(b'urn:d', None, b'D')
+        self.write(card(b'urn:a', b'20200102T000000Z', b'A'), card(b'urn:b', None, b'B2'), d)
+        changes = self.changes()
+        self.assertEqual([('changed', 'urn:a', 'A'), ('changed', 'urn:b', 'B2'), ('added', 'urn:d', 'D')],
+                changes[:3])
+        self.assertEqual([('removed', None)], [c[:1] + c[2:] for c in changes[3:]])
+
+        index = vCardSyncIndex(self.index)
+        self.assertEqual(3, len(index))
+        self.assertEqual('20200102T000000Z', index.entries['urn:a'].rev)
+        self.assertEqual(None, index.entries['urn:b'].rev)
+        self.assertEqual('D', index.vcard(self.collection, 'urn:d')['FN'][0].value)
+
+    def test_incomplete(self):
+        self.write(card(b'urn:a', None, b'A'), card(b'urn:b', None, b'B'))
+        changes = vCardSyncIndex(self.index).changes(self.collection)
+        next(changes)
+        changes.close()
+        self.assertFalse(os.path.exists(self.index))
+        self.assertEqual(2, len(self.changes()))
+
+    def test_long_uid(self):
+        uid = b'urn:' + b'u' * 70000
+        rev = b'2020' + b'0' * 70000
+        self.write(card(uid, rev, b'A'))
+        self.assertEqual([('added', uid.decode('ascii'), 'A')], self.changes())
+        self.assertEqual([], self.changes())
+        index = vCardSyncIndex(self.index)
+        self.assertEqual(rev.decode('ascii'), index.entries[uid.decode('ascii')].rev)
+
+    def test_invalid(self):
+        with open(self.index, 'wb') as f:
+            f.write(b'VCARDS\x02\x00\x00')
+        self.assertRaises(ValueError, vCardSyncIndex, self.index)
@@ -0,0 +1,58 @@
+#!/usr/bin/env python
+# -*- coding: UTF-8 -*-
+#-----------------------------------------------------------------------------
+"""RFC6350 Unit Test."""
+__author__ = ('Lance Finn Helsten',)
+__version__ = '1.0'
+__copyright__ = """Copyright 2011 Lance Finn Helsten (helsten@acm.org)"""
+__license__ = """
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+__docformat__ = "reStructuredText en"
+
+import sys
+import unittest
+
+from pyietflib.rfc6350 import *
+
+class TokenizerTest(unittest.TestCase):
+
+    def test_simple(self):
+        line = 'FN:Lance\r\n'
+        self.assertEqual((None, (0, 2), [], (3, 8)), tokenize_contentline(line))
+
+    def test_group_params(self):
+        line = 'item1.EMAIL;TYPE=work;PREF=1:simon@example.com\r\n'
+        group, name, params, value = tokenize_contentline(line)
+        self.assertEqual('item1', line[slice(*group)])
+        self.assertEqual('EMAIL', line[slice(*name)])
+        self.assertEqual([('TYPE', 'work'), ('PREF', '1')],
+            [(line[ns:ne], line[vs:ve]) for ns, ne, vs, ve in params])
+        self.assertEqual('simon@example.com', line[slice(*value)])
+
+    def test_quoted_param(self):
+        line = 'ADR;LABEL="Mail Drop: TNE QB;Ottawa":;;123 Main Street\r\n'
+        group, name, params, value = tokenize_contentline(line)
+        ns, ne, vs, ve = params[0]
+        self.assertEqual('"Mail Drop: TNE QB;Ottawa"', line[vs:ve])
+        self.assertEqual(';;123 Main Street', line[slice(*value)])
+
+    def test_invalid(self):
+        for line in ['FN:Lance', 'FN:\r\n', 'FN\r\n', ':Lance\r\n',
+                'FN;TYPE:Lance\r\n', 'FN;=work:Lance\r\n', 'FN;TYPE="work:Lance\r\n',
+                'a..FN:Lance\r\n', 'FN:La\nnce\r\n']:
+            self.assertRaises(ValueError, tokenize_contentline, line)
+
+    def test_column(self):
+        with self.assertRaisesRegex(ValueError, r'content-line\[7\] column 3'):
+            tokenize_contentline('FN;TYPE:Lance\r\n', 7)
@@ -0,0 +1,94 @@
+#!/usr/bin/env python
+# -*- coding: UTF-8 -*-
+#-----------------------------------------------------------------------------
+"""RFC6350 Unit Test."""
+__author__ = ('Lance Finn Helsten',)
+__version__ = '1.0'
+__copyright__ = """Copyright 2011 Lance Finn Helsten (helsten@acm.org)"""
+__license__ = """
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+__docformat__ = "reStructuredText en"
+
+import sys
+import io
+import unittest
+
+from pyietflib.rfc6350 import *
+
+valid = (b'BEGIN:VCARD\r\nVERSION:4.0\r\n'
+    b'FN:Simon Perreault\r\n'
+    b'N:Perreault;Simon;;;ing. jr,M.Sc.\r\n'
+    b'GENDER:M\r\n'
+    b'TEL;VALUE=uri;TYPE="work,voice";PREF=1:tel:+1-418-656-9254;ext=102\r\n'
+    b'URL;TYPE=home:http://nomis80.org\r\n'
+    b'X-SPAM;X-EGGS=1:ham\r\n'
+    b'END:VCARD\r\n')
+
+invalid = (b'BEGIN:VCARD\r\nVERSION:4.0\r\n'
+    b'N:Perreault;Simon;;;\r\n'
+    b'N:Perreault;S;;;\r\n'
+    b'BDAY;ALTID=1:19660829\r\n'
+    b'BDAY;ALTID=1;LANGUAGE=en:19660830\r\n'
+    b'GENDER;TYPE=work:M\r\n'
+    b'MEMBER:urn:uuid:03a0e51f-d1aa-4385-8a53-e29025acd8af\r\n'
+    b'END:VCARD\r\n')
+
+class ValidatorTest(unittest.TestCase):
+
+    def validate(self, data, **options):
+        validator = vCardValidator()
+        x = list(vcard_generator(io.BytesIO(data), validator=validator, **options))
+        return x, validator
+
+    def test_valid(self):
+        for lazy in (False, True):
+            x, validator = self.validate(valid + valid, lazy=lazy)
+            self.assertEqual(2, len(x))
+            self.assertEqual([], validator.diagnostics)
+
+    def test_invalid(self):
+        x, validator = self.validate(valid + invalid)
+        self.assertEqual(2, len(x))
+        self.assertEqual([
+                (1, 15, 'BDAY', 'parameter'),
+                (1, 16, 'GENDER', 'parameter'),
+                (1, 0, 'FN', 'required'),
+                (1, 0, 'MEMBER', 'required'),
+                (1, 13, 'N', 'cardinality')],
+            [d[:4] for d in validator.diagnostics])
+
+    def test_lazy(self):
+        x, validator = self.validate(invalid, lazy=True)
+        self.assertEqual(5, len(validator))
+        self.assertEqual(['ALTID', 'LANGUAGE'], x[0]['BDAY'][1].parameter_names())
+
+    def test_properties(self):
+        x, validator = self.validate(invalid, properties=['N', 'GENDER'])
+        self.assertEqual([(0, 7, 'GENDER', 'parameter'), (0, 4, 'N', 'cardinality')],
+            [d[:4] for d in validator.diagnostics])
+
+    def test_grammar(self):
+        data = (b'BEGIN:VCARD\r\nVERSION:4.0\r\n'
+            b'FN:Simon Perreault\r\n'
+            b'X-SPAM:\x07\r\n'
+            b'X-EGGS;VALUE=integer:1.5\r\n'
+            b'X-HAM;VALUE=integer:15\r\n'
+            b'END:VCARD\r\n')
+        validator = vCardValidator(grammar=True)
+        x = list(vcard_generator(io.BytesIO(valid + data), lazy=True, validator=validator))
+        self.assertEqual(2, len(x))
+        self.assertEqual([(1, 13, 'X-SPAM', 'grammar'), (1, 14, 'X-EGGS', 'grammar')],
+            [d[:4] for d in validator.diagnostics])
+        x, validator = self.validate(data, lazy=True)
+        self.assertEqual([], validator.diagnostics)
@@ -0,0 +1,82 @@
+#!/usr/bin/env python
+# -*- coding: UTF-8 -*-
+#-----------------------------------------------------------------------------
+"""RFC6350 Unit Test."""
+__author__ = ('Lance Finn Helsten',)
+__version__ = '1.0'
+__copyright__ = """Copyright 2011 Lance Finn Helsten (helsten@acm.org)"""
+__license__ = """
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+__docformat__ = "reStructuredText en"
+
+import sys
+import unittest
+
+from pyietflib.rfc6350 import *
+
+class ValuesTest(unittest.TestCase):
+
+    def test_text(self):
+        self.assertEqual('plain', decode_text('plain'))
+        self.assertEqual('a,b;c\nd\\e', decode_text(r'a\,b\;c\nd\\e'))
+
+    def test_split(self):
+        self.assertEqual([('a',), ('b', 'c'), ()], split_value('a;b,c;'))
+        self.assertEqual([('a,b',), ('c;d', 'e')], split_value(r'a\,b;c\;d,e'))
+        self.assertEqual([('a',), ('b;c',)], split_value(r'a,b\;c', ','))
+
+    def test_list(self):
+        self.assertEqual(('work', 'home'), decode_list('work,home'))
+        self.assertEqual(('a,b', 'c'), decode_list(r'a\,b,c'))
+
+    def test_N(self):
+        p = property_from_contentline('N:Perreault;Simon;;;ing. jr,M.Sc.\r\n')
+        self.assertEqual(Name(('Perreault',), ('Simon',), (), (), ('ing. jr', 'M.Sc.')), p.typed_value)
+        self.assertEqual(('Simon',), p.typed_value.given)
+        self.assertEqual('Perreault;Simon;;;ing. jr,M.Sc.', p.value)
+        p = property_from_contentline('N:Doe\r\n', lazy=True)
+        self.assertEqual(Name(('Doe',), (), (), (), ()), p.typed_value)
+        p = property_from_contentline('N:a;b;c;d;e;f\r\n', lazy=True)
+        self.assertRaises(ValueError, getattr, p, 'typed_value')
+
+    def test_ADR(self):
+        p = property_from_contentline('ADR;TYPE=work:;Suite D2-630;2875 Laurier;Quebec;QC;G1V 2M2;Canada\r\n')
+        self.assertEqual(('2875 Laurier',), p.typed_value.street)
+        self.assertEqual(('Canada',), p.typed_value.country)
+        self.assertEqual((), p.typed_value.pobox)
+
+    def test_ORG(self):
+        p = property_from_contentline('ORG:ABC\\, Inc.;North American Division;Marketing\r\n')
+        self.assertEqual(Organization('ABC, Inc.', ('North American Division', 'Marketing')), p.typed_value)
+
+    def test_CATEGORIES(self):
+        p = property_from_contentline('CATEGORIES:INTERNET,IETF,INDUSTRY\r\n')
+        self.assertEqual(('INTERNET', 'IETF', 'INDUSTRY'), p.typed_value)
+
+    def test_GENDER(self):
+        p = property_from_contentline('GENDER:O;intersex\\, it\r\n')
+        self.assertEqual(Gender('O', 'intersex, it'), p.typed_value)
+        self.assertEqual('O', p.code)
+        self.assertEqual(('M', None), property_from_contentline('GENDER:M\r\n').typed_value)
+        self.assertRaises(ValueError, property_from_contentline, 'GENDER:X\r\n')
+
+    def test_register(self):
+        from pyietflib.rfc6350 import values
+        register_value_decoder('x-list', decode_list)
+        try:
+            p = property_from_contentline('X-List:a,b\r\n')
+            self.assertEqual(('a', 'b'), p.typed_value)
+        finally:
+            del values.value_decoders['X-LIST']
+        self.assertEqual('a,b', property_from_contentline('X-List:a,b\r\n').typed_value)
@@ -0,0 +1,76 @@
+#!/usr/bin/env python
+# -*- coding: UTF-8 -*-
+#-----------------------------------------------------------------------------
+"""RFC6350 Unit Test."""
+__author__ = ('Lance Finn Helsten',)
+__version__ = '1.0'
+__copyright__ = """Copyright 2011 Lance Finn Helsten (helsten@acm.org)"""
+__license__ = """
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+__docformat__ = "reStructuredText en"
+
+import sys
+import io
+import unittest
+
+from pyietflib.rfc6350 import *
+
+class WriterTest(unittest.TestCase):
+
+    def test_fold_short(self):
+        self.assertEqual(b'FN:Lance\r\n', fold_contentline('FN:Lance\r\n'))
+
+    def test_fold_long(self):
+        line = 'NOTE:' + 'x' * 200 + '\r\n'
+        folded = fold_contentline(line)
+        lines = folded.split(b'\r\n')
+        self.assertEqual(b'', lines[-1])
+        self.assertTrue(all(len(l) <= 75 for l in lines))
+        self.assertTrue(all(l.startswith(b' ') for l in lines[1:-1]))
+        self.assertEqual(line.encode('UTF-8'), folded.replace(b'\r\n ', b''))
+
+    def test_fold_utf8(self):
+        line = 'NOTE:' + '¢' * 100 + '\r\n'
+        folded = fold_contentline(line)
+        for l in folded.split(b'\r\n'):
+            self.assertTrue(len(l) <= 75)
+            l.decode('UTF-8')
+        self.assertEqual(line.encode('UTF-8'), folded.replace(b'\r\n ', b''))
+
+    def test_round_trip(self):
+        data = ('BEGIN:VCARD\r\nVERSION:4.0\r\n'
+            'FN:Simon Perreault\r\n'
+            'item1.EMAIL;TYPE=work:simon.perreault@viagenie.ca\r\n'
+            'NOTE;LANGUAGE=fr:' + 'Les caractères accentués ' * 10 + '\r\n'
+            'END:VCARD\r\n')
+        x = parse_vcard(io.BytesIO(data.encode('UTF-8')))
+        stream = io.BytesIO()
+        self.assertEqual(2, write_vcards([x, x], stream, buffersize=100))
+        stream.seek(0)
+        y = list(vcard_generator(stream))
+        self.assertEqual(2, len(y))
+        self.assertEqual(str(x), str(y[1]))
+        self.assertEqual('item1', y[0]['EMAIL'][0].group)
+        self.assertEqual(x['NOTE'][0].value, y[0]['NOTE'][0].value)
+
+    def test_round_trip_fold_space(self):
+        # The folds fall just before a space, which must not be lost
+        # when the line is unfolded.
+        note = 'a' * 70 + ' word and ' + 'b' * 64 + '  more'
+        line = 'NOTE:' + note + '\r\n'
+        self.assertEqual(b'NOTE:' + b'a' * 70 + b'\r\n  word and ' + b'b' * 64 + b'\r\n   more\r\n',
+                fold_contentline(line))
+        x = parse_vcard('BEGIN:VCARD\r\nVERSION:4.0\r\n{0}END:VCARD\r\n'.format(line).encode('UTF-8'))
+        y = parse_vcard(bytes(x))
+        self.assertEqual(note, y['NOTE'][0].value)
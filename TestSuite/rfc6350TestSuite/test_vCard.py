@@ -69,15 +69,14 @@ class vCardTest(unittest.TestCase):
 BEGIN:VCARD
 VERSION:4.0
 NOTE:This is a long descrip
- \t tion that exists o
-  n a long line. Price is 27\xc2
-    \xa2 or 27 cents.
+\ttion that exists o
+ n a long line. Price is 27\xc2
+ \xa2 or 27 cents.
 END:VCARD
 """.replace(os.linesep.encode("UTF-8"), b'\r\n')))
         self.assertEquals("This is a long description that exists on a long line. Price is 27¢ or 27 cents.", x["NOTE"][0].value)
     
     
-    @unittest.skip("This is causing an 'int' object is not subscriptable error.")
     def test_encoding(self):
         self.assertRaises(ValueError, parse_vcard, b"""\xc2\xc0\r\n""")
     
@@ -301,3 +300,262 @@ END:VCARD
         self.assertEquals("TYPE", x["URL"][0].parameters[0].name)
         self.assertEquals(["home"], x["URL"][0].parameters[0].value)
 
+
+
+
+    def test_generator(self):
+        """Test that each vCard in a stream is generated in order."""
+        stream = encode_to_stream("""
+BEGIN:VCARD
+VERSION:4.0
+FN:First Card
+END:VCARD
+BEGIN:VCARD
+VERSION:4.0
+FN:Second Card
+END:VCARD
+BEGIN:VCARD
+VERSION:4.0
+FN:Third Card
+END:VCARD
+""")
+        x = [v["FN"][0].value for v in vcard_generator(stream)]
+        self.assertEqual(["First Card", "Second Card", "Third Card"], x)
+
+
+
+    def test_generator_no_END(self):
+        """Test that a truncated final vCard is reported."""
+        stream = encode_to_stream("""
+BEGIN:VCARD
+VERSION:4.0
+FN:First Card
+END:VCARD
+BEGIN:VCARD
+VERSION:4.0
+FN:Truncated Card
+""")
+        gen = vcard_generator(stream)
+        self.assertEqual("First Card", next(gen)["FN"][0].value)
+        self.assertRaises(ValueError, next, gen)
+
+
+
+    def test_generator_report(self):
+        """Test that invalid vCards are reported and skipped."""
+        data = (b'BEGIN:VCARD\r\nVERSION:4.0\r\nFN:First Card\r\nEND:VCARD\r\n'
+            b'BEGIN:VCARD\r\nVERSION:3.0\r\nFN:Old Card\r\nEND:VCARD\r\n'
+            b'BEGIN:VCARD\r\nVERSION:4.0\r\nFN:Bad \xc0 Card\r\nNOTE:x\r\nEND:VCARD\r\n'
+            b'BEGIN:VCARD\r\nVERSION:4.0\r\nFN:Fourth Card\r\nEND:VCARD\r\n'
+            b'BEGIN:VCARD\r\nVERSION:4.0\r\n;FN:Bad Line\r\nEND:VCARD\r\n'
+            b'BEGIN:VCARD\r\nVERSION:4.0\r\nFN:Truncated Card')
+        for stream in [data, io.BytesIO(data)]:
+            report = ParseReport()
+            x = [v["FN"][0].value for v in vcard_generator(stream, report=report)]
+            self.assertEqual(["First Card", "Fourth Card"], x)
+            self.assertEqual(2, report.vcards)
+            self.assertEqual([1, 2, 4, 5], [e.card for e in report])
+            self.assertEqual([6, 11, 20, 24], [e.line for e in report])
+            self.assertEqual(data.index(b'VERSION:3.0'), report[0].offset)
+            self.assertEqual(data.index(b'FN:Bad \xc0'), report[1].offset)
+            self.assertTrue(all(isinstance(e.error, ValueError) for e in report))
+            self.assertEqual(2 + 2 + 1, report.skipped)
+            self.assertRaises(ValueError, list, vcard_generator(data))
+
+    def test_generator_report_missing_end(self):
+        """Test that a vCard without END:VCARD is reported and the next
+        vCard is still parsed."""
+        data = (b'BEGIN:VCARD\r\nVERSION:4.0\r\nFN:Truncated Card\r\n'
+            b'BEGIN:VCARD\r\nVERSION:4.0\r\nFN:Valid Card\r\nEND:VCARD\r\n')
+        for stream in [data, io.BytesIO(data)]:
+            report = ParseReport()
+            x = list(vcard_generator(stream, report=report))
+            self.assertEqual(["Valid Card"], [v["FN"][0].value for v in x])
+            self.assertNotIn("BEGIN", x[0])
+            self.assertEqual(1, len(report))
+            self.assertEqual((0, 4), (report[0].card, report[0].line))
+            self.assertEqual(0, report.skipped)
+        self.assertRaises(ValueError, list, vcard_generator(data))
+
+
+
+    def test_intern(self):
+        """Test that equal parameters are shared between vCards."""
+        stream = encode_to_stream("""
+BEGIN:VCARD
+VERSION:4.0
+item1.EMAIL;TYPE=work:first@example.com
+TEL;TYPE=work;PREF=1:tel:+1-418-656-9254
+END:VCARD
+BEGIN:VCARD
+VERSION:4.0
+item1.EMAIL;TYPE=work:second@example.com
+END:VCARD
+""")
+        for lazy in (False, True):
+            stream.seek(0)
+            x = list(vcard_generator(stream, lazy=lazy, intern=True))
+            self.assertIs(x[0]["EMAIL"][0].parameters[0], x[1]["EMAIL"][0].parameters[0])
+            self.assertIs(x[0]["EMAIL"][0].parameters[0], x[0]["TEL"][0].parameters[0])
+            self.assertIs(x[0]["EMAIL"][0].group, x[1]["EMAIL"][0].group)
+            self.assertEqual(1, x[0]["TEL"][0].parameters[1].value)
+            # A vCard cannot change the parameters it shares with others.
+            shared = x[0]["EMAIL"][0].parameters[0]
+            self.assertIsInstance(shared.value, tuple)
+            self.assertRaises(AttributeError, setattr, shared, 'value', ['home'])
+            self.assertEqual(('work',), x[1]["EMAIL"][0].parameters[0].value)
+            self.assertEqual(str(parse_vcard(io.BytesIO(bytes(x[1])))), str(x[1]))
+
+
+
+    def test_pickle(self):
+        """Test that vCards are pickled and copied with all their fields."""
+        import pickle
+        import copy
+        stream = encode_to_stream("""
+BEGIN:VCARD
+VERSION:4.0
+item1.EMAIL;TYPE=work:first@example.com
+TEL;TYPE=work;PREF=1:tel:+1-418-656-9254
+X-SPAM:Eggs
+END:VCARD
+""")
+        for lazy in (False, True):
+            stream.seek(0)
+            x = parse_vcard(stream, lazy=lazy)
+            x.source = 'test'
+            for y in (pickle.loads(pickle.dumps(x)), copy.copy(x), copy.deepcopy(x)):
+                self.assertIsInstance(y, vCard)
+                self.assertEqual('4.0', y.version)
+                self.assertEqual('test', y.source)
+                self.assertEqual(str(x), str(y))
+                self.assertEqual(1, y['TEL'][0].parameters[1].value)
+            self.assertIs(x['TEL'], copy.copy(x)['TEL'])
+            y = copy.deepcopy(x)
+            self.assertIsNot(x['TEL'][0], y['TEL'][0])
+            y['TEL'][0].parameters[1].value = 2
+            self.assertEqual(1, x['TEL'][0].parameters[1].value)
+
+
+
+    def test_feed_parser(self):
+        """Test that vCards are parsed from single byte chunks."""
+        data = encode_to_stream("""
+BEGIN:VCARD
+VERSION:4.0
+FN:Première Carte
+NOTE:Une note très longue qui est pliée sur plus d'une ligne, avec des caractères accentués.
+END:VCARD
+BEGIN:VCARD
+VERSION:4.0
+FN:Second Card
+END:VCARD
+""").getvalue()
+        x = []
+        parser = vCardFeedParser(callback=x.append)
+        count = 0
+        for i in range(len(data)):
+            count = count + parser.feed(data[i:i + 1])
+        count = count + parser.close()
+        self.assertEqual(2, count)
+        self.assertEqual(["Première Carte", "Second Card"], [v["FN"][0].value for v in x])
+
+        parser = vCardFeedParser(lazy=True)
+        self.assertEqual(0, parser.feed(data[:50]))
+        # The last line could be folded by the next chunk.
+        self.assertEqual(1, parser.feed(data[50:]))
+        self.assertEqual(1, parser.close())
+        self.assertEqual(["Première Carte", "Second Card"], [v["FN"][0].value for v in parser.read_vcards()])
+        self.assertEqual([], list(parser.read_vcards()))
+
+
+
+    def test_feed_parser_no_END(self):
+        """Test that closing a feed parser in a vCard is reported."""
+        parser = vCardFeedParser()
+        parser.feed(b'BEGIN:VCARD\r\nVERSION:4.0\r\nFN:Truncated Card\r\n')
+        self.assertRaises(ValueError, parser.close)
+        parser = vCardFeedParser()
+        parser.feed(b'BEGIN:VCARD\r\nVERSION:4.0\r\nFN:Truncated')
+        self.assertRaises(ValueError, parser.close)
+
+
+
+    def test_media_type_generator(self):
+        """Test that the text/vcard media-type generator yields vCards."""
+        import pyietflib
+        stream = encode_to_stream("""
+BEGIN:VCARD
+VERSION:4.0
+FN:First Card
+END:VCARD
+BEGIN:VCARD
+VERSION:4.0
+FN:Second Card
+END:VCARD
+""")
+        x = [v["FN"][0].value for v in pyietflib.media_type_generator('text/vcard', stream)]
+        self.assertEqual(["First Card", "Second Card"], x)
+
+
+
+    def test_unfold_chunks(self):
+        """Test unfolding when chunks split folds and UTF-8 sequences."""
+        data = b"BEGIN:VCARD\r\nVERSION:4.0\r\nNOTE:Price is 27\xc2\r\n \xa2 or 2\r\n\t7 cents.\r\nEND:VCARD\r\n"
+        for size in (1, 2, 3, 7, len(data)):
+            unfolder = ContentLineUnfolder()
+            lines = []
+            for i in range(0, len(data), size):
+                lines.extend(unfolder.feed(data[i:i + size]))
+            lines.extend(unfolder.close())
+            self.assertEqual([
+                    ("BEGIN:VCARD\r\n", 1, 0),
+                    ("VERSION:4.0\r\n", 2, 13),
+                    ("NOTE:Price is 27¢ or 27 cents.\r\n", 3, 26),
+                    ("END:VCARD\r\n", 6, 65),
+                ], lines)
+
+
+
+    def test_unfold_whitespace(self):
+        """Test that unfolding removes only the CRLF and the first
+        whitespace character of the continuation line."""
+        data = b"BEGIN:VCARD\r\nVERSION:4.0\r\nNOTE:foo\r\n  bar\r\n\t\tbaz\r\nEND:VCARD\r\n"
+        self.assertEqual("foo bar\tbaz", parse_vcard(data)["NOTE"][0].value)
+        self.assertEqual("foo bar\tbaz", parse_vcard(io.BytesIO(data))["NOTE"][0].value)
+        for size in (1, 2, 3, 7, len(data)):
+            unfolder = ContentLineUnfolder()
+            lines = []
+            for i in range(0, len(data), size):
+                lines.extend(unfolder.feed(data[i:i + size]))
+            lines.extend(unfolder.close())
+            self.assertEqual(("NOTE:foo bar\tbaz\r\n", 3, 26), lines[2])
+
+
+
+    def test_unfold_buffer(self):
+        """Test that a vCard may be parsed directly from a buffer."""
+        x = parse_vcard(memoryview(b"BEGIN:VCARD\r\nVERSION:4.0\r\nFN:Lance H\r\n elsten\r\nEND:VCARD\r\n"))
+        self.assertEqual("Lance Helsten", x["FN"][0].value)
+
+
+
+    def test_properties(self):
+        """Test that only the selected properties are parsed."""
+        stream = encode_to_stream("""
+BEGIN:VCARD
+VERSION:4.0
+FN:First Card
+work.email;TYPE=work:first@example.com
+BDAY:not a date
+END:VCARD
+BEGIN:VCARD
+VERSION:4.0
+NOTE:No selected properties.
+END:VCARD
+""")
+        x = list(vcard_generator(stream, properties=['FN', 'email']))
+        self.assertEqual(2, len(x))
+        self.assertEqual(['EMAIL', 'FN'], sorted(x[0].keys()))
+        self.assertEqual("first@example.com", x[0]["EMAIL"][0].value)
+        self.assertEqual({}, x[1])
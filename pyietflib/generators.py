@@ -41,7 +41,8 @@ def load_module_for_media_type(mediatype, globals, locals):
         raise KeyError("Unknown builtin mediatype `{0}` for pyietflib.".format(mediatype))
     mediatype = mediatype.lower()
     if not isinstance(mediatype_modules[mediatype], types.ModuleType):
-        m = __import__(mediatype_modules[mediatype], globals=globals, locals=locals)
+        __import__(mediatype_modules[mediatype], globals=globals, locals=locals, level=1)
+        m = sys.modules[registered_media_types[mediatype].__module__]
         register_module_for_media_type(mediatype, m)
     return mediatype_modules[mediatype]
 
@@ -56,6 +57,10 @@ def media_type_generator(mediatype, stream):
     For instance all RFC 6350 streams must be UTF-8 encoded (see RFC 6350
     §3.1) so the stream will be decoded and unfolded automatically by
     the generator.
+
+    If the stream is asynchronous, such as `asyncio.StreamReader`, then
+    the media-type may return an asynchronous generator to be used with
+    ``async for``.
     """
     mediatype = mediatype.lower()
     if mediatype not in registered_media_types:
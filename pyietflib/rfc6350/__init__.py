@@ -21,10 +21,30 @@ from .__meta__ import (__version__, __author__, __license__)
 
 from .vcard import *
 from .property import *
+from .tokenizer import *
+from .values import *
+from .blob import *
+from .grammar import *
+from .validator import *
 from .parameter import *
+from .reader import *
+from .parallel import *
+from .writer import *
+from .jcard import *
+from .sync import *
+from .lookup import *
+from .batch import *
+from .merge import *
+from .cache import *
+from .aio import *
 
 def generator_factory(stream):
-    return 'spam'
+    """Create a generator that will yield each `vCard` in the binary
+    `stream`. If the `stream` is asynchronous (see `is_async_stream`)
+    then this will be an asynchronous generator for ``async for``."""
+    if is_async_stream(stream):
+        return vcard_async_generator(stream)
+    return vcard_generator(stream)
 
 from ..generators import register_type_generator
 register_type_generator('text/vcard', generator_factory)
@@ -0,0 +1,80 @@
+#!/usr/bin/env python
+# -*- coding: UTF-8 -*-
+"""Parse `vCard <http://tools.ietf.org/html/rfc6350>`_ streams that
+arrive asynchronously, such as network bodies read with `asyncio`."""
+__copyright__ = """Copyright 2011 Lance Finn Helsten (helsten@acm.org)"""
+from .__meta__ import (__version__, __author__, __license__)
+
+import sys
+if sys.version_info < (3, 6):
+    raise Exception("rfc6350.aio requires Python 3.6 or higher.")
+import logging
+import asyncio
+import inspect
+
+from .vcard import *
+
+__all__ = ['parse_vcard_async', 'vcard_async_generator',
+    'contentline_async_generator', 'is_async_stream']
+__log__ = logging.getLogger('rfc6350')
+
+
+def is_async_stream(stream):
+    """Return true if `stream` must be read asynchronously: it has a
+    coroutine `read` method (e.g. `asyncio.StreamReader`) or it is an
+    asynchronous iterable of `bytes` chunks."""
+    return inspect.iscoroutinefunction(getattr(stream, 'read', None)) or hasattr(stream, '__aiter__')
+
+
+async def parse_vcard_async(stream, lazy=False, properties=None):
+    """Parse and return a single vCard from the asynchronous binary
+    `stream` (see `contentline_async_generator` for the types of streams
+    allowed, and `parse_vcard` for `lazy` and `properties`)."""
+    async for vcard in vcard_async_generator(stream, lazy=lazy, properties=properties):
+        return vcard
+    raise ValueError('Invalid vCard stream END contentline not found before EOF.')
+
+
+async def vcard_async_generator(stream, lazy=False, properties=None, chunksize=65536):
+    """Generate each vCard in the asynchronous binary `stream`, to be
+    used with ``async for`` (see `vcard_generator`)."""
+    parser = vCardParser(lazy=lazy, properties=properties)
+    async for lines in unfold_async_stream(stream, chunksize):
+        for line, linenum, offset in lines:
+            vcard = parser.contentline(line, linenum)
+            if vcard is not None:
+                yield vcard
+    parser.close()
+
+
+async def contentline_async_generator(stream, chunksize=65536):
+    """Generate unfolded and decoded content lines from the asynchronous
+    `stream`, to be used with ``async for``.
+
+    The `stream` may be an object with a coroutine `read` method, such as
+    `asyncio.StreamReader`, which will be read `chunksize` bytes at a
+    time, or an asynchronous iterable of `bytes` chunks. Each item is a
+    tuple of the content line and the line number that it started on.
+    """
+    async for lines in unfold_async_stream(stream, chunksize):
+        for line, linenum, offset in lines:
+            yield (line, linenum)
+
+
+async def unfold_async_stream(stream, chunksize=65536):
+    """Generate the list of content lines completed by each chunk read
+    from `stream` (see `ContentLineUnfolder.feed`). Control is returned
+    to the event loop after every chunk so that a large stream that is
+    already buffered does not block other tasks."""
+    unfolder = ContentLineUnfolder()
+    if hasattr(stream, 'read'):
+        chunk = await stream.read(chunksize)
+        while chunk:
+            yield unfolder.feed(chunk)
+            await asyncio.sleep(0)
+            chunk = await stream.read(chunksize)
+    else:
+        async for chunk in stream:
+            yield unfolder.feed(chunk)
+            await asyncio.sleep(0)
+    yield unfolder.close()
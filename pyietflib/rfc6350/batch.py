@@ -0,0 +1,235 @@
+#!/usr/bin/env python
+# -*- coding: UTF-8 -*-
+"""Column oriented storage of many `vCard
+<http://tools.ietf.org/html/rfc6350>`_ objects for analysis of one
+property at a time."""
+__copyright__ = """Copyright 2011 Lance Finn Helsten (helsten@acm.org)"""
+from .__meta__ import (__version__, __author__, __license__)
+
+import sys
+if sys.version_info < (3, 2):
+    raise Exception("rfc6350 requires Python 3.2 or higher.")
+import logging
+import array
+import bisect
+
+from .vcard import *
+from .vcard import unfold_stream
+from .property import contentline_name, build_property
+from .tokenizer import tokenize_contentline
+
+__all__ = ['vCardBatch', 'PropertyColumn']
+__log__ = logging.getLogger('rfc6350')
+
+
+class PropertyColumn():
+    """The values of a single property for every vCard in a `vCardBatch`.
+    Each row is one occurrence of the property.
+
+    Properties
+    ----------
+    name
+        The upper case property name.
+
+    cards
+        An array of the index of the vCard of each row, in ascending order.
+
+    lines
+        An array of the line number of each row.
+
+    groups
+        A list of the group name string, or None, of each row.
+
+    values
+        A list of the value string of each row.
+
+    param_offsets
+        An array with the offset of the first parameter of each row in
+        `param_names` and `param_values`, followed by the total number of
+        parameters; the parameters of row `i` are between
+        `param_offsets[i]` and `param_offsets[i + 1]`.
+
+    param_names
+        A list of the name string of every parameter.
+
+    param_values
+        A list of the value string of every parameter.
+    """
+    def __init__(self, name):
+        self.name = name
+        self.cards = array.array('Q')
+        self.lines = array.array('Q')
+        self.groups = []
+        self.values = []
+        self.param_offsets = array.array('Q', [0])
+        self.param_names = []
+        self.param_values = []
+
+    def __len__(self):
+        return len(self.values)
+
+    def append(self, card, linenum, group, value, params):
+        """Add a row for the vCard at index `card`, where `params` is a
+        list of (name, value) tuples."""
+        self.cards.append(card)
+        self.lines.append(linenum)
+        self.groups.append(group)
+        self.values.append(value)
+        for pname, pvalue in params:
+            self.param_names.append(pname)
+            self.param_values.append(pvalue)
+        self.param_offsets.append(len(self.param_names))
+
+    def parameters(self, row):
+        """Return a list of (name, value) tuples of the parameters of
+        `row`."""
+        start = self.param_offsets[row]
+        end = self.param_offsets[row + 1]
+        return list(zip(self.param_names[start:end], self.param_values[start:end]))
+
+    def rows(self, card):
+        """Return the range of rows that belong to the vCard at index
+        `card`."""
+        return range(bisect.bisect_left(self.cards, card), bisect.bisect_right(self.cards, card))
+
+    def where(self, predicate):
+        """Return an array of the index of every vCard with a row whose
+        value string satisfies `predicate`, in ascending order."""
+        ret = array.array('Q')
+        last = -1
+        for card, value in zip(self.cards, self.values):
+            if card != last and predicate(value):
+                ret.append(card)
+                last = card
+        return ret
+
+    def where_parameter(self, name, predicate):
+        """Return an array of the index of every vCard with a row that has
+        a parameter `name` whose value string satisfies `predicate`, in
+        ascending order."""
+        name = name.upper()
+        ret = array.array('Q')
+        last = -1
+        offsets = self.param_offsets
+        for row, card in enumerate(self.cards):
+            if card == last:
+                continue
+            for i in range(offsets[row], offsets[row + 1]):
+                if self.param_names[i].upper() == name and predicate(self.param_values[i]):
+                    ret.append(card)
+                    last = card
+                    break
+        return ret
+
+
+class vCardBatchParser(vCardParser):
+    """A `vCardParser` that tokenizes the content lines of each vCard into
+    rows for the columns of `batch`. The rows are added to the columns
+    only at the END content line, so an invalid vCard adds nothing."""
+    def __init__(self, batch):
+        super().__init__(properties=batch.properties)
+        self.batch = batch
+        self.version = None
+        self.rows = None
+
+    def begin_vcard(self, version):
+        self.version = version
+        self.rows = []
+
+    def add_contentline(self, line, linenum):
+        group, nspan, pspans, vspan = tokenize_contentline(line, linenum)
+        if group:
+            group = line[group[0]:group[1]]
+        params = [(line[ns:ne], line[vs:ve]) for ns, ne, vs, ve in pspans]
+        self.rows.append((contentline_name(line), linenum, group, line[vspan[0]:vspan[1]], params))
+
+    def end_vcard(self):
+        batch = self.batch
+        card = len(batch.versions)
+        for name, linenum, group, value, params in self.rows:
+            column = batch.columns.get(name)
+            if column is None:
+                column = batch.columns[name] = PropertyColumn(name)
+            column.append(card, linenum, group, value, params)
+        batch.versions.append(self.version)
+        self.rows = None
+        return card
+
+
+class vCardBatch():
+    """Holds many vCards column-wise: one `PropertyColumn` per property
+    name instead of a `vCard` and property objects per vCard. Content
+    lines are tokenized directly into the columns, and neither property
+    values nor parameters are parsed.
+
+    The vCards in a binary `stream` (see `vcard_generator`) are added
+    when the batch is created, and more may be added with `extend`. If
+    `properties` is given then only the columns for those property names
+    are kept (see `vCardParser`).
+
+    Properties
+    ----------
+    columns
+        A dictionary of upper case property name to `PropertyColumn`.
+
+    versions
+        A list of the version string of each vCard.
+    """
+    def __init__(self, stream=None, properties=None):
+        if properties is not None:
+            properties = frozenset([p.upper() for p in properties])
+        self.properties = properties
+        self.columns = {}
+        self.versions = []
+        if stream is not None:
+            self.extend(stream)
+
+    def __len__(self):
+        return len(self.versions)
+
+    def __iter__(self):
+        for i in range(len(self)):
+            yield self.vcard(i)
+
+    def extend(self, stream):
+        """Add every vCard in the binary `stream` to the batch and return
+        the number of vCards added. If the stream is invalid then the
+        vCards before the invalid vCard are kept."""
+        count = len(self.versions)
+        parser = vCardBatchParser(self)
+        for line, linenum, offset in unfold_stream(stream):
+            parser.contentline(line, linenum)
+        parser.close()
+        return len(self.versions) - count
+
+    def column(self, name):
+        """Return the `PropertyColumn` for the property `name`, which will
+        be empty if no vCard has that property."""
+        column = self.columns.get(name.upper())
+        if column is None:
+            column = PropertyColumn(name.upper())
+        return column
+
+    def where(self, name, predicate):
+        """Return an array of the index of every vCard that has a property
+        `name` whose value string satisfies `predicate`."""
+        return self.column(name).where(predicate)
+
+    def vcard(self, index):
+        """Build and return the `vCard` at `index` with lazy properties."""
+        if index < 0:
+            index = index + len(self)
+        if not 0 <= index < len(self):
+            raise IndexError('vCard index {0} out of range.'.format(index))
+        rows = []
+        for column in self.columns.values():
+            for row in column.rows(index):
+                rows.append((column.lines[row], column, row))
+        rows.sort(key=lambda r: r[0])
+        ret = vCard(self.versions[index])
+        for linenum, column, row in rows:
+            params = [(n, v, linenum, 0) for n, v in column.parameters(row)]
+            prop = build_property(column.name, column.values[row],
+                    group=column.groups[row], params=params, lazy=True)
+            ret.setdefault(prop.name, []).append(prop)
+        return ret
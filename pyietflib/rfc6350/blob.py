@@ -0,0 +1,200 @@
+#!/usr/bin/env python
+# -*- coding: UTF-8 -*-
+"""Large `vCard <http://tools.ietf.org/html/rfc6350>`_ property values,
+such as inline PHOTO data URIs, kept in temporary files instead of in
+memory."""
+__copyright__ = """Copyright 2011 Lance Finn Helsten (helsten@acm.org)"""
+from .__meta__ import (__version__, __author__, __license__)
+
+import sys
+if sys.version_info < (3, 2):
+    raise Exception("rfc6350 requires Python 3.2 or higher.")
+import logging
+import re
+import mmap
+import base64
+import binascii
+import tempfile
+import contextlib
+
+__all__ = ['Blob', 'spill_properties']
+__log__ = logging.getLogger('rfc6350')
+
+
+# The properties whose values may be spilled to a `Blob`, which are the
+# properties that may have inline binary data as a data URI.
+spill_properties = frozenset(['PHOTO', 'LOGO', 'SOUND', 'KEY'])
+
+base64_uri_re = re.compile(rb'data:[^,]*;base64,', flags=re.IGNORECASE)
+
+fold_re = re.compile(rb'\r\n[ \t]')
+
+# A line ending that may be completed as a fold by the next data.
+partial_fold_re = re.compile(rb'\r\n?$')
+
+whitespace_re = re.compile(rb'[ \t]+')
+
+
+class Blob():
+    """A property value kept in a temporary file, which may be shared
+    with other blobs: the value is the `size` bytes at `offset` in
+    `file`.
+
+    A `data` URI with base64 encoded data, such as an inline PHOTO, is
+    kept decoded so the file holds the binary data, and `prefix` is the
+    URI up to and including the comma. Any other value is kept as UTF-8
+    text and `prefix` is None.
+
+    The value string is only built by `text`, or by `str`, when it is
+    used (e.g. by `Property.value`), with the base64 data encoded again.
+    """
+    def __init__(self, file, offset, size, prefix=None):
+        self.file = file
+        self.offset = offset
+        self.size = size
+        self.prefix = prefix
+
+    def __len__(self):
+        return self.size
+
+    def __str__(self):
+        return self.text()
+
+    def __eq__(self, o):
+        if isinstance(o, Blob):
+            return self.prefix == o.prefix and self.read() == o.read()
+        return NotImplemented
+
+    def __reduce__(self):
+        # The data is pickled and restored to a new temporary file.
+        return (blob_from_bytes, (self.read(), self.prefix))
+
+    def read(self):
+        """Return the data as `bytes`."""
+        self.file.seek(self.offset)
+        return self.file.read(self.size)
+
+    @contextlib.contextmanager
+    def memoryview(self):
+        """Return a context manager that gives a read only `memoryview` of
+        the data, memory mapped from the temporary file. The context owns
+        the map: the view is released and the map is closed when the
+        context ends, so the view must not be used after it::
+
+            with blob.memoryview() as view:
+                ...
+        """
+        if not self.size:
+            yield memoryview(b'')
+            return
+        self.file.flush()
+        # Only the pages of the data are mapped.
+        start = self.offset - self.offset % mmap.ALLOCATIONGRANULARITY
+        buffer = mmap.mmap(self.file.fileno(), self.offset + self.size - start,
+                access=mmap.ACCESS_READ, offset=start)
+        try:
+            with memoryview(buffer) as view:
+                with view[self.offset - start:] as data:
+                    yield data
+        finally:
+            buffer.close()
+
+    def text(self):
+        """Return the value string as it appears in the vCard."""
+        if self.prefix is None:
+            return self.read().decode('UTF-8')
+        return self.prefix + base64.b64encode(self.read()).decode('ascii')
+
+
+class SpilledLine(str):
+    """An unfolded content line with '...' in place of its value, which
+    is kept in the `Blob` `blob`."""
+    pass
+
+
+def blob_from_bytes(data, prefix=None):
+    """Return a `Blob` with `data` in a new temporary file."""
+    file = tempfile.TemporaryFile()
+    file.write(data)
+    return Blob(file, 0, len(data), prefix)
+
+
+class BlobWriter():
+    """Writes a folded property value, given in chunks to `feed`, to the
+    end of the temporary `file` for a `Blob`. Folds may be split between
+    chunks, and base64 data is decoded as it is written.
+
+    Properties
+    ----------
+    folds
+        The number of folds removed from the value.
+    """
+    def __init__(self, file):
+        self.file = file
+        self.offset = file.seek(0, 2)
+        self.size = 0
+        self.folds = 0
+        self.prefix = None
+        self.started = False
+        self.pending = b''
+        self.pending_base64 = b''
+
+    def feed(self, data):
+        """Unfold and write the next chunk of the value."""
+        data = self.pending + data
+        mo = partial_fold_re.search(data)
+        if mo:
+            self.pending = data[mo.start():]
+            data = data[:mo.start()]
+        else:
+            self.pending = b''
+        data = self.unfold(data)
+        if not self.started:
+            if len(data) < 256 and b',' not in data:
+                # The scheme of a data URI may not be complete.
+                self.pending = data + self.pending
+                return
+            self.start(data)
+        else:
+            self.write(data)
+
+    def close(self):
+        """Write the rest of the value, which must not include the CRLF
+        that ends the content line, and return the `Blob`."""
+        data = self.unfold(self.pending)
+        self.pending = b''
+        if not self.started:
+            self.start(data)
+        else:
+            self.write(data)
+        if self.pending_base64:
+            raise ValueError('Invalid base64 data in value: incorrect padding.')
+        return Blob(self.file, self.offset, self.size, self.prefix)
+
+    def unfold(self, data):
+        data, folds = fold_re.subn(b'', data)
+        self.folds = self.folds + folds
+        if b'\r' in data or b'\n' in data:
+            raise ValueError('Invalid line ending in value: {0!r:.30}...'.format(data))
+        return data
+
+    def start(self, data):
+        self.started = True
+        mo = base64_uri_re.match(data)
+        if mo:
+            self.prefix = data[:mo.end()].decode('ascii')
+            data = data[mo.end():]
+        self.write(data)
+
+    def write(self, data):
+        if self.prefix is not None:
+            data = self.pending_base64 + whitespace_re.sub(b'', data)
+            end = len(data) - len(data) % 4
+            self.pending_base64 = data[end:]
+            try:
+                data = base64.b64decode(data[:end], validate=True)
+            except binascii.Error as err:
+                raise ValueError('Invalid base64 data in value: {0}.'.format(err))
+        self.file.seek(0, 2)
+        self.file.write(data)
+        self.size = self.size + len(data)
@@ -0,0 +1,246 @@
+#!/usr/bin/env python
+# -*- coding: UTF-8 -*-
+"""Binary serialisation of parsed `vCard <http://tools.ietf.org/html/rfc6350>`_
+objects, and a cache of the vCards in files that loads unchanged files
+without parsing them again."""
+__copyright__ = """Copyright 2011 Lance Finn Helsten (helsten@acm.org)"""
+from .__meta__ import (__version__, __author__, __license__)
+
+import sys
+if sys.version_info < (3, 3):
+    raise Exception("rfc6350.cache requires Python 3.3 or higher.")
+import logging
+import os
+import struct
+import array
+import hashlib
+import tempfile
+
+from .vcard import *
+from .property import build_property
+from .parameter import build_parameter
+
+__all__ = ['dump_vcards', 'load_vcards', 'vCardCacheWriter', 'vCardCache']
+__log__ = logging.getLogger('rfc6350')
+
+
+magic = b'VCARDC\x02\x00'
+
+record_header = struct.Struct('<IcI')
+header = struct.Struct('<QQI')
+
+class vCardCacheWriter():
+    """Writes vCards to a binary `stream` in the cache format.
+
+    The stream starts with `magic` followed by a length prefixed record
+    for each vCard. Names, groups, parameter values, and the version are
+    written once in a string table that is built as the records are
+    written, and are then given by their index in the table; index 0 is
+    None. A record is::
+
+        uint32 length, typecode, uint32 count, count integers, UTF-8 text
+
+    The integers are unsigned, 16 bit if the `typecode` is 'H' and 32 bit
+    if it is 'I', and little endian like the header. They are the number
+    of new strings and the length of each, the version index, the number
+    of properties, and for each property the name and group index, the
+    number of parameters, the name and value index of each parameter,
+    and the length of the property value. The text is the new strings
+    followed by the property values, and the lengths are in characters
+    so the text is decoded once per record.
+    """
+    def __init__(self, stream):
+        self.stream = stream
+        self.strings = {None: 0}
+        stream.write(magic)
+
+    def write(self, vcard):
+        """Write the record for `vcard`."""
+        strings = self.strings
+        new = []
+        ints = [0]
+        values = []
+
+        def string(value):
+            index = strings.get(value)
+            if index is None:
+                index = strings[value] = len(strings)
+                new.append(value)
+                ints.insert(len(new), len(value))
+            ints.append(index)
+
+        string(vcard.version)
+        props = [prop for props in vcard.values() for prop in props]
+        ints.append(len(props))
+        for prop in props:
+            string(prop.name)
+            string(prop.group)
+            params = prop.raw_parameters()
+            ints.append(len(params))
+            for name, value in params:
+                string(name)
+                string(value)
+            ints.append(len(prop.value))
+            values.append(prop.value)
+        ints[0] = len(new)
+        typecode = 'H' if max(ints) < 0x10000 else 'I'
+        ints = array.array(typecode, ints)
+        if sys.byteorder == 'big':
+            ints.byteswap()
+        data = ints.tobytes()
+        text = ''.join(new + values).encode('UTF-8')
+        size = record_header.size - 4 + len(data) + len(text)
+        self.stream.write(record_header.pack(size, typecode.encode('ascii'), len(ints)))
+        self.stream.write(data)
+        self.stream.write(text)
+
+
+def dump_vcards(vcards, stream):
+    """Write every vCard in the iterable `vcards` to the binary `stream`
+    in the cache format (see `vCardCacheWriter`) and return the number of
+    vCards written."""
+    writer = vCardCacheWriter(stream)
+    count = 0
+    for vcard in vcards:
+        writer.write(vcard)
+        count = count + 1
+    return count
+
+
+def load_vcards(stream, lazy=False):
+    """Generate each vCard in the binary `stream` written by
+    `dump_vcards`. If `lazy` is true then property values and parameters
+    are parsed when they are first used (see `Property`); loading is
+    fastest in lazy mode as nothing is parsed."""
+    if stream.read(len(magic)) != magic:
+        raise ValueError('Invalid vCard cache stream.')
+    strings = [None]
+    prefix = record_header.size - 4
+    data = stream.read(4)
+    while data:
+        record = stream.read(prefix)
+        if len(data) != 4 or len(record) != prefix:
+            raise ValueError('Invalid vCard cache stream truncated record.')
+        size, typecode, count = record_header.unpack(data + record)
+        record = stream.read(size - prefix)
+        if len(record) != size - prefix:
+            raise ValueError('Invalid vCard cache stream truncated record.')
+        try:
+            ints = array.array(typecode.decode('ascii'))
+            end = count * ints.itemsize
+            ints.frombytes(record[:end])
+            if sys.byteorder == 'big':
+                ints.byteswap()
+            ints = ints.tolist()
+            text = record[end:].decode('UTF-8')
+
+            pos = 0
+            i = ints[0] + 1
+            for length in ints[1:i]:
+                strings.append(text[pos:pos + length])
+                pos = pos + length
+            vcard = vCard(strings[ints[i]])
+            i = i + 2
+            for n in range(ints[i - 1]):
+                name = strings[ints[i]]
+                group = strings[ints[i + 1]]
+                params = []
+                i = i + 3
+                for j in range(ints[i - 1]):
+                    if lazy:
+                        params.append((strings[ints[i]], strings[ints[i + 1]], 0, 0))
+                    else:
+                        params.append(build_parameter(strings[ints[i]], strings[ints[i + 1]]))
+                    i = i + 2
+                value = text[pos:pos + ints[i]]
+                pos = pos + ints[i]
+                i = i + 1
+                prop = build_property(name, value, group=group, params=params, lazy=lazy)
+                if prop.name not in vcard:
+                    vcard[prop.name] = []
+                vcard[prop.name].append(prop)
+        except (ValueError, IndexError, UnicodeDecodeError) as err:
+            raise ValueError('Invalid vCard cache record: {0}.'.format(err))
+        yield vcard
+        data = stream.read(4)
+
+
+
+class vCardCache():
+    """Caches the vCards of vCard files in the binary cache format in
+    `directory`, so that a file that has not changed since it was cached
+    is loaded without parsing it.
+
+    A cache file is named by a hash of the absolute path of the vCard
+    file, and starts with a header of the modification time, in
+    nanoseconds, the size, and the path of the vCard file. The cache file
+    is used only if all three match the vCard file.
+    """
+    def __init__(self, directory, lazy=False):
+        self.directory = directory
+        self.lazy = lazy
+
+    def cache_path(self, path):
+        """Return the path of the cache file for the vCard file `path`."""
+        name = hashlib.sha1(os.path.abspath(path).encode('UTF-8')).hexdigest()
+        return os.path.join(self.directory, name + '.vcc')
+
+    def is_cached(self, path):
+        """Return true if the cache file for `path` is up to date."""
+        try:
+            with open(self.cache_path(path), 'rb') as stream:
+                return self.read_header(stream, path)
+        except OSError:
+            return False
+
+    def read_header(self, stream, path):
+        st = os.stat(path)
+        data = stream.read(header.size)
+        if len(data) != header.size:
+            return False
+        mtime, size, pathsize = header.unpack(data)
+        cached = stream.read(pathsize)
+        return (mtime == st.st_mtime_ns and size == st.st_size
+                and cached == os.path.abspath(path).encode('UTF-8'))
+
+    def vcards(self, path):
+        """Generate each vCard in the vCard file `path`, from the cache
+        if it is up to date. Otherwise the file is parsed and the cache
+        file is written as the vCards are generated; it replaces the old
+        cache file only if every vCard is generated."""
+        cache_path = self.cache_path(path)
+        try:
+            stream = open(cache_path, 'rb')
+        except OSError:
+            stream = None
+        if stream is not None:
+            with stream:
+                if self.read_header(stream, path):
+                    for vcard in load_vcards(stream, lazy=self.lazy):
+                        yield vcard
+                    return
+        for vcard in self.parse(path, cache_path):
+            yield vcard
+
+    def load(self, path):
+        """Return a list of the vCards in the vCard file `path` (see
+        `vcards`)."""
+        return list(self.vcards(path))
+
+    def parse(self, path, cache_path):
+        os.makedirs(self.directory, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(suffix='.tmp', dir=self.directory)
+        try:
+            with os.fdopen(fd, 'wb') as cache, open(path, 'rb') as stream:
+                st = os.fstat(stream.fileno())
+                abspath = os.path.abspath(path).encode('UTF-8')
+                cache.write(header.pack(st.st_mtime_ns, st.st_size, len(abspath)))
+                cache.write(abspath)
+                writer = vCardCacheWriter(cache)
+                for vcard in vcard_generator(stream, lazy=self.lazy):
+                    writer.write(vcard)
+                    yield vcard
+            os.replace(tmp_path, cache_path)
+        finally:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
@@ -0,0 +1,560 @@
+#!/usr/bin/env python
+# -*- coding: UTF-8 -*-
+"""Compile the `RFC 6350 <http://tools.ietf.org/html/rfc6350#section-3.3>`_
+ABNF rules in `vCard_v4` into an `NFA` and then, lazily, a table driven
+deterministic `StateMachine` that validates content lines against the
+full grammar in linear time."""
+__copyright__ = """Copyright 2011 Lance Finn Helsten (helsten@acm.org)"""
+from .__meta__ import (__version__, __author__, __license__)
+
+import sys
+if sys.version_info < (3, 2):
+    raise Exception("rfc6350 requires Python 3.2 or higher.")
+import logging
+import os
+import re
+import ast
+import bisect
+import warnings
+
+__all__ = ['abnf_rules', 'compile_rule', 'valid_contentline', 'valid_value']
+__log__ = logging.getLogger('rfc6350')
+
+
+# The rules used by `vCard_v4` that are defined elsewhere: the core rules
+# (`RFC 5234 § B.1 <http://tools.ietf.org/html/rfc5234#appendix-B.1>`_),
+# URI (`RFC 3986 <http://tools.ietf.org/html/rfc3986#appendix-A>`_),
+# Language-Tag (`RFC 5646 <http://tools.ietf.org/html/rfc5646#section-2.1>`_),
+# the TYPE values of TEL and RELATED (`RFC 6350 § 6.4.1, 6.6.6
+# <http://tools.ietf.org/html/rfc6350#section-6.4.1>`_), and the media
+# type names and parameters (`RFC 4288 <http://tools.ietf.org/html/rfc4288#section-4.2>`_,
+# `RFC 2045 <http://tools.ietf.org/html/rfc2045#section-5.1>`_).
+#
+# These also replace the prose rules of `vCard_v4`, and NON-ASCII which
+# is given as UTF-8 bytes there but is matched against decoded text.
+external_rules = r'''
+ALPHA = %x41-5A / %x61-7A
+CHAR = %x01-7F
+CR = %x0D
+CRLF = CR LF
+DIGIT = %x30-39
+DQUOTE = %x22
+HEXDIG = DIGIT / "A" / "B" / "C" / "D" / "E" / "F"
+HTAB = %x09
+LF = %x0A
+SP = %x20
+VCHAR = %x21-7E
+WSP = SP / HTAB
+
+NON-ASCII = %x80-D7FF / %xE000-10FFFF
+iana-valuespec = *VALUE-CHAR
+
+URI = scheme ":" hier-part [ "?" query ] [ "#" fragment ]
+hier-part = "//" authority path-abempty / path-absolute / path-rootless / path-empty
+scheme = ALPHA *( ALPHA / DIGIT / "+" / "-" / "." )
+authority = [ userinfo "@" ] host [ ":" port ]
+userinfo = *( unreserved / pct-encoded / sub-delims / ":" )
+host = IP-literal / IPv4address / reg-name
+port = *DIGIT
+IP-literal = "[" ( IPv6address / IPvFuture ) "]"
+IPvFuture = "v" 1*HEXDIG "." 1*( unreserved / sub-delims / ":" )
+IPv6address = 6( h16 ":" ) ls32
+    / "::" 5( h16 ":" ) ls32
+    / [ h16 ] "::" 4( h16 ":" ) ls32
+    / [ *1( h16 ":" ) h16 ] "::" 3( h16 ":" ) ls32
+    / [ *2( h16 ":" ) h16 ] "::" 2( h16 ":" ) ls32
+    / [ *3( h16 ":" ) h16 ] "::" h16 ":" ls32
+    / [ *4( h16 ":" ) h16 ] "::" ls32
+    / [ *5( h16 ":" ) h16 ] "::" h16
+    / [ *6( h16 ":" ) h16 ] "::"
+h16 = 1*4HEXDIG
+ls32 = ( h16 ":" h16 ) / IPv4address
+IPv4address = dec-octet "." dec-octet "." dec-octet "." dec-octet
+dec-octet = "25" %x30-35 / "2" %x30-34 DIGIT / "1" 2DIGIT / %x31-39 DIGIT / DIGIT
+reg-name = *( unreserved / pct-encoded / sub-delims )
+path-abempty = *( "/" segment )
+path-absolute = "/" [ segment-nz *( "/" segment ) ]
+path-rootless = segment-nz *( "/" segment )
+path-empty = 0pchar
+segment = *pchar
+segment-nz = 1*pchar
+pchar = unreserved / pct-encoded / sub-delims / ":" / "@"
+query = *( pchar / "/" / "?" )
+fragment = *( pchar / "/" / "?" )
+pct-encoded = "%" HEXDIG HEXDIG
+unreserved = ALPHA / DIGIT / "-" / "." / "_" / "~"
+sub-delims = "!" / "$" / "&" / "'" / "(" / ")" / "*" / "+" / "," / ";" / "="
+
+Language-Tag = langtag / privateuse / grandfathered
+langtag = language [ "-" script ] [ "-" region ] *( "-" variant )
+    *( "-" extension ) [ "-" privateuse ]
+language = 2*3ALPHA [ "-" extlang ] / 4ALPHA / 5*8ALPHA
+extlang = 3ALPHA *2( "-" 3ALPHA )
+script = 4ALPHA
+region = 2ALPHA / 3DIGIT
+variant = 5*8alphanum / ( DIGIT 3alphanum )
+extension = singleton 1*( "-" ( 2*8alphanum ) )
+singleton = DIGIT / %x41-57 / %x59-5A / %x61-77 / %x79-7A
+privateuse = "x" 1*( "-" ( 1*8alphanum ) )
+grandfathered = irregular / regular
+irregular = "en-GB-oed" / "i-ami" / "i-bnn" / "i-default" / "i-enochian"
+    / "i-hak" / "i-klingon" / "i-lux" / "i-mingo" / "i-navajo" / "i-pwn"
+    / "i-tao" / "i-tay" / "i-tsu" / "sgn-BE-FR" / "sgn-BE-NL" / "sgn-CH-DE"
+regular = "art-lojban" / "cel-gaulish" / "no-bok" / "no-nyn" / "zh-guoyu"
+    / "zh-hakka" / "zh-min" / "zh-min-nan" / "zh-xiang"
+alphanum = ALPHA / DIGIT
+
+type-param-tel = "text" / "voice" / "fax" / "cell" / "video" / "pager"
+    / "textphone" / iana-token / x-name
+type-param-related = related-type-value *( "," related-type-value )
+related-type-value = "contact" / "acquaintance" / "friend" / "met"
+    / "co-worker" / "colleague" / "co-resident" / "neighbor" / "child"
+    / "parent" / "sibling" / "spouse" / "kin" / "muse" / "crush" / "date"
+    / "sweetheart" / "me" / "agent" / "emergency"
+
+type-name = 1*127mime-name-char
+subtype-name = 1*127mime-name-char
+mime-name-char = ALPHA / DIGIT / "!" / "#" / "$" / "&" / "." / "+" / "-" / "^" / "_"
+mime-attribute = mime-token
+mime-value = mime-token / mime-quoted-string
+mime-token = 1*( %x21 / %x23-27 / %x2A-2B / %x2D-2E / %x30-39 / %x41-5A / %x5E-7E )
+mime-quoted-string = DQUOTE *( %x01-09 / %x0B-0C / %x0E-21 / %x23-5B / %x5D-7F
+    / "\" CHAR ) DQUOTE
+'''
+
+# Rule names used by a rule that are from another grammar, so they
+# differ from the rules of the same name in `vCard_v4`.
+rule_aliases = {
+    'mediatype': {'attribute': 'mime-attribute', 'value': 'mime-value'},
+}
+
+# The rule for the value of each VALUE parameter type (`RFC 6350 § 5.2
+# <http://tools.ietf.org/html/rfc6350#section-5.2>`_).
+value_type_rules = {
+    'text': 'text-list',
+    'uri': 'URI',
+    'date': 'date-list',
+    'time': 'time-list',
+    'date-time': 'date-time-list',
+    'date-and-or-time': 'date-and-or-time-list',
+    'timestamp': 'timestamp-list',
+    'boolean': 'boolean',
+    'integer': 'integer-list',
+    'float': 'float-list',
+    'utc-offset': 'utc-offset',
+    'language-tag': 'Language-Tag',
+}
+
+
+def vcard_v4_rules(path=None):
+    """Generate the ABNF text of each `abnf.rule` decorator in the
+    `vCard_v4` module, read with `ast` so the module, and the `abnf`
+    module it needs, are not imported."""
+    if path is None:
+        path = os.path.join(os.path.dirname(__file__), 'vCard_v4.py')
+    with open(path, 'rb') as f:
+        source = f.read()
+    with warnings.catch_warnings():
+        # The rules have backslashes that are not Python escapes.
+        warnings.simplefilter('ignore')
+        tree = ast.parse(source, path)
+    for node in ast.walk(tree):
+        for decorator in getattr(node, 'decorator_list', ()):
+            if (isinstance(decorator, ast.Call)
+                    and isinstance(decorator.func, ast.Attribute)
+                    and decorator.func.attr == 'rule' and len(decorator.args) == 2):
+                yield ast.literal_eval(decorator.args[1])
+
+
+abnf_token_re = re.compile(r'''
+    (?P<space>(?:[ \t\r\n]+|;[^\n]*)+) |
+    (?P<string>"[^"]*") |
+    (?P<number>%(?:[xX][0-9A-Fa-f]+(?:-[0-9A-Fa-f]+|(?:\.[0-9A-Fa-f]+)+)?
+                  |[dD][0-9]+(?:-[0-9]+|(?:\.[0-9]+)+)?)) |
+    (?P<prose><[^>]*>) |
+    (?P<repeat>[0-9]*\*[0-9]*|[0-9]+) |
+    (?P<name>[A-Za-z][A-Za-z0-9-]*) |
+    (?P<op>=|/|\(|\)|\[|\])
+    ''', flags=re.VERBOSE)
+
+def abnf_tokens(text):
+    """Return a list of the (kind, text) tokens of ABNF `text` without
+    white space or comments."""
+    ret = []
+    pos = 0
+    while pos < len(text):
+        mo = abnf_token_re.match(text, pos)
+        if mo is None:
+            raise ValueError('Invalid ABNF at {0!r:.30}...'.format(text[pos:]))
+        if mo.lastgroup != 'space':
+            ret.append((mo.lastgroup, mo.group()))
+        pos = mo.end()
+    return ret
+
+
+class ABNFParser():
+    """Parse the tokens of ABNF `RFC 5234 § 4
+    <http://tools.ietf.org/html/rfc5234#section-4>`_ rule definitions into
+    trees of tuples:
+
+    - ('alt', [node, ...])
+    - ('cat', [node, ...])
+    - ('rep', min, max, node), where max is None for no limit
+    - ('str', text), a case insensitive string
+    - ('chars', [(first, last), ...]), one character in the ranges
+    - ('rule', name)
+    - ('prose', text)
+    """
+    def __init__(self, tokens):
+        self.tokens = tokens
+        self.pos = 0
+
+    def peek(self):
+        if self.pos < len(self.tokens):
+            return self.tokens[self.pos]
+        return (None, None)
+
+    def take(self, kind, text=None):
+        token = self.peek()
+        if token[0] != kind or (text is not None and token[1] != text):
+            raise ValueError('Invalid ABNF expected {0} found {1!r}.'.format(text or kind, token[1]))
+        self.pos = self.pos + 1
+        return token[1]
+
+    def rules(self):
+        """Return a list of the (name, tree) of every rule."""
+        ret = []
+        while self.pos < len(self.tokens):
+            name = self.take('name')
+            self.take('op', '=')
+            ret.append((name, self.alternation()))
+        return ret
+
+    def alternation(self):
+        items = [self.concatenation()]
+        while self.peek() == ('op', '/'):
+            self.pos = self.pos + 1
+            items.append(self.concatenation())
+        return items[0] if len(items) == 1 else ('alt', items)
+
+    def concatenation(self):
+        items = []
+        while True:
+            kind, text = self.peek()
+            if kind == 'name' and self.tokens[self.pos + 1:self.pos + 2] == [('op', '=')]:
+                break       # the start of the next rule
+            if kind in ('repeat', 'name', 'string', 'number', 'prose') or text in ('(', '['):
+                items.append(self.repetition())
+            else:
+                break
+        return items[0] if len(items) == 1 else ('cat', items)
+
+    def repetition(self):
+        kind, text = self.peek()
+        if kind != 'repeat':
+            return self.element()
+        self.pos = self.pos + 1
+        if '*' in text:
+            low, high = text.split('*')
+            low = int(low) if low else 0
+            high = int(high) if high else None
+        else:
+            low = high = int(text)
+        return ('rep', low, high, self.element())
+
+    def element(self):
+        kind, text = self.peek()
+        self.pos = self.pos + 1
+        if kind == 'name':
+            return ('rule', text)
+        elif kind == 'string':
+            return ('str', text[1:-1])
+        elif kind == 'prose':
+            return ('prose', text[1:-1])
+        elif kind == 'number':
+            base = 16 if text[1] in 'xX' else 10
+            if '-' in text:
+                first, last = text[2:].split('-')
+                return ('chars', [(int(first, base), int(last, base))])
+            codes = [int(n, base) for n in text[2:].split('.')]
+            if len(codes) == 1:
+                return ('chars', [(codes[0], codes[0])])
+            return ('cat', [('chars', [(c, c)]) for c in codes])
+        elif text == '(':
+            ret = self.alternation()
+            self.take('op', ')')
+            return ret
+        elif text == '[':
+            ret = self.alternation()
+            self.take('op', ']')
+            return ('rep', 0, 1, ret)
+        raise ValueError('Invalid ABNF unexpected {0!r}.'.format(text))
+
+
+def parse_abnf(text):
+    """Return a list of the (name, tree) of the rules in ABNF `text` (see
+    `ABNFParser`)."""
+    return ABNFParser(abnf_tokens(text)).rules()
+
+
+rules_cache = {}
+
+def abnf_rules():
+    """Return a dict of the lower case name to (name, tree) of every rule
+    in `vCard_v4` and `external_rules`."""
+    if not rules_cache:
+        rules = {}
+        for text in vcard_v4_rules():
+            for name, tree in parse_abnf(text):
+                rules[name.lower()] = (name, tree)
+        for name, tree in parse_abnf(external_rules):
+            rules[name.lower()] = (name, tree)
+        rules_cache.update(rules)
+    return rules_cache
+
+
+def rule_ranges(chars):
+    """Return the (first, last) code point ranges of a case insensitive
+    string character."""
+    lower, upper = ord(chars.lower()), ord(chars.upper())
+    if lower == upper:
+        return [(lower, lower)]
+    return [(lower, lower), (upper, upper)]
+
+
+class NFA():
+    """A nondeterministic finite automaton built from ABNF rule trees.
+    Referenced rules are expanded in place, which is possible because the
+    vCard grammar has no recursive rules.
+
+    Properties
+    ----------
+    edges
+        For each state a list of (first, last, target) where a character
+        from `first` to `last` moves to the `target` state.
+
+    epsilons
+        For each state a list of the states it moves to without a
+        character.
+    """
+    def __init__(self, rules):
+        self.rules = rules
+        self.edges = []
+        self.epsilons = []
+        self.expanding = []
+
+    def __len__(self):
+        return len(self.edges)
+
+    def state(self):
+        self.edges.append([])
+        self.epsilons.append([])
+        return len(self.edges) - 1
+
+    def rule(self, name, start, aliases=None):
+        """Add the states for the rule `name` from the `start` state and
+        return the final state."""
+        if aliases:
+            name = aliases.get(name.lower(), name)
+        key = name.lower()
+        if key in self.expanding:
+            raise ValueError('Invalid ABNF recursive rule {0}.'.format(name))
+        if key not in self.rules:
+            raise ValueError('Invalid ABNF undefined rule {0}.'.format(name))
+        self.expanding.append(key)
+        ret = self.node(self.rules[key][1], start, rule_aliases.get(key))
+        self.expanding.pop()
+        return ret
+
+    def node(self, node, start, aliases=None):
+        """Add the states for the tree `node` from the `start` state and
+        return the final state."""
+        kind = node[0]
+        if kind == 'chars':
+            end = self.state()
+            self.edges[start].extend([(first, last, end) for first, last in node[1]])
+            return end
+        elif kind == 'str':
+            for c in node[1]:
+                end = self.state()
+                self.edges[start].extend([(first, last, end) for first, last in rule_ranges(c)])
+                start = end
+            return start
+        elif kind == 'rule':
+            return self.rule(node[1], start, aliases)
+        elif kind == 'cat':
+            for item in node[1]:
+                start = self.node(item, start, aliases)
+            return start
+        elif kind == 'alt':
+            end = self.state()
+            for item in node[1]:
+                first = self.state()
+                self.epsilons[start].append(first)
+                self.epsilons[self.node(item, first, aliases)].append(end)
+            return end
+        elif kind == 'rep':
+            low, high, item = node[1:]
+            for i in range(low):
+                start = self.node(item, start, aliases)
+            end = self.state()
+            self.epsilons[start].append(end)
+            if high is None:
+                self.epsilons[self.node(item, end, aliases)].append(end)
+            else:
+                for i in range(high - low):
+                    start = self.node(item, start, aliases)
+                    self.epsilons[start].append(end)
+            return end
+        elif kind == 'prose':
+            raise ValueError('Invalid ABNF prose rule <{0}>.'.format(node[1]))
+        raise ValueError('Invalid ABNF node {0!r}.'.format(kind))
+
+
+def class_pattern(bounds, classes):
+    """Return a regular expression character set of the character
+    `classes` of `bounds` (see `StateMachine`)."""
+    ret = []
+    for k in classes:
+        first = bounds[k - 1] if k else 0
+        last = bounds[k] - 1 if k < len(bounds) else sys.maxunicode
+        ret.append('\\U{0:08x}-\\U{1:08x}'.format(first, last))
+    return '[' + ''.join(ret) + ']*'
+
+
+class StateMachine():
+    """A deterministic finite automaton for an ABNF rule that is built
+    lazily from the `NFA`: each state is a set of NFA states, and the row
+    of the transition table for a state is computed the first time the
+    state is reached, so only the states used by the data are built.
+
+    The table is indexed by character class instead of character, where
+    the classes are the ranges between the sorted `bounds` of every NFA
+    edge; a class is found with a lookup table for ASCII and `bisect` for
+    other characters. A run of characters that keep the machine in the
+    same state, such as the characters of a text value, is skipped with
+    a single regular expression character set match.
+
+    A string is matched in linear time, without the backtracking of a
+    regular expression with alternatives that overlap, as in the
+    vCard grammar.
+    """
+    def __init__(self, nfa, start, final):
+        self.nfa = nfa
+        self.final = final
+        bounds = set()
+        for edges in nfa.edges:
+            for first, last, target in edges:
+                bounds.add(first)
+                bounds.add(last + 1)
+        self.bounds = bounds = sorted(bounds)
+        self.ascii = [bisect.bisect_right(bounds, c) for c in range(128)]
+        self.class_edges = [[(bisect.bisect_right(bounds, first), bisect.bisect_right(bounds, last), target)
+                for first, last, target in edges] for edges in nfa.edges]
+        self.states = {}
+        self.table = []
+        self.accepting = []
+        self.skips = []
+        self.sets = []
+        self.add_state(self.closure([start]))
+
+    def __len__(self):
+        return len(self.table)
+
+    def closure(self, states):
+        epsilons = self.nfa.epsilons
+        ret = set(states)
+        stack = list(states)
+        while stack:
+            for target in epsilons[stack.pop()]:
+                if target not in ret:
+                    ret.add(target)
+                    stack.append(target)
+        return frozenset(ret)
+
+    def add_state(self, states):
+        ret = self.states.get(states)
+        if ret is None:
+            ret = self.states[states] = len(self.table)
+            self.table.append(None)
+            self.skips.append(None)
+            self.accepting.append(self.final in states)
+            self.sets.append(states)
+        return ret
+
+    def expand(self, state):
+        """Compute the row of the transition table for `state`."""
+        moves = {}
+        class_edges = self.class_edges
+        for s in self.sets[state]:
+            for first, last, target in class_edges[s]:
+                for k in range(first, last + 1):
+                    moves.setdefault(k, set()).add(target)
+        row = [-1] * (len(self.bounds) + 1)
+        closures = {}
+        for k, targets in moves.items():
+            targets = frozenset(targets)
+            target = closures.get(targets)
+            if target is None:
+                target = closures[targets] = self.add_state(self.closure(targets))
+            row[k] = target
+        loops = [k for k, target in enumerate(row) if target == state]
+        if loops:
+            self.skips[state] = re.compile(class_pattern(self.bounds, loops)).match
+        self.table[state] = row
+        return row
+
+    def accepts(self, text):
+        """Return true if the whole of `text` matches the rule."""
+        table, skips, ascii, bounds = self.table, self.skips, self.ascii, self.bounds
+        state = 0
+        row = table[0] or self.expand(0)
+        pos = 0
+        size = len(text)
+        while pos < size:
+            skip = skips[state]
+            if skip is not None:
+                pos = skip(text, pos).end()
+                if pos == size:
+                    break
+            c = ord(text[pos])
+            state = row[ascii[c] if c < 128 else bisect.bisect_right(bounds, c)]
+            if state < 0:
+                return False
+            row = table[state] or self.expand(state)
+            pos = pos + 1
+        return self.accepting[state]
+
+
+machines = {}
+
+def compile_rule(name):
+    """Return the `StateMachine` for the ABNF rule `name` in the vCard
+    grammar (see `abnf_rules`). The rules are read and compiled the first
+    time they are used, and the machine, with the states it has built, is
+    kept for every later use."""
+    key = name.lower()
+    ret = machines.get(key)
+    if ret is None:
+        nfa = NFA(abnf_rules())
+        start = nfa.state()
+        ret = machines[key] = StateMachine(nfa, start, nfa.rule(name, start))
+    return ret
+
+
+def valid_contentline(line):
+    """Return true if the unfolded content `line`, with its CRLF, matches
+    the `RFC 6350 contentline <http://tools.ietf.org/html/rfc6350#section-3.3>`_
+    rule."""
+    return compile_rule('contentline').accepts(line)
+
+
+def valid_value(value, value_type):
+    """Return true if `value` is valid for the VALUE parameter
+    `value_type` (see `value_type_rules`); a type that is not defined by
+    `RFC 6350 § 5.2 <http://tools.ietf.org/html/rfc6350#section-5.2>`_
+    is always valid."""
+    rule = value_type_rules.get(value_type.lower())
+    if rule is None:
+        return True
+    return compile_rule(rule).accepts(value)
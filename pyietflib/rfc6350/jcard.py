@@ -0,0 +1,432 @@
+#!/usr/bin/env python
+# -*- coding: UTF-8 -*-
+"""Write and read `vCard <http://tools.ietf.org/html/rfc6350>`_ objects as
+`jCard <http://tools.ietf.org/html/rfc7095>`_, the JSON format for vCard
+data."""
+__copyright__ = """Copyright 2011 Lance Finn Helsten (helsten@acm.org)"""
+from .__meta__ import (__version__, __author__, __license__)
+
+import sys
+if sys.version_info < (3, 2):
+    raise Exception("rfc6350 requires Python 3.2 or higher.")
+import logging
+import re
+import json
+import json.encoder
+import codecs
+import datetime
+
+from .vcard import *
+from .property import build_property, defined_properties, URI, Language
+from .parameter import build_parameter
+from .values import *
+from .values import decode_text
+
+__all__ = ['vcard_to_jcard', 'jcard_to_vcard', 'write_jcards', 'jCardWriter',
+    'jcard_generator']
+__log__ = logging.getLogger('rfc6350')
+
+
+# The jCard value type for the `value_type` of each property class, and
+# for the properties where that is not enough to tell the type.
+jcard_value_types = {
+    str: 'text',
+    URI: 'uri',
+    datetime.datetime: 'date-and-or-time',
+    Language: 'language-tag',
+    tuple: 'text',
+    Name: 'text',
+    Address: 'text',
+    Organization: 'text',
+    Gender: 'text',
+}
+
+property_value_types = {
+    'REV': 'timestamp',
+}
+
+# The properties with a structured value, which is an array in jCard
+# (`RFC 7095 § 3.3.1.3 <http://tools.ietf.org/html/rfc7095#section-3.3.1.3>`_),
+# and those with multiple values that are each an element of the property
+# (`§ 3.3.1.2 <http://tools.ietf.org/html/rfc7095#section-3.3.1.2>`_).
+structured_types = (Name, Address, Organization, Gender)
+structured_properties = frozenset(['CLIENTPIDMAP'])
+multiple_types = (tuple,)
+
+# Parameters that may have multiple values, which are an array in jCard.
+multiple_parameters = frozenset(['TYPE', 'PID', 'SORT-AS'])
+
+list_value_types = frozenset(['date', 'time', 'date-time', 'date-and-or-time',
+    'timestamp', 'boolean', 'integer', 'float'])
+
+encode_string = json.encoder.encode_basestring
+
+
+def default_value_type(name):
+    """Return the jCard value type of the property `name` when it has no
+    VALUE parameter; properties that are not defined are 'unknown'
+    (`RFC 7095 § 5 <http://tools.ietf.org/html/rfc7095#section-5>`_)."""
+    ret = property_value_types.get(name)
+    if ret is None:
+        cls = defined_properties.get(name)
+        value_type = getattr(cls, 'value_type', None)
+        if isinstance(value_type, tuple):
+            value_type = value_type[0]
+        ret = jcard_value_types.get(value_type, 'unknown')
+    return ret
+
+def property_structure(name):
+    """Return 'structured', 'multiple', or None for the value of the
+    property `name`."""
+    if name in structured_properties:
+        return 'structured'
+    value_type = getattr(defined_properties.get(name), 'value_type', None)
+    if value_type in structured_types:
+        return 'structured'
+    elif value_type in multiple_types:
+        return 'multiple'
+    return None
+
+
+basic_date_re = re.compile(r'^(\d{4})(\d\d)(\d\d)$|^--(\d\d)(\d\d)$')
+
+basic_time_re = re.compile(r'''^(?:(\d\d)(\d\d)?(\d\d)?|-(\d\d)(\d\d)?|--(\d\d))
+        (Z|[+-]\d\d(?:\d\d)?)?$''', flags=re.VERBOSE)
+
+extended_date_re = re.compile(r'^(\d{4})-(\d\d)-(\d\d)$|^--(\d\d)-(\d\d)$')
+
+def extended_date(value):
+    """Return the `RFC 6350 § 4.3.1 <http://tools.ietf.org/html/rfc6350#section-4.3.1>`_
+    basic format date `value` in the extended format of `RFC 7095 § 3.5.3
+    <http://tools.ietf.org/html/rfc7095#section-3.5.3>`_."""
+    mo = basic_date_re.match(value)
+    if mo is None:
+        return value
+    if mo.group(1):
+        return '-'.join(mo.group(1, 2, 3))
+    return '--' + '-'.join(mo.group(4, 5))
+
+def extended_time(value):
+    """Return the basic format time `value` in the extended format."""
+    mo = basic_time_re.match(value)
+    if mo is None:
+        return value
+    hour, minute, second, tminute, tsecond, tsecond2, zone = mo.groups()
+    if hour:
+        ret = ':'.join([x for x in (hour, minute, second) if x])
+    elif tminute:
+        ret = '-' + ':'.join([x for x in (tminute, tsecond) if x])
+    else:
+        ret = '--' + tsecond2
+    if zone and len(zone) == 5:
+        zone = zone[:3] + ':' + zone[3:]
+    return ret + (zone or '')
+
+def basic_date(value):
+    """Return the extended format date `value` in the basic format."""
+    mo = extended_date_re.match(value)
+    if mo is None:
+        return value
+    if mo.group(1):
+        return ''.join(mo.group(1, 2, 3))
+    return '--' + ''.join(mo.group(4, 5))
+
+def basic_time(value):
+    """Return the extended format time `value` in the basic format."""
+    return value.replace(':', '')
+
+def convert_datetime(value, value_type, date, time):
+    """Convert the date and time `value` of `value_type` with the `date`
+    and `time` functions."""
+    if value_type == 'date':
+        return date(value)
+    elif value_type == 'time':
+        return time(value)
+    elif value_type == 'date-and-or-time' and value[:1] == 'T':
+        return 'T' + time(value[1:])
+    elif 'T' in value:
+        day, sep, clock = value.partition('T')
+        return date(day) + 'T' + time(clock)
+    return date(value)
+
+
+###
+### Writing
+###
+
+def property_to_jcard(prop):
+    """Return the jCard JSON text of the property `prop`."""
+    name = prop.name.upper()
+    value_type = None
+    params = []
+    if prop.group:
+        params.append('"group":' + encode_string(prop.group))
+    for pname, pvalue in prop.raw_parameters():
+        pname = pname.upper()
+        if pvalue[:1] == '"' and pvalue[-1:] == '"':
+            pvalue = pvalue[1:-1]
+        if pname == 'VALUE':
+            value_type = pvalue.lower()
+            continue
+        if pname in multiple_parameters and ',' in pvalue:
+            pvalue = '[' + ','.join([encode_string(v) for v in pvalue.split(',')]) + ']'
+        else:
+            pvalue = encode_string(pvalue)
+        params.append(encode_string(pname.lower()) + ':' + pvalue)
+    if value_type is None:
+        value_type = default_value_type(name)
+
+    value = prop.value
+    if value_type == 'text':
+        structure = property_structure(name)
+        if structure == 'structured':
+            components = []
+            for component in split_value(value):
+                if len(component) == 1:
+                    components.append(encode_string(component[0]))
+                elif component:
+                    components.append('[' + ','.join([encode_string(v) for v in component]) + ']')
+                else:
+                    components.append('""')
+            if len(components) == 1:
+                values = components
+            else:
+                values = ['[' + ','.join(components) + ']']
+        elif structure == 'multiple':
+            values = [encode_string(v) for v in decode_list(value)]
+        else:
+            values = [encode_string(decode_text(value))]
+    elif value_type in list_value_types:
+        values = []
+        for v in value.split(','):
+            if value_type == 'boolean':
+                values.append('true' if v.upper() == 'TRUE' else 'false')
+            elif value_type in ('integer', 'float'):
+                try:
+                    values.append(repr(int(v) if value_type == 'integer' else float(v)))
+                except ValueError:
+                    raise ValueError('Invalid {0} value for {1}: "{2:.30s}".'.format(value_type, name, v))
+            else:
+                values.append(encode_string(convert_datetime(v, value_type, extended_date, extended_time)))
+    elif value_type == 'utc-offset':
+        values = [encode_string(extended_time('00' + value)[2:])]
+    else:
+        values = [encode_string(value)]
+    return ''.join(['[', encode_string(name.lower()), ',{', ','.join(params), '},"', value_type, '",',
+            ','.join(values), ']'])
+
+def vcard_to_jcard(vcard):
+    """Return the jCard JSON text of `vcard`."""
+    ret = ['["vcard",[["version",{},"text",', encode_string(vcard.version), ']']
+    for props in vcard.values():
+        for prop in props:
+            ret.append(',')
+            ret.append(property_to_jcard(prop))
+    ret.append(']]')
+    return ''.join(ret)
+
+
+def write_jcards(vcards, stream, buffersize=65536):
+    """Write every vCard in the iterable `vcards` to the binary `stream`
+    as a JSON array of jCards and return the number of vCards written."""
+    with jCardWriter(stream, buffersize) as writer:
+        for vcard in vcards:
+            writer.write(vcard)
+    return writer.count
+
+
+class jCardWriter():
+    """Writes vCards to a binary `stream` as a UTF-8 encoded JSON array of
+    jCards, with the JSON text of each property written directly from the
+    property and parameter strings. As `vCardWriter` the encoded jCards
+    are buffered until there are at least `buffersize` bytes. The writer
+    must be closed, or used as a context manager, to end the array.
+    """
+    def __init__(self, stream, buffersize=65536):
+        self.stream = stream
+        self.buffersize = buffersize
+        self.buffer = bytearray(b'[')
+        self.count = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def write(self, vcard):
+        """Add the jCard of `vcard` to the buffer, writing the buffer to
+        the stream if it is full."""
+        if self.count:
+            self.buffer.extend(b',')
+        self.buffer.extend(vcard_to_jcard(vcard).encode('UTF-8'))
+        self.count = self.count + 1
+        if len(self.buffer) >= self.buffersize:
+            self.flush()
+
+    def flush(self):
+        """Write any buffered jCards to the stream."""
+        if self.buffer:
+            self.stream.write(self.buffer)
+            self.buffer = bytearray()
+
+    def close(self):
+        """End the array and write it to the stream."""
+        if self.buffer is not None:
+            self.buffer.extend(b']')
+            self.flush()
+            self.buffer = None
+
+
+###
+### Reading
+###
+
+def escape_text(value, structured=False):
+    value = value.replace('\\', '\\\\').replace(',', '\\,').replace('\n', '\\n')
+    if structured:
+        value = value.replace(';', '\\;')
+    return value
+
+def quote_parameter(value):
+    if ':' in value or ';' in value or ',' in value:
+        return '"' + value + '"'
+    return value
+
+def jcard_value(name, value_type, values):
+    """Return the vCard value string of the jCard `values` of the property
+    `name` with `value_type`."""
+    if value_type == 'text':
+        structure = property_structure(name)
+        ret = []
+        for value in values:
+            if isinstance(value, list) or structure == 'structured':
+                if not isinstance(value, list):
+                    value = [value]
+                ret.append(';'.join([','.join([escape_text(c, True) for c in component])
+                        if isinstance(component, list) else escape_text(component, True)
+                        for component in value]))
+            else:
+                ret.append(escape_text(value))
+        return ','.join(ret)
+    ret = []
+    for value in values:
+        if isinstance(value, bool):
+            ret.append('TRUE' if value else 'FALSE')
+        elif isinstance(value, (int, float)):
+            ret.append(str(value))
+        elif not isinstance(value, str):
+            raise ValueError('Invalid jCard value for {0}: {1!r:.30}.'.format(name, value))
+        elif value_type in ('date', 'time', 'date-time', 'date-and-or-time', 'timestamp'):
+            ret.append(convert_datetime(value, value_type, basic_date, basic_time))
+        elif value_type == 'utc-offset':
+            ret.append(basic_time(value))
+        else:
+            ret.append(value)
+    return ','.join(ret)
+
+def property_from_jcard(item, lazy=False):
+    """Create the property object for the jCard property array `item`."""
+    if not isinstance(item, list) or len(item) < 4 or not isinstance(item[1], dict):
+        raise ValueError('Invalid jCard property: {0!r:.30}.'.format(item))
+    name = item[0].upper()
+    value_type = item[2].lower()
+    group = None
+    params = []
+    for pname, pvalue in item[1].items():
+        if pname.lower() == 'group':
+            group = pvalue
+            continue
+        if isinstance(pvalue, list):
+            pvalue = ','.join([quote_parameter(str(v)) for v in pvalue])
+        else:
+            pvalue = quote_parameter(str(pvalue))
+        params.append((pname.upper(), pvalue))
+    if value_type != 'unknown' and value_type != default_value_type(name):
+        params.append(('VALUE', value_type))
+    value = jcard_value(name, value_type, item[3:])
+    if lazy:
+        params = [(pname, pvalue, 0, 0) for pname, pvalue in params]
+    else:
+        params = [build_parameter(pname, pvalue) for pname, pvalue in params]
+    return build_property(name, value, group=group, params=params, lazy=lazy)
+
+def jcard_to_vcard(jcard, lazy=False):
+    """Return the `vCard` of the decoded jCard array `jcard`. See
+    `parse_vcard` for `lazy`."""
+    if (not isinstance(jcard, list) or len(jcard) != 2 or jcard[0] != 'vcard'
+            or not isinstance(jcard[1], list)):
+        raise ValueError('Invalid jCard: {0!r:.30}.'.format(jcard))
+    vcard = None
+    for item in jcard[1]:
+        if vcard is None:
+            if not isinstance(item, list) or item[:1] != ['version'] or len(item) != 4:
+                raise ValueError('Invalid jCard version property: {0!r:.30}.'.format(item))
+            vcard = vCard(item[3])
+            continue
+        prop = property_from_jcard(item, lazy=lazy)
+        if prop.name not in vcard:
+            vcard[prop.name] = []
+        vcard[prop.name].append(prop)
+    if vcard is None:
+        raise ValueError('Invalid jCard without a version property.')
+    return vcard
+
+
+whitespace_re = re.compile(r'[ \t\n\r]*')
+
+def jcard_generator(stream, lazy=False, chunksize=65536):
+    """Generate each vCard in the binary `stream` of UTF-8 encoded JSON
+    that is either a single jCard or an array of jCards. Only the jCard
+    currently being parsed is held in memory, each is decoded when the
+    data read has the whole of it. See `parse_vcard` for `lazy`."""
+    decoder = json.JSONDecoder()
+    text = codecs.getincrementaldecoder('UTF-8')()
+    state = {'buffer': '', 'eof': False}
+
+    def more(size):
+        data = stream.read(size)
+        state['buffer'] = state['buffer'] + text.decode(data, not data)
+        state['eof'] = not data
+
+    def skip(pos):
+        while True:
+            pos = whitespace_re.match(state['buffer'], pos).end()
+            if pos < len(state['buffer']) or state['eof']:
+                return pos
+            more(chunksize)
+
+    def decode(pos):
+        while True:
+            try:
+                return decoder.raw_decode(state['buffer'], pos)
+            except ValueError as err:
+                if state['eof']:
+                    raise ValueError('Invalid jCard stream: {0}.'.format(err))
+                more(max(chunksize, len(state['buffer']) - pos))
+
+    start = skip(0)
+    if state['buffer'][start:start + 1] != '[':
+        raise ValueError('Invalid jCard stream does not start with an array.')
+    pos = skip(start + 1)
+    if state['buffer'][pos:pos + 1] == '"':
+        # A single jCard.
+        jcard, end = decode(start)
+        yield jcard_to_vcard(jcard, lazy=lazy)
+        return
+    first = True
+    while True:
+        pos = skip(pos)
+        c = state['buffer'][pos:pos + 1]
+        if c == ']':
+            return
+        elif not first:
+            if c != ',':
+                raise ValueError('Invalid jCard stream expected "," found {0!r}.'.format(c))
+            pos = skip(pos + 1)
+        jcard, pos = decode(pos)
+        first = False
+        if pos >= chunksize:
+            state['buffer'] = state['buffer'][pos:]
+            pos = 0
+        yield jcard_to_vcard(jcard, lazy=lazy)
@@ -0,0 +1,177 @@
+#!/usr/bin/env python
+# -*- coding: UTF-8 -*-
+"""A reverse lookup index of the EMAIL, TEL, and IMPP values of
+`vCard <http://tools.ietf.org/html/rfc6350>`_ objects, that finds the
+vCards that have a given email address, telephone number, or instant
+messaging URI, and is memory mapped instead of built again."""
+__copyright__ = """Copyright 2011 Lance Finn Helsten (helsten@acm.org)"""
+from .__meta__ import (__version__, __author__, __license__)
+
+import sys
+if sys.version_info < (3, 3):
+    raise Exception("rfc6350.lookup requires Python 3.3 or higher.")
+import logging
+import mmap
+import array
+import bisect
+import struct
+import hashlib
+
+from .merge import normalise_email, normalise_tel_digits, normalise_impp
+
+__all__ = ['normalise_value', 'write_lookup', 'vCardLookup']
+__log__ = logging.getLogger('rfc6350')
+
+
+magic = b'VCARDL\x01\x00'
+
+header = struct.Struct('<Q')
+
+normalisers = {
+    'EMAIL': normalise_email,
+    'TEL': normalise_tel_digits,
+    'IMPP': normalise_impp,
+}
+
+def normalise_value(name, value):
+    """Return the normalised `value` of the EMAIL, TEL, or IMPP property
+    `name` that is the key in the index, using `normalise_email`,
+    `normalise_tel_digits`, or `normalise_impp`."""
+    name = name.upper()
+    if name not in normalisers:
+        raise ValueError('Lookup property {0} is not EMAIL, TEL, or IMPP.'.format(name))
+    return normalisers[name](value)
+
+def value_hash(name, value):
+    """Return the 64 bit hash of the normalised `value` of `name`."""
+    key = '{0}:{1}'.format(name, value).encode('UTF-8')
+    return int.from_bytes(hashlib.sha1(key).digest()[:8], 'little')
+
+
+def write_lookup(vcards, stream, refs=None):
+    """Write a lookup index of every vCard in the iterable `vcards` to
+    the binary `stream`, and return the number of entries written.
+
+    The reference to a vCard is its index in `vcards`, which is also its
+    index in a `vCardReader` of the same file, or the next integer from
+    the iterable `refs`, such as the byte offsets in `vCardReader.starts`.
+
+    The stream is `magic`, the number of entries, and then two arrays of
+    that many 64 bit unsigned integers: the hash of every normalised value
+    in order, and the reference of the vCard with each value. The integers
+    are little endian.
+    """
+    entries = set()
+    if refs is None:
+        refs = range(sys.maxsize)
+    for vcard, ref in zip(vcards, refs):
+        for name in normalisers:
+            for prop in vcard.get(name, ()):
+                value = normalise_value(name, prop.value)
+                if value:
+                    entries.add((value_hash(name, value), ref))
+    entries = sorted(entries)
+    hashes = array.array('Q', [entry[0] for entry in entries])
+    references = array.array('Q', [entry[1] for entry in entries])
+    if sys.byteorder == 'big':
+        hashes.byteswap()
+        references.byteswap()
+    stream.write(magic)
+    stream.write(header.pack(len(entries)))
+    stream.write(hashes.tobytes())
+    stream.write(references.tobytes())
+    return len(entries)
+
+
+class vCardLookup():
+    """Memory maps a lookup index written by `write_lookup` from the file
+    `path`, and finds the references of the vCards with an EMAIL, TEL, or
+    IMPP value. The lookup should be closed when it is no longer needed.
+
+    The values are found by a binary search of their hashes, so a value
+    that is not in the index may, very rarely, find a vCard with another
+    value that has the same 64 bit hash.
+    """
+    def __init__(self, path):
+        self.path = path
+        self.file = open(path, 'rb')
+        self.buffer = None
+        self.hashes = array.array('Q')
+        self.refs = array.array('Q')
+        try:
+            data = self.file.read(len(magic) + header.size)
+            if len(data) != len(magic) + header.size or data[:len(magic)] != magic:
+                raise ValueError('Invalid vCard lookup index {0}.'.format(path))
+            count, = header.unpack_from(data, len(magic))
+            start = len(data)
+            end = start + 16 * count
+            if sys.byteorder == 'big':
+                # The index must be byte swapped so it cannot be mapped.
+                buffer = self.file.read(16 * count)
+                if len(buffer) != 16 * count:
+                    raise ValueError('Invalid vCard lookup index {0} truncated.'.format(path))
+                self.hashes = array.array('Q', buffer[:8 * count])
+                self.refs = array.array('Q', buffer[8 * count:])
+                self.hashes.byteswap()
+                self.refs.byteswap()
+                return
+            self.buffer = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ)
+            if len(self.buffer) < end:
+                raise ValueError('Invalid vCard lookup index {0} truncated.'.format(path))
+            view = memoryview(self.buffer)
+            self.hashes = view[start:start + 8 * count].cast('Q')
+            self.refs = view[start + 8 * count:end].cast('Q')
+            view.release()
+        except ValueError:
+            self.close()
+            raise
+
+    def __len__(self):
+        return len(self.hashes)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def find(self, name, value):
+        """Return a list of the references of the vCards with the EMAIL,
+        TEL, or IMPP property `name` that has `value` (see
+        `normalise_value`)."""
+        name = name.upper()
+        value = normalise_value(name, value)
+        if not value:
+            return []
+        key = value_hash(name, value)
+        start = bisect.bisect_left(self.hashes, key)
+        end = bisect.bisect_right(self.hashes, key, start)
+        return [self.refs[i] for i in range(start, end)]
+
+    def email(self, value):
+        """Return a list of the references of the vCards with the EMAIL
+        `value`."""
+        return self.find('EMAIL', value)
+
+    def tel(self, value):
+        """Return a list of the references of the vCards with the TEL
+        `value`."""
+        return self.find('TEL', value)
+
+    def impp(self, value):
+        """Return a list of the references of the vCards with the IMPP
+        `value`."""
+        return self.find('IMPP', value)
+
+    def close(self):
+        """Release the memory map and close the file."""
+        if self.buffer is not None:
+            # The views of the map must be released before it is closed.
+            for view in (self.hashes, self.refs):
+                if isinstance(view, memoryview):
+                    view.release()
+            self.hashes = array.array('Q')
+            self.refs = array.array('Q')
+            self.buffer.close()
+            self.buffer = None
+        self.file.close()
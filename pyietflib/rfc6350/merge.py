@@ -0,0 +1,293 @@
+#!/usr/bin/env python
+# -*- coding: UTF-8 -*-
+"""Find and merge the `vCard <http://tools.ietf.org/html/rfc6350>`_
+objects that represent the same entity, as described in `RFC 6350 § 7
+<http://tools.ietf.org/html/rfc6350#section-7>`_."""
+__copyright__ = """Copyright 2011 Lance Finn Helsten (helsten@acm.org)"""
+from .__meta__ import (__version__, __author__, __license__)
+
+import sys
+if sys.version_info < (3, 2):
+    raise Exception("rfc6350 requires Python 3.2 or higher.")
+import logging
+import re
+import array
+
+from .vcard import *
+from .property import build_property
+from .parameter import build_parameter
+
+__all__ = ['vCardMerger', 'merge_vcards', 'vcard_keys',
+    'normalise_email', 'normalise_tel', 'normalise_tel_digits', 'normalise_impp']
+__log__ = logging.getLogger('rfc6350')
+
+
+# `RFC 3966 <http://tools.ietf.org/html/rfc3966#section-3>`_ visual
+# separators and white space.
+tel_separators_re = re.compile(r'[\s\-.()]')
+
+nondigit_re = re.compile(r'[^0-9]+')
+
+def normalise_email(value):
+    """Return the EMAIL `value` without a mailto scheme and in lower
+    case."""
+    value = value.strip()
+    if value[:7].lower() == 'mailto:':
+        value = value[7:]
+    return value.lower()
+
+def normalise_tel(value):
+    """Return the TEL `value` without a tel scheme, white space, or
+    visual separators, and in lower case."""
+    value = value.strip()
+    if value[:4].lower() == 'tel:':
+        value = value[4:]
+    return tel_separators_re.sub('', value).lower()
+
+def normalise_tel_digits(value):
+    """Return only the digits of the number in the TEL `value` (see
+    `normalise_tel`), without its parameters such as an extension."""
+    value = normalise_tel(value).split(';', 1)[0]
+    return nondigit_re.sub('', value)
+
+def normalise_impp(value):
+    """Return the IMPP `value` without white space and in lower case."""
+    return value.strip().lower()
+
+normalisers = {
+    'EMAIL': normalise_email,
+    'TEL': normalise_tel,
+}
+
+def client_pid_map(vcard):
+    """Return a dict of the source identifier strings to URIs of the
+    CLIENTPIDMAP properties in `vcard`."""
+    ret = {}
+    for prop in vcard.get('CLIENTPIDMAP', ()):
+        source, sep, uri = prop.value.partition(';')
+        if sep:
+            ret[source.strip()] = uri.strip()
+    return ret
+
+def property_pids(prop, pidmap):
+    """Return a list of the (URI, local identifier) of each PID value on
+    `prop`, using `pidmap` from `client_pid_map` for the URIs. PID values
+    without a source identifier, or with a source identifier that is not
+    in `pidmap`, only identify the property in its own vCard and are not
+    included."""
+    ret = []
+    if 'PID' not in prop.parameter_names():
+        return ret
+    for param in prop.parameters:
+        if param.name.upper() != 'PID':
+            continue
+        for pid in param.valuestr.split(','):
+            local, sep, source = pid.strip().partition('.')
+            uri = pidmap.get(source)
+            if uri is not None:
+                ret.append((uri, local))
+    return ret
+
+def vcard_keys(vcard):
+    """Generate the keys of `vcard` that identify the entity it
+    represents; two vCards with any key in common are duplicates. The
+    keys are the UID, the URI and local identifier of each PID
+    (see `property_pids`) with the property name, and the normalised
+    EMAIL and TEL values."""
+    for prop in vcard.get('UID', ()):
+        yield ('UID', prop.value.strip())
+    pidmap = client_pid_map(vcard)
+    if pidmap:
+        for name, props in vcard.items():
+            for prop in props:
+                for uri, local in property_pids(prop, pidmap):
+                    yield ('PID', name, uri, local)
+    for name, normalise in normalisers.items():
+        for prop in vcard.get(name, ()):
+            yield (name, normalise(prop.value))
+
+
+
+class vCardMerger():
+    """Groups duplicate vCards as they are added, with a hash index of
+    the keys of every vCard (see `vcard_keys`) and a disjoint set forest
+    of the vCard indexes, so that each vCard is compared only with the
+    vCards that share a key with it.
+
+    Properties
+    ----------
+    vcards
+        The list of vCards in the order they were added.
+
+    index
+        A dict of each key to the index of the first vCard with that key.
+    """
+    def __init__(self, keys=vcard_keys):
+        self.keys = keys
+        self.vcards = []
+        self.index = {}
+        self.parents = array.array('Q')
+
+    def __len__(self):
+        return len(self.vcards)
+
+    def add(self, vcard):
+        """Add `vcard` and return its index."""
+        i = len(self.vcards)
+        self.vcards.append(vcard)
+        self.parents.append(i)
+        index = self.index
+        for key in self.keys(vcard):
+            j = index.setdefault(key, i)
+            if j != i:
+                self.union(i, j)
+        return i
+
+    def extend(self, vcards):
+        """Add every vCard in the iterable `vcards`."""
+        for vcard in vcards:
+            self.add(vcard)
+
+    def find(self, i):
+        """Return the index of the first vCard in the group of the vCard
+        at index `i`."""
+        parents = self.parents
+        while parents[i] != i:
+            parents[i] = parents[parents[i]]
+            i = parents[i]
+        return i
+
+    def union(self, i, j):
+        """Join the groups of the vCards at index `i` and `j`."""
+        i = self.find(i)
+        j = self.find(j)
+        if i < j:
+            self.parents[j] = i
+        elif j < i:
+            self.parents[i] = j
+
+    def groups(self):
+        """Return a list of the groups of duplicate vCards, each a list
+        of vCard indexes in ascending order, in the order of the first
+        vCard of each group."""
+        groups = {}
+        ret = []
+        for i in range(len(self.vcards)):
+            root = self.find(i)
+            if root == i:
+                groups[i] = [i]
+                ret.append(groups[i])
+            else:
+                groups[root].append(i)
+        return ret
+
+    def merged(self):
+        """Generate the merged vCard of each group (see `merge_vcards`);
+        a vCard without duplicates is generated as it is."""
+        for group in self.groups():
+            if len(group) == 1:
+                yield self.vcards[group[0]]
+            else:
+                yield merge_vcards([self.vcards[i] for i in group])
+
+
+
+class MergedProperty():
+    """A property of a merged vCard with the PIDs and PREF of all the
+    properties that were merged into it."""
+    __slots__ = ('prop', 'pids', 'pref', 'changed')
+
+    def __init__(self, prop, pids, pref):
+        self.prop = prop
+        self.pids = pids
+        self.pref = pref
+        self.changed = False
+
+def property_pref(prop):
+    if 'PREF' not in prop.parameter_names():
+        return None
+    for param in prop.parameters:
+        if param.name.upper() == 'PREF':
+            return int(param.valuestr)
+    return None
+
+def revision(vcard):
+    # REV values are compared as strings without the separators of the
+    # ISO 8601 extended format.
+    for prop in vcard.get('REV', ()):
+        return prop.value.replace('-', '').replace(':', '')
+    return ''
+
+def merge_vcards(vcards):
+    """Return a new vCard with the properties of all the `vcards`, which
+    represent the same entity.
+
+    The vCards are used from the most to the least recent REV. A property
+    that may occur only once is taken from the first vCard that has it.
+    Other properties are merged when they have a PID in common or equal
+    values (normalised for EMAIL and TEL); the merged property has all of
+    their PIDs and the lowest PREF. The CLIENTPIDMAP properties are
+    renumbered so that every URI has a single source identifier, and the
+    PID parameters are changed to match. PID values without a source
+    identifier are removed."""
+    vcards = sorted(vcards, key=revision, reverse=True)
+    sources = {}
+    merged = {}
+    found = {}
+    for vcard in vcards:
+        pidmap = client_pid_map(vcard)
+        for uri in pidmap.values():
+            if uri not in sources:
+                sources[uri] = str(len(sources) + 1)
+        for name, props in vcard.items():
+            if name == 'CLIENTPIDMAP' or not props:
+                continue
+            if name in merged and getattr(type(props[0]), 'cardinality', '*') in ('1', '*1'):
+                continue
+            normalise = normalisers.get(name)
+            entries = merged.setdefault(name, [])
+            for prop in props:
+                pids = property_pids(prop, pidmap)
+                pref = property_pref(prop)
+                value = normalise(prop.value) if normalise else prop.value
+                keys = [('PID', name) + pid for pid in pids]
+                keys.append(('VALUE', name, value))
+                entry = None
+                for key in keys:
+                    entry = found.get(key)
+                    if entry is not None:
+                        break
+                if entry is None:
+                    entry = MergedProperty(prop, pids, pref)
+                    entry.changed = 'PID' in prop.parameter_names()
+                    entries.append(entry)
+                else:
+                    entry.pids.extend([pid for pid in pids if pid not in entry.pids])
+                    if pref is not None and (entry.pref is None or pref < entry.pref):
+                        entry.pref = pref
+                    entry.changed = True
+                for key in keys:
+                    found.setdefault(key, entry)
+
+    ret = vCard()
+    for name, entries in merged.items():
+        ret[name] = [merged_property(entry, sources) for entry in entries]
+    if sources:
+        ret['CLIENTPIDMAP'] = [build_property('CLIENTPIDMAP', '{0};{1}'.format(source, uri))
+                for uri, source in sources.items()]
+    return ret
+
+def merged_property(entry, sources):
+    """Return the property for a `MergedProperty` with its PID parameter
+    changed to the renumbered `sources` and its PREF parameter changed to
+    the lowest PREF."""
+    prop = entry.prop
+    if not entry.changed:
+        return prop
+    params = [p for p in prop.parameters if p.name.upper() not in ('PID', 'PREF')]
+    if entry.pids:
+        pids = ','.join(['{0}.{1}'.format(local, sources[uri]) for uri, local in entry.pids])
+        params.append(build_parameter('PID', pids))
+    if entry.pref is not None:
+        params.append(build_parameter('PREF', str(entry.pref)))
+    return build_property(prop.name, prop.value, group=prop.group, params=params)
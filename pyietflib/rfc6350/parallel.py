@@ -0,0 +1,104 @@
+#!/usr/bin/env python
+# -*- coding: UTF-8 -*-
+"""Parse the vCards in a `vCard <http://tools.ietf.org/html/rfc6350>`_
+file with a pool of processes."""
+__copyright__ = """Copyright 2011 Lance Finn Helsten (helsten@acm.org)"""
+from .__meta__ import (__version__, __author__, __license__)
+
+import sys
+if sys.version_info < (3, 2):
+    raise Exception("rfc6350 requires Python 3.2 or higher.")
+import os
+import logging
+import mmap
+import collections
+import concurrent.futures
+
+from .vcard import *
+from .vcard import unfold_buffer
+from .reader import vcard_offsets
+
+__all__ = ['parse_vcards_parallel']
+__log__ = logging.getLogger('rfc6350')
+
+
+def parse_vcards_parallel(path, workers=None, ordered=True, batchsize=1000,
+        lazy=False, properties=None):
+    """Parse the vCard file at `path` with a pool of `workers` processes,
+    and generate each vCard.
+
+    The file is split at BEGIN:VCARD boundaries into batches of
+    `batchsize` vCards and each batch is parsed in a separate process.
+    If `ordered` is true then the vCards are generated in the order they
+    appear in the file, otherwise each batch is generated as soon as it
+    is finished. At most two batches per worker are outstanding at any
+    time. See `parse_vcard` for `lazy` and `properties`.
+    """
+    with concurrent.futures.ProcessPoolExecutor(workers) as executor:
+        pending = collections.deque()
+        limit = 2 * (workers or os.cpu_count() or 1)
+        for start, end in vcard_batches(path, batchsize):
+            pending.append(executor.submit(parse_vcard_range, path, start, end, lazy, properties))
+            if len(pending) >= limit:
+                for vcard in next_batch(pending, ordered):
+                    yield vcard
+        while pending:
+            for vcard in next_batch(pending, ordered):
+                yield vcard
+
+
+def vcard_batches(path, batchsize):
+    """Generate the start and end byte offsets of batches of `batchsize`
+    vCards in the file at `path`."""
+    with open(path, 'rb') as f:
+        try:
+            buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            # An empty file cannot be mapped.
+            return
+        try:
+            count = 0
+            for start, end in vcard_offsets(buffer):
+                if count == 0:
+                    batchstart = start
+                count = count + 1
+                if count == batchsize:
+                    yield (batchstart, end)
+                    count = 0
+            if count:
+                yield (batchstart, end)
+        finally:
+            buffer.close()
+
+
+def next_batch(pending, ordered):
+    """Remove a finished batch from the `pending` futures and return its
+    vCards. If `ordered` then this will wait for the oldest batch."""
+    if ordered:
+        future = pending.popleft()
+    else:
+        done, waiting = concurrent.futures.wait(pending, return_when=concurrent.futures.FIRST_COMPLETED)
+        future = done.pop()
+        pending.remove(future)
+    return future.result()
+
+
+def parse_vcard_range(path, start, end, lazy=False, properties=None):
+    """Parse and return a list of the vCards between the `start` and `end`
+    byte offsets in the file at `path`."""
+    with open(path, 'rb') as f:
+        buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            ret = []
+            parser = vCardParser(lazy=lazy, properties=properties)
+            try:
+                for line, linenum, offset in unfold_buffer(buffer, start, end):
+                    vcard = parser.contentline(line, linenum)
+                    if vcard is not None:
+                        ret.append(vcard)
+                parser.close()
+            except ValueError as err:
+                raise ValueError('Invalid vCard in bytes {0}-{1} of {2}: {3}'.format(start, end, path, err))
+            return ret
+        finally:
+            buffer.close()
@@ -10,12 +10,14 @@ if sys.version_info < (3, 2):
 import logging
 import string
 import re
+import functools
+import copy
 
 from pyietflib.rfc2045 import ContentType
 import pyietflib.rfc5870
 from pyietflib.rfc5646 import LanguageTag
 
-__all__ = ['build_parameter']
+__all__ = ['build_parameter', 'register_parameter', 'intern_parameter']
 __log__ = logging.getLogger('rfc6350')
 
 
@@ -35,15 +37,16 @@ class Parameter():
         The value for the parameter. The type will depend on the actual
         parameter.
     """
+    __slots__ = ('__name', '__value', 'valuestr')
+
     def __init__(self, name, value, line=0, column=0):
         self.__name = name
-        self.line = line
-        self.column = column
         self.valuestr = value
-        self.value = self.parse_value(value)
-
-        delattr(self, 'line')
-        delattr(self, 'column')
+        try:
+            self.value = self.parse_value(value)
+        except ValueError as err:
+            # The position is only needed to report an invalid value.
+            raise ValueError('{0} [{1}, {2}].'.format(str(err).rstrip('.'), line, column))
 
     def __str__(self):
         def value_str(value):
@@ -58,7 +61,7 @@ class Parameter():
         ret = [';', self.name, '=']
         if isinstance(self.value, (str, int, float)):
             ret.append(value_str(self.value))
-        elif isinstance(self.value, list):
+        elif isinstance(self.value, (list, tuple)):
             ret.append(','.join([value_str(v) for v in self.value]))
         else:
             ret.append(value_str(str(self.value)))
@@ -67,9 +70,39 @@ class Parameter():
             ret[-1] = '"{0}"'.format(ret[-1])
         return ''.join(ret)
 
+    def __reduce__(self):
+        # The value has already been parsed and checked, so it is restored
+        # as it is without calling `parse_value` or `check_value`.
+        interned = interned_parameters.get((self.__name, self.valuestr)) is self
+        return (restore_parameter, (type(self), self.__name, self.valuestr, self.__value, interned))
+
+    def __copy__(self):
+        value = self.__value
+        if isinstance(value, tuple):
+            # The copy of a shared parameter is not shared.
+            value = list(value)
+        return restore_parameter(type(self), self.__name, self.valuestr, value)
+
+    def __deepcopy__(self, memo):
+        if interned_parameters.get((self.__name, self.valuestr)) is self:
+            return self
+        value = self.__value
+        if isinstance(value, (list, tuple)):
+            value = list(value)
+        elif not isinstance(value, (str, int, float)):
+            value = copy.deepcopy(value, memo)
+        return restore_parameter(type(self), self.__name, self.valuestr, value)
+
     def __eq__(self, o):
         if isinstance(o, Parameter):
-            return (self.name == o.name and self.value == o.value)
+            value = self.value
+            ovalue = o.value
+            # A shared parameter has a tuple in place of a list.
+            if isinstance(value, tuple):
+                value = list(value)
+            if isinstance(ovalue, tuple):
+                ovalue = list(ovalue)
+            return (self.name == o.name and value == ovalue)
         return NotImplemented
 
     def parse_value(self, value):
@@ -84,7 +117,7 @@ class Parameter():
         return value
 
     def raise_invalid_value(self, value):
-        raise ValueError('Invalid value `{0}` for parameter "{1.name}" [{1.line}, {1.column}].'.format(value, self))
+        raise ValueError('Invalid value `{0}` for parameter "{1}".'.format(value, self.name))
 
     @property
     def name(self):
@@ -96,6 +129,8 @@ class Parameter():
 
     @value.setter
     def value(self, value):
+        if interned_parameters.get((self.name, self.valuestr)) is self:
+            raise AttributeError('Interned parameter "{0}" is shared and may not be changed.'.format(self.name))
         def check_str(value):
             if '"' in value:
                 ValueError("Invalid DQUOTE (\") character in parameter value {0}.", value)
@@ -125,14 +160,15 @@ class Parameter():
 
 
 class AnyParam(Parameter):
+    __slots__ = ()
     param_abnf = '''any-param  = (iana-token / x-name) "=" param-value *("," param-value)'''
     param_name = ''
 
     def parse_value(self, value):
         if not iana_token_re.match(self.name):
-            raise ValueError("Invalid parameter name`{0.name}` ({0.line}, {0.column}).".format(self))
+            raise ValueError("Invalid parameter name`{0.name}`.".format(self))
         #elif not x_name_re.match(self.name):
-        #    raise ValueError("Invalid x-name parameter `{0.name}` ({0.line}, {0.column}).".format(self))
+        #    raise ValueError("Invalid x-name parameter `{0.name}`.".format(self))
         return value.strip('"').split(',')
 
 class LanguageParam(Parameter):
@@ -140,6 +176,7 @@ class LanguageParam(Parameter):
 
     c.f. `Language-Tag <http://tools.ietf.org/html/rfc5646#section-2>`_
     """
+    __slots__ = ()
     param_abnf = '''language-param = "LANGUAGE=" Language-Tag'''
     param_name = 'LANGUAGE'
 
@@ -159,6 +196,7 @@ class LanguageParam(Parameter):
 
 class ValueParam(Parameter):
     """`§ 5.2 <http://tools.ietf.org/html/rfc6350#section-5.2>`_"""
+    __slots__ = ()
     param_abnf = '''value-param = "VALUE=" value-type'''
     value_abnf = '''value-type = "text"
                                 / "uri"
@@ -188,6 +226,7 @@ class ValueParam(Parameter):
 
 class PrefParam(Parameter):
     """`§ 5.3 <http://tools.ietf.org/html/rfc6350#section-5.3>`_"""
+    __slots__ = ()
     param_abnf = '''pref-param = "PREF=" (1*2DIGIT / "100")
                 ; An integer between 1 and 100.'''
     param_name = 'PREF'
@@ -206,6 +245,7 @@ class PrefParam(Parameter):
 
 class AltidParam(Parameter):
     """`§ 5.4 <http://tools.ietf.org/html/rfc6350#section-5.4>`_"""
+    __slots__ = ()
     param_abnf = '''altid-param = "ALTID=" param-value'''
     param_name = 'ALTID'
 
@@ -215,6 +255,7 @@ class AltidParam(Parameter):
 
 class PidParam(Parameter):
     """`§ 5.5 <http://tools.ietf.org/html/rfc6350#section-5.5>`_"""
+    __slots__ = ()
     param_abnf = '''pid-param = "PID=" pid-value *("," pid-value)'''
     value_abnf = '''pid-value = 1*DIGIT ["." 1*DIGIT]'''
     param_name = 'PID'
@@ -235,6 +276,7 @@ class PidParam(Parameter):
 
 class TypeParam(Parameter):
     """`§ 5.6 <http://tools.ietf.org/html/rfc6350#section-5.6>`_"""
+    __slots__ = ()
     param_abnf = '''type-param = "TYPE=" type-value *("," type-value)'''
     value_abnf = '''type-value = "work"
                                 / "home"
@@ -267,6 +309,7 @@ class TypeParam(Parameter):
 
 class MediatypeParam(Parameter):
     """`§ 5.7 <http://tools.ietf.org/html/rfc6350#section-5.7>`_"""
+    __slots__ = ()
     param_abnf = '''mediatype-param = "MEDIATYPE=" mediatype'''
     value_abnf = '''mediatype = type-name "/" subtype-name *( ";" attribute "=" value )
                             ; "attribute" and "value" are from [RFC2045]
@@ -290,6 +333,7 @@ class MediatypeParam(Parameter):
 
 class CalscaleParam(Parameter):
     """`§ 5.8 <http://tools.ietf.org/html/rfc6350#section-5.8>`_"""
+    __slots__ = ()
     param_abnf = '''calscale-param = "CALSCALE=" calscale-value'''
     value_abnf = '''calscale-value = "gregorian" / iana-token / x-name'''
     param_name = 'CALSCALE'
@@ -302,6 +346,7 @@ class CalscaleParam(Parameter):
 
 class SortAsParam(Parameter):
     """`§ 5.9 <http://tools.ietf.org/html/rfc6350#section-5.9>`_"""
+    __slots__ = ()
     param_abnf = '''sort-as-param = "SORT-AS=" sort-as-value'''
     value_abnf = '''sort-as-value = param-value *("," param-value)'''
     param_name = 'SORT-AS'
@@ -312,6 +357,7 @@ class SortAsParam(Parameter):
 
 class GeoParam(Parameter):
     """`§ 5.10 <http://tools.ietf.org/html/rfc6350#section-5.10>`_"""
+    __slots__ = ()
     param_abnf = '''geo-parameter = "GEO=" DQUOTE URI DQUOTE'''
     param_name = 'GEO'
 
@@ -329,6 +375,7 @@ class GeoParam(Parameter):
 
 class TzParam(Parameter):
     """`§ 5.11 <http://tools.ietf.org/html/rfc6350#section-5.11>`_"""
+    __slots__ = ()
     param_abnf = '''tz-parameter = "TZ=" (param-value / DQUOTE URI DQUOTE)'''
     param_name = 'TZ'
 
@@ -339,12 +386,95 @@ class TzParam(Parameter):
 defined_params = dict([(c.param_name, c) for c in locals().values() if getattr(c, '__base__', None) == Parameter])
 
 
-def build_parameter(name, value, line=0, column=0):
-    c = defined_params.get(name.upper())
-    if c:
-        return c(c.param_name, value, line, column)
-    else:
-        return AnyParam(name, value, line, column)
+parameter_factories = {}
+
+factory_cache_size = 1024
+
+def register_parameter(cls):
+    """Register the `Parameter` subclass `cls` to be built for every
+    parameter named, in any case, by its `param_name`."""
+    name = cls.param_name.upper()
+    if not iana_token_re.match(name):
+        raise ValueError("Invalid parameter name `{0}`.".format(cls.param_name))
+    if name in defined_params:
+        raise KeyError("The parameter {0} is already registered.".format(name))
+    defined_params[name] = cls
+    parameter_factories.clear()
+
+def parameter_factory(name):
+    """Return the callable that builds a parameter from the value, line,
+    and column for the parameter `name` as it appears in a content line.
+    The callable is cached for each distinct `name`."""
+    factory = parameter_factories.get(name)
+    if factory is None:
+        c = defined_params.get(name.upper())
+        if c and c.param_name:
+            factory = functools.partial(c, c.param_name)
+        else:
+            factory = functools.partial(AnyParam, name)
+        if len(parameter_factories) >= factory_cache_size:
+            parameter_factories.clear()
+        parameter_factories[name] = factory
+    return factory
+
+interned_parameters = {}
+
+interned_parameters_size = 65536
+
+def intern_parameter(param):
+    """Return the shared parameter equal to `param`, which is `param`
+    itself the first time it is seen. Shared parameters may be used by
+    any number of properties, so their value must not be changed;
+    setting `value` raises `AttributeError`, and a list value is kept as
+    a tuple so that it cannot be modified. Once there are
+    `interned_parameters_size` shared parameters new parameters are no
+    longer shared."""
+    key = (param.name, param.valuestr)
+    ret = interned_parameters.get(key)
+    if ret is None:
+        if len(interned_parameters) >= interned_parameters_size:
+            return param
+        if isinstance(param.value, list):
+            param._Parameter__value = tuple(param.value)
+        interned_parameters[key] = ret = param
+    return ret
+
+def restore_parameter(cls, name, valuestr, value, interned=False):
+    """Return a parameter of class `cls` with the `name`, `valuestr`, and
+    already parsed `value` of a pickled or copied parameter. If it was
+    `interned` then the shared parameter is returned (see
+    `intern_parameter`)."""
+    if interned:
+        ret = interned_parameters.get((name, valuestr))
+        if ret is not None:
+            return ret
+    if isinstance(value, tuple):
+        value = list(value)
+    ret = cls.__new__(cls)
+    ret._Parameter__name = name
+    ret._Parameter__value = value
+    ret.valuestr = valuestr
+    if interned:
+        return intern_parameter(ret)
+    return ret
+
+def build_parameter(name, value, line=0, column=0, intern=False):
+    """Create the parameter object for the parameter `name` with the
+    string `value` found at `line` and `column`. If `intern` is true then
+    the shared parameter with the same name and value is returned (see
+    `intern_parameter`)."""
+    factory = parameter_factories.get(name)
+    if factory is None:
+        factory = parameter_factory(name)
+    if intern:
+        # The shared parameters are keyed by the name the factory gives
+        # the parameter, which is not the `name` in the content line if
+        # that is not in the canonical case.
+        ret = interned_parameters.get((factory.args[0], value))
+        if ret is not None:
+            return ret
+        return intern_parameter(factory(value, line, column))
+    return factory(value, line, column)
 
 
 
@@ -10,11 +10,17 @@ if sys.version_info < (3, 2):
 import logging
 import re
 import datetime
+import functools
+import copy
 
 from .parameter import *
+from .tokenizer import tokenize_contentline
+from .values import *
+from .values import decode_value
+from .blob import Blob, SpilledLine
 from pyietflib.iso8601 import parse_iso8601
 
-__all__ = ['property_from_contentline',
+__all__ = ['property_from_contentline', 'register_property',
     'ADR', 'ANNIVERSARY', 'BDAY', 'BEGIN', 'CALADRURI', 'CALURI',
     'CATEGORIES', 'CLIENTPIDMAP', 'EMAIL', 'END', 'FBURL', 'FN',
     'GENDER', 'GEO', 'IMPP', 'KEY', 'KIND', 'LANG', 'LOGO', 'MEMBER',
@@ -31,12 +37,78 @@ class URI():
 class Language():
     pass
 
-class Address():
-    pass
+def slot_names(cls):
+    """Return the names of all the slots in `cls` and its bases, with
+    private names mangled as they are for attribute access."""
+    ret = []
+    for c in cls.__mro__:
+        slots = c.__dict__.get('__slots__', ())
+        if isinstance(slots, str):
+            slots = (slots,)
+        for name in slots:
+            if name.startswith('__') and not name.endswith('__'):
+                name = '_{0}{1}'.format(c.__name__.lstrip('_'), name)
+            ret.append(name)
+    return ret
+
+class Unparsed():
+    """Marks a lazy property value that has not been parsed. There is a
+    single instance, `unparsed`, which is kept when pickled."""
+    def __reduce__(self):
+        return 'unparsed'
+
+unparsed = Unparsed()
+
+state_cache = {}
+
+def state_names(cls):
+    """Return the names of the private slots that the `Property`
+    subclass `cls` adds to `Property`, which are pickled and copied."""
+    ret = state_cache.get(cls)
+    if ret is None:
+        ret = tuple([k for k in slot_names(cls) if k.startswith('_') and not k.endswith('__')
+                and not k.startswith('_Property__')])
+        state_cache[cls] = ret
+    return ret
+
+parsed_cache = {}
+
+def parsed_names(cls):
+    """Return the set of names of the attributes that `parse_value` of the
+    `Property` subclass `cls` sets, which are given by its
+    `parsed_attributes` or otherwise are the public slots of `cls`."""
+    ret = parsed_cache.get(cls)
+    if ret is None:
+        ret = getattr(cls, 'parsed_attributes', None)
+        if ret is None:
+            ret = [k for k in slot_names(cls) if not k.startswith('_')]
+        ret = parsed_cache[cls] = frozenset(ret)
+    return ret
+
+def restore_property(cls, state, extra=()):
+    """Return a property of class `cls` with the value, group, parameters,
+    and raw parameters in `state`, and the slot values in `extra` in the
+    order of `state_names`, without parsing the value or the parameters
+    again."""
+    ret = cls.__new__(cls)
+    (ret._Property__value, ret._Property__group,
+            ret._Property__parameters, ret._Property__rawparams) = state
+    ret._Property__typed_value = unparsed
+    if extra:
+        for k, v in zip(state_names(cls), extra):
+            if v is not unparsed:
+                object.__setattr__(ret, k, v)
+    return ret
 
 class Property():
     """Defines a specific vCard property.
 
+    If `lazy` is true then `params` is a list of (name, value, line,
+    column) tuples, or (name, value, line, column, intern) tuples (see
+    `build_parameter`), and neither the parameters nor the value are parsed
+    until they are first used. Otherwise `params` is a list of parameter
+    objects and the value is parsed immediately.
+
     Properties
     ----------
     name
@@ -45,37 +117,102 @@ class Property():
     value
         The value string as it would appear in the vCard.
 
+    typed_value
+        The value parsed into a type appropriate for the property.
+
     group
         The group name string as it would appear in the vCard.
 
     parameters
         The list of parameters on this property.
+
+    In lazy mode the attributes that a subclass's `parse_value` sets are
+    made by parsing the value when one is first used. They are the public
+    names in the subclass's `__slots__`, or a subclass without slots may
+    list them in `parsed_attributes`.
     """
-    def __init__(self, value, group=None, params=None):
+    __slots__ = ('__value', '__group', '__parameters', '__rawparams', '__typed_value')
+
+    def __init__(self, value, group=None, params=None, lazy=False):
         self.__value = value
         self.__group = group
-        self.__parameters = params if not None else []
-        self.parse_value(value)
+        if lazy:
+            self.__parameters = None
+            self.__rawparams = params if params is not None else []
+            self.__typed_value = unparsed
+        else:
+            self.__parameters = params if params is not None else []
+            self.__rawparams = None
+            self.__typed_value = self.parse_value(value)
 
     def __str__(self):
         ret = []
         if self.group:
-            ret.append("{0.group}")
-        ret.append("{0.name}")
+            ret.append(self.group)
+            ret.append('.')
+        ret.append(self.name)
         for p in self.parameters:
             ret.append(str(p))
-        ret.append(":{0.value}")
-        ret.append("\r\n")
-        ret = ''.join(ret)
-        return ret.format(self)
+        ret.append(':')
+        ret.append(self.value)
+        ret.append('\r\n')
+        return ''.join(ret)
 
     def __repr__(self):
         return "property.{0.name}({0.value}, group={0.group}, params={0.parameters})".format(self)
 
+    def __getattr__(self, name):
+        # Only called when an attribute is not found; in lazy mode the
+        # attributes set by `parse_value` do not exist until it is run,
+        # but no other attribute is made by parsing the value.
+        if name not in parsed_names(type(self)) or self.__typed_value is not unparsed:
+            raise AttributeError("'{0}' object has no attribute '{1}'".format(type(self).__name__, name))
+        self.typed_value
+        return object.__getattribute__(self, name)
+
+    def __reduce__(self):
+        # Only the private slots and `__dict__` are pickled, and copied,
+        # the typed value and the attributes set by `parse_value` in
+        # slots are parsed again when they are first used, as in lazy
+        # mode.
+        return (restore_property, self.state(), getattr(self, '__dict__', None) or None)
+
+    def __copy__(self):
+        ret = restore_property(*self.state())
+        if hasattr(self, '__dict__'):
+            ret.__dict__.update(self.__dict__)
+        return ret
+
+    def __deepcopy__(self, memo):
+        ret = restore_property(*self.state())
+        memo[id(self)] = ret
+        if self.__parameters is not None:
+            ret.__parameters = [p.__deepcopy__(memo) for p in self.__parameters]
+        else:
+            ret.__rawparams = list(self.__rawparams)
+        if getattr(self, '__dict__', None):
+            ret.__dict__.update(copy.deepcopy(self.__dict__, memo))
+        return ret
+
+    def state(self):
+        """Return the arguments of `restore_property` for this property."""
+        cls = type(self)
+        state = (self.__value, self.__group, self.__parameters, self.__rawparams)
+        names = state_names(cls)
+        if names:
+            return (cls, state, tuple([getattr(self, k, unparsed) for k in names]))
+        return (cls, state)
+
+    def __setstate__(self, state):
+        for k, v in state.items():
+            setattr(self, k, v)
+
     def parse_value(self, value):
-        """Parse the value and set properties on this object. The
-        default will do nothing."""
-        pass
+        """Parse the value, set properties on this object, and return the
+        typed value. The default will return the value decoded by the
+        decoder registered for the property name (see
+        `register_value_decoder`), or the value string if there is none."""
+        return decode_value(self.name, value)
 
     @property
     def group(self):
@@ -87,53 +224,81 @@ class Property():
 
     @property
     def value(self):
-        return self.__value
+        value = self.__value
+        if value.__class__ is Blob:
+            return value.text()
+        return value
 
     @value.setter
     def value(self, value):
         value = value.replace('\n', '\\n')
         value = value.replace('\r', '\\r')
         self.__value = value
-        self.parse_value(value)
+        self.__typed_value = self.parse_value(value)
 
     @property
     def typed_value(self):
-        pass
+        if self.__typed_value is unparsed:
+            self.__typed_value = self.parse_value(self.__value)
+        return self.__typed_value
 
     @property
     def parameters(self):
+        if self.__parameters is None:
+            self.__parameters = [build_parameter(*p) for p in self.__rawparams]
+            self.__rawparams = None
         return self.__parameters
 
+    def parameter_names(self):
+        """Return a list of the upper case names of the parameters, which
+        does not parse the parameters in lazy mode."""
+        if self.__parameters is None:
+            return [p[0].upper() for p in self.__rawparams]
+        return [p.name.upper() for p in self.__parameters]
+
+    def raw_parameters(self):
+        """Return a list of (name, value) tuples of the parameter name and
+        value strings as they appear in the content line, which does not
+        parse the parameters in lazy mode."""
+        if self.__parameters is None:
+            return [(p[0], p[1]) for p in self.__rawparams]
+        return [(p.name, p.valuestr) for p in self.__parameters]
+
 ###
 ### §6.1 General Properties
 ###
 
 class BEGIN(Property):
     """`§ 6.1.1 <http://tools.ietf.org/html/rfc6350#section-6.1.1>`_"""
+    __slots__ = ()
     value_type = str
     cardinality = '1'
     parameters_allowed = ()
 
 class END(Property):
     """`§ 6.1.2 <http://tools.ietf.org/html/rfc6350#section-6.1.2>`_"""
+    __slots__ = ()
     value_type = str
     cardinality = '1'
     parameters_allowed = ()
 
 class SOURCE(Property):
     """`§ 6.1.3 <http://tools.ietf.org/html/rfc6350#section-6.1.3>`_"""
+    __slots__ = ()
     value_type = URI
     cardinality = '*'
     parameters_allowed = ('pid', 'pref', 'altid', 'mediatype', 'any')
 
 class KIND(Property):
     """`§ 6.1.4 <http://tools.ietf.org/html/rfc6350#section-6.1.4>`_"""
+    __slots__ = ()
     value_type = str
     cardinality = '*1'
     parameters_allowed = ('any',)
 
 class XML(Property):
     """`§ 6.1.5 <http://tools.ietf.org/html/rfc6350#section-6.1.5>`_"""
+    __slots__ = ()
     value_type = str
     cardinality = '*'
     parameters_allowed = ('altid',)
@@ -144,6 +309,7 @@ class XML(Property):
 
 class FN(Property):
     """`§ 6.2.1 <http://tools.ietf.org/html/rfc6350#section-6.2.1>`_"""
+    __slots__ = ()
     value_type = str
     cardinality = '1*'
     parameters_allowed = ('type', 'language', 'altid', 'pid', 'pref', 'any')
@@ -163,53 +329,59 @@ class N(Property):
     in the vCard object when the name of the object the vCard represents
     follows the X.520 model.
     """
-    value_type = str
-    cardinality = '1*'
+    __slots__ = ()
+    value_type = Name
+    cardinality = '*1'
     parameters_allowed = ('sort-as', 'language', 'altid', 'any')
 
 class NICKNAME(Property):
     """`§ 6.2.3 <http://tools.ietf.org/html/rfc6350#section-6.2.3>`_"""
-    value_type = str
+    __slots__ = ()
+    value_type = tuple
     cardinality = '*'
     parameters_allowed = ('type', 'language', 'altid', 'pid', 'pref', 'any')
 
 class PHOTO(Property):
     """`§ 6.2.4 <http://tools.ietf.org/html/rfc6350#section-6.2.4>`_"""
+    __slots__ = ()
     value_type = URI
     cardinality = '*'
     parameters_allowed = ('altid', 'type', 'mediatype', 'pref', 'pid', 'any')
 
 class BDAY(Property):
     """`§ 6.2.5 <http://tools.ietf.org/html/rfc6350#section-6.2.5>`_"""
+    __slots__ = ('date',)
     value_type = datetime.datetime
     cardinality = '*1'
     parameters_allowed = ('altid', 'calscale', 'any')
 
     def parse_value(self, value):
         self.date = parse_iso8601(value)[0]
+        return self.date
 
 class ANNIVERSARY(Property):
     """`§ 6.2.6 <http://tools.ietf.org/html/rfc6350#section-6.2.6>`_"""
+    __slots__ = ('date',)
     value_type = datetime.datetime
     cardinality = '*1'
     parameters_allowed = ('altid', 'calscale', 'any')
 
     def parse_value(self, value):
         self.date = parse_iso8601(value)[0]
+        return self.date
 
 class GENDER(Property):
     """`§ 6.2.7 <http://tools.ietf.org/html/rfc6350#section-6.2.7>`_"""
-    value_type = str
-    value_re = re.compile(r'(?ax)^(?P<code>[MFONU]?)(;(?P<identity>.+))?$', flags=re.ASCII|re.VERBOSE)
-    cardinality = '1'
+    __slots__ = ('code', 'identity')
+    value_type = Gender
+    cardinality = '*1'
     parameters_allowed = ('any',)
 
     def parse_value(self, value):
-        mo = self.value_re.match(value)
-        if not mo:
-            raise ValueError("Invalid GENDER value `{0}`.".format(value))
-        self.code = mo.group("code")
-        self.identity = mo.group("identity")
+        ret = decode_value(self.name, value)
+        self.code = ret.sex
+        self.identity = ret.identity
+        return ret
 
 
 ###
@@ -218,6 +390,7 @@ class GENDER(Property):
 
 class ADR(Property):
     """`§ 6.3.1 <http://tools.ietf.org/html/rfc6350#section-6.3.1>`_"""
+    __slots__ = ()
     value_type = Address
     cardinality = '*'
     parameters_allowed = ('label', 'language', 'geo', 'tz', 'altid', 'pid', 'pref', 'type', 'any')
@@ -228,18 +401,21 @@ class ADR(Property):
 
 class TEL(Property):
     """`§ 6.4.1 <http://tools.ietf.org/html/rfc6350#section-6.4.1>`_"""
+    __slots__ = ()
     value_type = URI
     cardinality = '*'
     parameters_allowed = ('type', 'pid', 'pref', 'altid', 'any')
 
 class EMAIL(Property):
     """`§ 6.4.2 <http://tools.ietf.org/html/rfc6350#section-6.4.2>`_"""
+    __slots__ = ()
     value_type = URI
     cardinality = '*'
     parameters_allowed = ('pid', 'pref', 'type', 'altid', 'any')
 
 class IMPP(Property):
     """`§ 6.4.3 <http://tools.ietf.org/html/rfc6350#section-6.4.3>`_"""
+    __slots__ = ()
     value_type = URI
     cardinality = '*'
     parameters_allowed = ('pid', 'pref', 'type', 'mediatype', 'altid', 'any')
@@ -250,18 +426,21 @@ class IMPP(Property):
 
 class LANG(Property):
     """`§ 6.5.1 <http://tools.ietf.org/html/rfc6350#section-6.5.1>`_"""
+    __slots__ = ()
     value_type = Language
     cardinality = '*'
     parameters_allowed = ('pid', 'pref', 'altid', 'type', 'any')
 
 class TZ(Property):
     """`§ 6.5.2 <http://tools.ietf.org/html/rfc6350#section-6.5.2>`_"""
+    __slots__ = ()
     value_type = str
     cardinality = '*'
     parameters_allowed = ('altid', 'pid', 'pref', 'type', 'mediatype', 'any')
 
 class GEO(Property):
     """`§ 6.5.3 <http://tools.ietf.org/html/rfc6350#section-6.5.3>`_"""
+    __slots__ = ()
     value_type = URI
     cardinality = '*'
     parameters_allowed = ('pid', 'pref', 'type', 'mediatype', 'altid', 'any')
@@ -272,18 +451,21 @@ class GEO(Property):
 
 class TITLE(Property):
     """`§ 6.6.1 <http://tools.ietf.org/html/rfc6350#section-6.6.1>`_"""
+    __slots__ = ()
     value_type = str
     cardinality = '*'
     parameters_allowed = ('language', 'pid', 'pref', 'altid', 'type', 'any')
 
 class ROLE(Property):
     """`§ 6.6.2 <http://tools.ietf.org/html/rfc6350#section-6.6.2>`_"""
+    __slots__ = ()
     value_type = str
     cardinality = '*'
     parameters_allowed = ('language', 'pid', 'pref', 'altid', 'type', 'any')
 
 class LOGO(Property):
     """`§ 6.6.3 <http://tools.ietf.org/html/rfc6350#section-6.6.3>`_"""
+    __slots__ = ()
     value_type = URI
     cardinality = '*'
     parameters_allowed = ('language', 'pid', 'pref', 'altid', 'type', 'mediatype', 'any')
@@ -295,12 +477,14 @@ class ORG(Property):
     A single structured text value consisting of components separated by
     the SEMICOLON character (U+003B).
     """
-    value_type = str
+    __slots__ = ()
+    value_type = Organization
     cardinality = '*'
     parameters_allowed = ('sort-as', 'language', 'pid', 'pref', 'altid', 'type', 'any')
 
 class MEMBER(Property):
     """`§ 6.6.5 <http://tools.ietf.org/html/rfc6350#section-6.6.5>`_"""
+    __slots__ = ()
     value_type = URI
     cardinality = '*'
     parameters_allowed = ('pid', 'pref', 'altid', 'mediatype', 'any')
@@ -308,6 +492,7 @@ class MEMBER(Property):
 
 class RELATED(Property):
     """`§ 6.6.6 <http://tools.ietf.org/html/rfc6350#section-6.6.6>`_"""
+    __slots__ = ()
     value_type = (URI, str)
     values_allowed = (
             "contact", "acquaintance", "friend", "met", "co-worker",
@@ -331,31 +516,36 @@ class CATEGORIES(Property):
 
     One or more text values separated by a COMMA character (U+002C).
     """
-    value_type = list
+    __slots__ = ()
+    value_type = tuple
     cardinality = '*'
     parameters_allowed = ('pid', 'pref', 'type', 'altid', 'any')
 
 
 class NOTE(Property):
     """`§ 6.7.2 <http://tools.ietf.org/html/rfc6350#section-6.7.2>`_"""
+    __slots__ = ()
     value_type = str
     cardinality = '*'
     parameters_allowed = ('language', 'pid', 'pref', 'type', 'altid', 'any')
 
 class PRODID(Property):
     """`§ 6.7.3 <http://tools.ietf.org/html/rfc6350#section-6.7.3>`_"""
+    __slots__ = ()
     value_type = str
     cardinality = '*1'
     parameters_allowed = ('any',)
 
 class REV(Property):
     """`§ 6.7.4 <http://tools.ietf.org/html/rfc6350#section-6.7.4>`_"""
+    __slots__ = ()
     value_type = datetime.datetime
     cardinality = '*1'
     parameters_allowed = ('any',)
 
 class SOUND(Property):
     """`§ 6.7.5 <http://tools.ietf.org/html/rfc6350#section-6.7.5>`_"""
+    __slots__ = ()
     value_type = URI
     cardinality = '*'
     parameters_allowed = ('language', 'pid', 'pref', 'type', 'mediatype', 'altid', 'any')
@@ -363,6 +553,7 @@ class SOUND(Property):
 class UID(Property):
     """`§ 6.7.6 <http://tools.ietf.org/html/rfc6350#section-6.7.6>`_
     """
+    __slots__ = ()
     value_type = URI
     cardinality = '*1'
     parameters_allowed = ('any',)
@@ -376,16 +567,18 @@ class CLIENTPIDMAP(Property):
     defined in [RFC4122] is particularly well suited to this task,
     but other URI schemes MAY be used.
     """
+    __slots__ = ()
     value_type = str
     value_match = re.compile(r'\d+;.+')
     cardinality = '*'
-    parameters_allowed = ('any')
+    parameters_allowed = ('any',)
 
 class URL(Property):
     """`§ 6.7.8 <http://tools.ietf.org/html/rfc6350#section-6.7.8>`_"""
-    value_type = str
-    cardinality = '1'
-    parameters_allowed = ()
+    __slots__ = ()
+    value_type = URI
+    cardinality = '*'
+    parameters_allowed = ('pid', 'pref', 'type', 'mediatype', 'altid', 'any')
 
 ###
 ### §6.8 Security Properties
@@ -393,9 +586,10 @@ class URL(Property):
 
 class KEY(Property):
     """`§ 6.8.1 <http://tools.ietf.org/html/rfc6350#section-6.8.1>`_"""
-    value_type = str
-    cardinality = '1'
-    parameters_allowed = ()
+    __slots__ = ()
+    value_type = URI
+    cardinality = '*'
+    parameters_allowed = ('altid', 'pid', 'pref', 'type', 'mediatype', 'any')
 
 ###
 ### §6.9 Calendar Properties
@@ -403,21 +597,24 @@ class KEY(Property):
 
 class FBURL(Property):
     """`§ 6.9.1 <http://tools.ietf.org/html/rfc6350#section-6.9.1>`_"""
-    value_type = str
-    cardinality = '1'
-    parameters_allowed = ()
+    __slots__ = ()
+    value_type = URI
+    cardinality = '*'
+    parameters_allowed = ('pid', 'pref', 'type', 'mediatype', 'altid', 'any')
 
 class CALADRURI(Property):
     """`§ 6.9.2 <http://tools.ietf.org/html/rfc6350#section-6.9.2>`_"""
-    value_type = str
-    cardinality = '1'
-    parameters_allowed = ()
+    __slots__ = ()
+    value_type = URI
+    cardinality = '*'
+    parameters_allowed = ('pid', 'pref', 'type', 'mediatype', 'altid', 'any')
 
 class CALURI(Property):
     """`§ 6.9.3 <http://tools.ietf.org/html/rfc6350#section-6.9.3>`_"""
-    value_type = str
-    cardinality = '1'
-    parameters_allowed = ()
+    __slots__ = ()
+    value_type = URI
+    cardinality = '*'
+    parameters_allowed = ('pid', 'pref', 'type', 'mediatype', 'altid', 'any')
 
 ###
 ### §6.10 Extended Properties
@@ -428,6 +625,7 @@ class ExtendedProperty(Property):
 
     vCard extended property.
     """
+    __slots__ = ('__name',)
 
     VALID_NAME = re.compile(r'[xX]-[-a-zA-Z0-9]+', flags=re.ASCII|re.VERBOSE)
 
@@ -454,6 +652,7 @@ class IANAProperty(Property):
 
     vCard IANA registered property.
     """
+    __slots__ = ('__name',)
 
     VALID_NAME = re.compile(r'[-a-zA-Z0-9]+', flags=re.ASCII|re.VERBOSE)
 
@@ -477,19 +676,18 @@ class IANAProperty(Property):
 
 defined_properties = dict([(c.__name__, c) for c in locals().values() if getattr(c, '__base__', None) == Property])
 
-contentline_re = re.compile(r"""^
-    ((?P<group>[-a-zA-Z0-9]+)\.)?
-    (?P<name>[-a-zA-Z0-9]+)
-    (?P<params>(;[-a-zA-Z0-9]+=(([^";:]*)|("[^"]*"))*)*)
-    (:(?P<value>.+))
-    \r\n$""", flags=re.VERBOSE)
-
-params_re = re.compile(r"""
-    ;(?P<pname>[-a-zA-Z0-9]+)
-    =(?P<pvalue>(([^";:]+)|("[^"]+")))
-""", flags=re.VERBOSE)
-
-def property_from_contentline(value, line=0):
+def contentline_name(line):
+    """Return the upper case property name of an unfolded content `line`
+    without parsing the rest of the line."""
+    end = line.find(':')
+    if end < 0:
+        end = len(line)
+    semi = line.find(';', 0, end)
+    if semi >= 0:
+        end = semi
+    return line[line.find('.', 0, end) + 1:end].upper()
+
+def property_from_contentline(value, line=0, lazy=False, intern=False):
     """This will parse a single vCard contentline and produce a property.
 
     The line `value` must have been unfolded prior to this call according
@@ -497,6 +695,13 @@ def property_from_contentline(value, line=0):
 
     If `value` is a `byte` object then it will be decoded from UTF-8 into
     a `str`.
+
+    If `lazy` is true then the property value and parameters will not be
+    parsed until they are first used (see `Property`).
+
+    If `intern` is true then parameters with the same name and value, and
+    equal group names, are shared between properties (see
+    `intern_parameter`).
     """
     if isinstance(value, bytes) or isinstance(value, bytearray):
         value = value.decode('UTF-8')
@@ -504,32 +709,69 @@ def property_from_contentline(value, line=0):
         raise TypeError('Invalid type `{0}` for content-line[{1}]: "{2:.30s}...".'.format(type(value), line, value))
 
     # Parse the content-line
-    mo = contentline_re.match(value)
-    if not mo:
-        raise ValueError('Unable to parse content-line[{0}]: "{1:.30s}...".'.format(line, value))
-
-    group = mo.group('group')
-    name = mo.group('name')
-    value = mo.group('value')
+    blob = value.blob if value.__class__ is SpilledLine else None
+    group, name, pspans, vspan = tokenize_contentline(value, line)
+    if group:
+        group = value[group[0]:group[1]]
+        if intern:
+            group = sys.intern(group)
+    name = value[name[0]:name[1]]
 
     # Build the parameter list
     params = []
-    params_start = mo.start('params')
-    pmo = params_re.match(mo.group('params'))
-    while pmo:
-        pname = pmo.group('pname')
-        pvalue = pmo.group('pvalue')
-        start = params_start + pmo.start() + 1
-        params.append(build_parameter(pname, pvalue, line=line, column=start))
-        pmo = params_re.match(mo.group('params'), pmo.end())
-
-    # Build the property
+    for nstart, nend, vstart, vend in pspans:
+        if lazy and intern:
+            params.append((sys.intern(value[nstart:nend]), sys.intern(value[vstart:vend]), line, nstart, True))
+        elif lazy:
+            params.append((value[nstart:nend], value[vstart:vend], line, nstart))
+        else:
+            params.append(build_parameter(value[nstart:nend], value[vstart:vend], line=line, column=nstart, intern=intern))
+    value = value[vspan[0]:vspan[1]] if blob is None else blob
+
+    return build_property(name, value, group=group, params=params, lazy=lazy)
+
+property_factories = {}
+
+factory_cache_size = 1024
+
+def register_property(cls, name=None):
+    """Register the `Property` subclass `cls` to be built for every
+    property `name`, in any case, which defaults to the class name. The
+    class is constructed as `Property` and its `name` must be the
+    property name (e.g. for an extended property `X-ABC`)."""
+    name = (name or cls.__name__).upper()
+    if not IANAProperty.VALID_NAME.fullmatch(name):
+        raise ValueError("Invalid property name `{0}`.".format(name))
     if name in defined_properties:
-        return defined_properties[name](value, group=group, params=params)
-    elif name.lower().startswith('x-'):
-        return ExtendedProperty(name, value, group=group, params=params)
-    else:
-        return IANAProperty(name, value, group=group, params=params)
+        raise KeyError("The property {0} is already registered.".format(name))
+    defined_properties[name] = cls
+    property_factories.clear()
+
+def property_factory(name):
+    """Return the callable that builds a property from the value, group,
+    params, and lazy arguments for the property `name` as it appears in a
+    content line. The callable is cached for each distinct `name`."""
+    factory = property_factories.get(name)
+    if factory is None:
+        folded = name.upper()
+        if folded in defined_properties:
+            factory = defined_properties[folded]
+        elif folded.startswith('X-'):
+            factory = functools.partial(ExtendedProperty, name)
+        else:
+            factory = functools.partial(IANAProperty, name)
+        if len(property_factories) >= factory_cache_size:
+            property_factories.clear()
+        property_factories[name] = factory
+    return factory
+
+def build_property(name, value, group=None, params=None, lazy=False):
+    """Create the property object for the property `name` (see `Property`
+    for the other arguments)."""
+    factory = property_factories.get(name)
+    if factory is None:
+        factory = property_factory(name)
+    return factory(value, group=group, params=params, lazy=lazy)
 
 
 
@@ -0,0 +1,129 @@
+#!/usr/bin/env python
+# -*- coding: UTF-8 -*-
+"""Random access to the vCards in a memory mapped `vCard
+<http://tools.ietf.org/html/rfc6350>`_ file."""
+__copyright__ = """Copyright 2011 Lance Finn Helsten (helsten@acm.org)"""
+from .__meta__ import (__version__, __author__, __license__)
+
+import sys
+if sys.version_info < (3, 2):
+    raise Exception("rfc6350 requires Python 3.2 or higher.")
+import logging
+import re
+import mmap
+import array
+
+from .vcard import *
+from .vcard import unfold_buffer
+
+__all__ = ['vcard_offsets', 'vCardReader']
+__log__ = logging.getLogger('rfc6350')
+
+
+begin_re = re.compile(rb'^BEGIN:VCARD\r\n', flags=re.MULTILINE)
+
+end_marker = b'\nEND:VCARD\r\n'
+
+def vcard_offsets(buffer, pos=0, endpos=None):
+    """Generate a tuple of the start and end byte offsets of every vCard
+    in `buffer` between `pos` and `endpos`. The start is the offset of
+    the BEGIN content-line and the end is the offset just past the END
+    content-line."""
+    if endpos is None:
+        endpos = len(buffer)
+    mo = begin_re.search(buffer, pos, endpos)
+    while mo:
+        start = mo.start()
+        end = buffer.find(end_marker, start, endpos)
+        if end < 0:
+            raise ValueError('Invalid vCard stream END contentline not found before EOF for vCard at byte {0}.'.format(start))
+        end = end + len(end_marker)
+        yield (start, end)
+        mo = begin_re.search(buffer, end, endpos)
+
+
+class vCardReader():
+    """Memory maps a vCard file and indexes the byte offsets of every
+    vCard in that file, so that any vCard may be parsed on demand without
+    parsing the vCards before it.
+
+    The reader is a sequence of `vCard` objects, and should be closed
+    when it is no longer needed. See `parse_vcard` for `lazy`,
+    `properties`, and `intern`.
+
+    Properties
+    ----------
+    path
+        The path to the vCard file.
+
+    starts
+        An array of the byte offset of each vCard BEGIN content-line.
+
+    ends
+        An array of the byte offset just past each vCard END content-line.
+    """
+    def __init__(self, path, lazy=False, properties=None, intern=False):
+        self.path = path
+        self.lazy = lazy
+        self.intern = intern
+        self.properties = properties
+        self.file = open(path, 'rb')
+        try:
+            self.buffer = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            # An empty file cannot be mapped.
+            self.buffer = b''
+        self.starts = array.array('Q')
+        self.ends = array.array('Q')
+        try:
+            for start, end in vcard_offsets(self.buffer):
+                self.starts.append(start)
+                self.ends.append(end)
+        except ValueError:
+            self.close()
+            raise
+
+    def __len__(self):
+        return len(self.starts)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index = index + len(self)
+        if not 0 <= index < len(self):
+            raise IndexError('vCard index {0} out of range.'.format(index))
+        return self.parse(self.starts[index], self.ends[index])
+
+    def __iter__(self):
+        for start, end in zip(self.starts, self.ends):
+            yield self.parse(start, end)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def parse(self, start, end):
+        """Parse and return the vCard between the `start` and `end` byte
+        offsets in the file."""
+        parser = vCardParser(lazy=self.lazy, properties=self.properties, intern=self.intern)
+        vcard = None
+        try:
+            for line, linenum, offset in unfold_buffer(self.buffer, start, end):
+                vcard = parser.contentline(line, linenum)
+            parser.close()
+        except ValueError as err:
+            raise ValueError('Invalid vCard at byte {0} of {1}: {2}'.format(start, self.path, err))
+        return vcard
+
+    def raw(self, index):
+        """Return the unparsed bytes of the vCard at `index`."""
+        return bytes(self.buffer[self.starts[index]:self.ends[index]])
+
+    def close(self):
+        """Release the memory map and close the file."""
+        if isinstance(self.buffer, mmap.mmap):
+            self.buffer.close()
+        self.file.close()
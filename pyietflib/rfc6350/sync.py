@@ -0,0 +1,187 @@
+#!/usr/bin/env python
+# -*- coding: UTF-8 -*-
+"""Find the `vCard <http://tools.ietf.org/html/rfc6350>`_ objects that
+changed in a vCard file since it was last synchronised, with an index of
+the UID, REV, and content hash of every vCard."""
+__copyright__ = """Copyright 2011 Lance Finn Helsten (helsten@acm.org)"""
+from .__meta__ import (__version__, __author__, __license__)
+
+import sys
+if sys.version_info < (3, 3):
+    raise Exception("rfc6350.sync requires Python 3.3 or higher.")
+import logging
+import os
+import re
+import struct
+import hashlib
+import tempfile
+import collections
+
+from .vcard import *
+from .vcard import contentline_end_re, contentline_head_re, fold_re
+from .reader import vCardReader
+
+__all__ = ['vCardSyncIndex', 'IndexEntry', 'Change']
+__log__ = logging.getLogger('rfc6350')
+
+
+IndexEntry = collections.namedtuple('IndexEntry', 'rev digest offset size')
+IndexEntry.__doc__ = """The indexed state of a vCard: the REV value string
+or None, the content hash, and the byte offset and size of the vCard in
+the file."""
+
+Change = collections.namedtuple('Change', 'kind key vcard')
+Change.__doc__ = """A vCard that changed since the last synchronisation:
+`kind` is 'added', 'changed', or 'removed', `key` is the index key (see
+`vCardSyncIndex`), and `vcard` is the parsed vCard, or None if it was
+removed."""
+
+magic = b'VCARDS\x02\x00'
+
+header = struct.Struct('<QQI')
+record = struct.Struct('<QI16sII')
+
+# The UID or REV content line of a vCard, with an optional group.
+uid_rev_re = re.compile(rb'^(?:[-A-Za-z0-9]+\.)?(UID|REV)[;:]', flags=re.MULTILINE|re.IGNORECASE)
+
+def uid_and_rev(buffer, start, end):
+    """Return the UID and REV value strings, or None, of the vCard between
+    `start` and `end` in `buffer` without parsing the vCard."""
+    ret = {}
+    for mo in uid_rev_re.finditer(buffer, start, end):
+        name = mo.group(1).upper().decode('ascii')
+        if name in ret:
+            continue
+        line_end = contentline_end_re.search(buffer, mo.start(), end)
+        if line_end is None:
+            continue
+        line = fold_re.sub(b'', buffer[mo.start():line_end.start()])
+        head = contentline_head_re.match(line)
+        if head is not None:
+            ret[name] = line[head.end():].decode('UTF-8').strip()
+    return (ret.get('UID'), ret.get('REV'))
+
+def content_digest(data):
+    return hashlib.sha1(data).digest()[:16]
+
+
+class vCardSyncIndex():
+    """An index, kept in the file `path`, of every vCard in a vCard file
+    that finds the vCards that were added, changed, or removed since the
+    index was last saved, and parses only those.
+
+    The index is a dict of each vCard's key to its `IndexEntry`. The key
+    is the UID value, or the content hash `bytes` for a vCard without a
+    UID. If several vCards have the same UID the last one is indexed.
+
+    A vCard is unchanged if its REV and content hash are those in the
+    index; the vCards are found and hashed without parsing them (see
+    `vCardReader`). The index file also has the modification time and
+    size of the vCard file, and if they are unchanged the vCard file is
+    not read at all.
+
+    Properties
+    ----------
+    entries
+        The dict of keys to `IndexEntry`.
+    """
+    def __init__(self, path):
+        self.path = path
+        self.entries = {}
+        self.mtime = 0
+        self.size = 0
+        if os.path.exists(path):
+            self.load()
+
+    def __len__(self):
+        return len(self.entries)
+
+    def load(self):
+        """Read the index file."""
+        entries = {}
+        with open(self.path, 'rb') as stream:
+            data = stream.read()
+        if data[:len(magic)] != magic:
+            raise ValueError('Invalid vCard sync index {0}.'.format(self.path))
+        try:
+            pos = len(magic)
+            mtime, size, count = header.unpack_from(data, pos)
+            pos = pos + header.size
+            for i in range(count):
+                offset, length, digest, uidsize, revsize = record.unpack_from(data, pos)
+                pos = pos + record.size
+                uid = data[pos:pos + uidsize].decode('UTF-8') if uidsize else digest
+                pos = pos + uidsize
+                rev = data[pos:pos + revsize - 1].decode('UTF-8') if revsize else None
+                pos = pos + max(revsize - 1, 0)
+                entries[uid] = IndexEntry(rev, digest, offset, length)
+        except (struct.error, UnicodeDecodeError) as err:
+            raise ValueError('Invalid vCard sync index {0}: {1}.'.format(self.path, err))
+        self.entries = entries
+        self.mtime = mtime
+        self.size = size
+
+    def save(self):
+        """Write the index file, replacing it only when it is complete."""
+        directory = os.path.dirname(os.path.abspath(self.path))
+        fd, tmp_path = tempfile.mkstemp(suffix='.tmp', dir=directory)
+        try:
+            with os.fdopen(fd, 'wb') as stream:
+                stream.write(magic)
+                stream.write(header.pack(self.mtime, self.size, len(self.entries)))
+                for key, entry in self.entries.items():
+                    uid = key.encode('UTF-8') if isinstance(key, str) else b''
+                    # The REV size is one more than its length so that 0
+                    # is no REV.
+                    rev = entry.rev.encode('UTF-8') if entry.rev is not None else None
+                    stream.write(record.pack(entry.offset, entry.size, entry.digest,
+                            len(uid), len(rev) + 1 if rev is not None else 0))
+                    stream.write(uid)
+                    if rev:
+                        stream.write(rev)
+            os.replace(tmp_path, self.path)
+        finally:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+
+    def changes(self, collection, lazy=False):
+        """Generate a `Change` for every vCard in the vCard file
+        `collection` that was added, changed, or removed since the index
+        was saved, and then save the index. The index is saved only if
+        every change is generated. See `parse_vcard` for `lazy`."""
+        st = os.stat(collection)
+        if st.st_mtime_ns == self.mtime and st.st_size == self.size:
+            return
+        entries = {}
+        with vCardReader(collection, lazy=lazy) as reader:
+            buffer = reader.buffer
+            for start, end in zip(reader.starts, reader.ends):
+                uid, rev = uid_and_rev(buffer, start, end)
+                digest = content_digest(buffer[start:end])
+                key = uid if uid else digest
+                entry = IndexEntry(rev, digest, start, end - start)
+                old = self.entries.get(key)
+                if old is None or key in entries:
+                    kind = 'added' if old is None else 'changed'
+                elif old.rev != rev or old.digest != digest:
+                    kind = 'changed'
+                else:
+                    kind = None
+                entries[key] = entry
+                if kind is not None:
+                    yield Change(kind, key, reader.parse(start, end))
+        for key in self.entries:
+            if key not in entries:
+                yield Change('removed', key, None)
+        self.entries = entries
+        self.mtime = st.st_mtime_ns
+        self.size = st.st_size
+        self.save()
+
+    def vcard(self, collection, key, lazy=False):
+        """Return the vCard with `key` parsed from the vCard file
+        `collection` at the offset in the index."""
+        entry = self.entries[key]
+        with open(collection, 'rb') as stream:
+            stream.seek(entry.offset)
+            return parse_vcard(stream.read(entry.size), lazy=lazy)
@@ -0,0 +1,67 @@
+#!/usr/bin/env python
+# -*- coding: UTF-8 -*-
+"""Single pass tokenizer for `vCard content-lines
+<http://tools.ietf.org/html/rfc6350#section-3.3>`_."""
+__copyright__ = """Copyright 2011 Lance Finn Helsten (helsten@acm.org)"""
+from .__meta__ import (__version__, __author__, __license__)
+
+import sys
+if sys.version_info < (3, 2):
+    raise Exception("rfc6350 requires Python 3.2 or higher.")
+import logging
+import re
+
+__all__ = ['tokenize_contentline']
+__log__ = logging.getLogger('rfc6350')
+
+
+head_re = re.compile(r'(?:([-a-zA-Z0-9]+)\.)?([-a-zA-Z0-9]+)')
+
+param_re = re.compile(r';([-a-zA-Z0-9]+)=([^";:]*(?:"[^"]*"[^";:]*)*)')
+
+def tokenize_contentline(line, linenum=0):
+    """Scan an unfolded content `line` that ends in CRLF, as defined by
+    `RFC 6350 § 3.3 <http://tools.ietf.org/html/rfc6350#section-3.3>`_,
+    and return a tuple of the spans of its tokens: (group, name, params,
+    value). The `group` is a (start, end) tuple or None, `name` and
+    `value` are (start, end) tuples, and `params` is a list of (name start,
+    name end, value start, value end) tuples.
+
+    The line is scanned once from left to right and no substrings are
+    created, so the caller only slices the tokens it needs. A
+    `ValueError` is raised, with the column, if the line is malformed.
+    """
+    end = len(line) - 2
+    if not line.endswith('\r\n'):
+        raise_invalid_contentline(line, linenum, len(line), 'CRLF')
+
+    # [group "."] name
+    mo = head_re.match(line, 0, end)
+    if not mo:
+        raise_invalid_contentline(line, linenum, 0, 'name')
+    group = mo.span(1) if mo.start(1) >= 0 else None
+    name = mo.span(2)
+    pos = mo.end()
+
+    # *(";" param)
+    params = []
+    mo = param_re.match(line, pos, end)
+    while mo:
+        params.append(mo.span(1) + mo.span(2))
+        pos = mo.end()
+        mo = param_re.match(line, pos, end)
+
+    # ":" value CRLF
+    if line[pos] == ';':
+        raise_invalid_contentline(line, linenum, pos + 1, 'parameter')
+    if line[pos] != ':':
+        raise_invalid_contentline(line, linenum, pos, '":"')
+    pos = pos + 1
+    if pos == end or line.find('\n', pos, end) >= 0:
+        raise_invalid_contentline(line, linenum, pos, 'value')
+    return (group, name, params, (pos, end))
+
+
+def raise_invalid_contentline(line, linenum, column, expected):
+    raise ValueError('Unable to parse content-line[{0}] column {1} expected {2}: "{3:.30s}...".'.format(
+            linenum, column, expected, line))
@@ -0,0 +1,169 @@
+#!/usr/bin/env python
+# -*- coding: UTF-8 -*-
+"""Validate the properties of `vCard <http://tools.ietf.org/html/rfc6350>`_
+objects while they are parsed."""
+__copyright__ = """Copyright 2011 Lance Finn Helsten (helsten@acm.org)"""
+from .__meta__ import (__version__, __author__, __license__)
+
+import sys
+if sys.version_info < (3, 2):
+    raise Exception("rfc6350 requires Python 3.2 or higher.")
+import logging
+import collections
+
+from .property import defined_properties
+from .parameter import defined_params
+from .blob import SpilledLine
+from .grammar import valid_contentline, valid_value
+
+__all__ = ['vCardValidator', 'Diagnostic']
+__log__ = logging.getLogger('rfc6350')
+
+
+Diagnostic = collections.namedtuple('Diagnostic', 'card line name code message')
+Diagnostic.__doc__ = """A problem found by `vCardValidator`: the index of
+the vCard in the stream, the line number of the content line (0 for a
+problem with the whole vCard), the property name, a short `code`
+('parameter', 'cardinality', 'required', or 'grammar'), and a
+message."""
+
+# Every property may have a VALUE parameter (`RFC 6350 § 5.2
+# <http://tools.ietf.org/html/rfc6350#section-5.2>`_).
+always_allowed = ('VALUE',)
+
+class PropertyRule():
+    """The precomputed checks for a `Property` subclass."""
+    __slots__ = ('allowed', 'any', 'single', 'required')
+
+    def __init__(self, cls, param_bits):
+        allowed = cls.parameters_allowed
+        if isinstance(allowed, dict):
+            allowed = set().union(*allowed.values())
+        elif isinstance(allowed, str):
+            allowed = (allowed,)
+        self.any = 'any' in allowed
+        self.allowed = 0
+        for name in tuple(allowed) + always_allowed:
+            self.allowed = self.allowed | param_bits.get(name.upper(), 0)
+        self.single = cls.cardinality in ('1', '*1')
+        self.required = cls.cardinality in ('1', '1*')
+
+
+class vCardValidator():
+    """Checks each property as it is parsed, and each vCard when it is
+    complete, against `RFC 6350 <http://tools.ietf.org/html/rfc6350>`_,
+    and collects a `Diagnostic` for every problem instead of raising.
+
+    The checks use each property class's `parameters_allowed`, as a
+    bitset of the defined parameters, and `cardinality`, with a counter
+    per property name in the current vCard. Properties with the same
+    ALTID count once. Parameters of lazy properties are checked by name
+    without being parsed.
+
+    If `grammar` is true then each content line is also matched against
+    the `RFC 6350 ABNF <http://tools.ietf.org/html/rfc6350#section-3.3>`_,
+    and the value of a property with a VALUE parameter against the rule
+    for that value type (see `valid_contentline` and `valid_value`).
+
+    Give the validator to `vcard_generator` or `vCardParser` to validate
+    while parsing.
+
+    Properties
+    ----------
+    diagnostics
+        The list of `Diagnostic` found.
+    """
+    def __init__(self, grammar=False):
+        self.grammar = grammar
+        self.diagnostics = []
+        self.param_bits = dict([(name, 1 << i)
+                for i, name in enumerate(sorted(n for n in defined_params if n))])
+        self.rules = {}
+        self.required = [name for name, cls in sorted(defined_properties.items())
+                if getattr(cls, 'cardinality', None) in ('1', '1*') and name not in ('BEGIN', 'END')]
+        self.card = 0
+        self.counts = {}
+        self.repeated = []
+
+    def __len__(self):
+        return len(self.diagnostics)
+
+    def rule(self, cls):
+        ret = self.rules.get(cls)
+        if ret is None:
+            if hasattr(cls, 'cardinality') and hasattr(cls, 'parameters_allowed'):
+                ret = PropertyRule(cls, self.param_bits)
+            else:
+                ret = False
+            self.rules[cls] = ret
+        return ret
+
+    def begin(self, card):
+        """Start checking the vCard at index `card` in the stream."""
+        self.card = card
+        self.counts = {}
+        self.repeated = []
+
+    def property(self, prop, linenum=0, line=None):
+        """Check a single property, found at `linenum`, of the current
+        vCard. The grammar is checked only if the unfolded content `line`
+        of the property is given."""
+        if self.grammar and line is not None:
+            self.check_grammar(prop, linenum, line)
+        rule = self.rule(type(prop))
+        if not rule:
+            return
+        bits = self.param_bits
+        for name in prop.parameter_names():
+            bit = bits.get(name)
+            if bit is None:
+                ok = rule.any
+            else:
+                ok = rule.allowed & bit
+            if not ok:
+                self.diagnostics.append(Diagnostic(self.card, linenum, prop.name, 'parameter',
+                        'Parameter {0} is not allowed on {1}.'.format(name, prop.name)))
+        if rule.single:
+            count = self.counts.get(prop.name, 0) + 1
+            self.counts[prop.name] = count
+            if count == 2:
+                self.repeated.append((prop.name, linenum))
+        elif rule.required:
+            self.counts[prop.name] = self.counts.get(prop.name, 0) + 1
+
+    def check_grammar(self, prop, linenum, line):
+        if not valid_contentline(line):
+            self.diagnostics.append(Diagnostic(self.card, linenum, prop.name, 'grammar',
+                    'Content line for {0} does not match the RFC 6350 grammar.'.format(prop.name)))
+        elif 'VALUE' in prop.parameter_names() and line.__class__ is not SpilledLine:
+            for param in prop.parameters:
+                if param.name.upper() == 'VALUE' and not valid_value(prop.value, param.valuestr):
+                    self.diagnostics.append(Diagnostic(self.card, linenum, prop.name, 'grammar',
+                            'Value of {0} is not a valid {1}.'.format(prop.name, param.valuestr)))
+
+    def end(self, vcard, complete=True):
+        """Finish checking the current `vcard`. If it is not `complete`,
+        because properties were skipped while parsing, then missing
+        properties are not reported."""
+        if complete:
+            for name in self.required:
+                if name not in self.counts:
+                    self.diagnostics.append(Diagnostic(self.card, 0, name, 'required',
+                            'Property {0} is required.'.format(name)))
+            if 'MEMBER' in vcard:
+                if not [p for p in vcard.get('KIND', []) if p.value.lower() == 'group']:
+                    self.diagnostics.append(Diagnostic(self.card, 0, 'MEMBER', 'required',
+                            'Property MEMBER requires KIND:group.'))
+        for name, linenum in self.repeated:
+            altids = set()
+            count = 0
+            for prop in vcard[name]:
+                altid = [p.value for p in prop.parameters if p.name == 'ALTID']
+                if not altid:
+                    count = count + 1
+                elif altid[0] not in altids:
+                    altids.add(altid[0])
+                    count = count + 1
+            if count > 1:
+                self.diagnostics.append(Diagnostic(self.card, linenum, name, 'cardinality',
+                        'Property {0} may occur only once.'.format(name)))
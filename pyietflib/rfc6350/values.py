@@ -0,0 +1,133 @@
+#!/usr/bin/env python
+# -*- coding: UTF-8 -*-
+"""Decoders for the `vCard property values
+<http://tools.ietf.org/html/rfc6350#section-4>`_ that are text, lists of
+text, or structured into components."""
+__copyright__ = """Copyright 2011 Lance Finn Helsten (helsten@acm.org)"""
+from .__meta__ import (__version__, __author__, __license__)
+
+import sys
+if sys.version_info < (3, 2):
+    raise Exception("rfc6350 requires Python 3.2 or higher.")
+import logging
+import re
+import collections
+
+__all__ = ['decode_text', 'decode_list', 'split_value', 'decode_value',
+    'register_value_decoder', 'Name', 'Address', 'Organization', 'Gender']
+__log__ = logging.getLogger('rfc6350')
+
+
+Name = collections.namedtuple('Name', 'family given additional prefixes suffixes')
+Name.__doc__ = """`§ 6.2.2 <http://tools.ietf.org/html/rfc6350#section-6.2.2>`_
+N value, each component is a tuple of text values."""
+
+Address = collections.namedtuple('Address', 'pobox extended street locality region code country')
+Address.__doc__ = """`§ 6.3.1 <http://tools.ietf.org/html/rfc6350#section-6.3.1>`_
+ADR value, each component is a tuple of text values."""
+
+Organization = collections.namedtuple('Organization', 'name units')
+Organization.__doc__ = """`§ 6.6.4 <http://tools.ietf.org/html/rfc6350#section-6.6.4>`_
+ORG value, the organization name text and a tuple of unit names."""
+
+Gender = collections.namedtuple('Gender', 'sex identity')
+Gender.__doc__ = """`§ 6.2.7 <http://tools.ietf.org/html/rfc6350#section-6.2.7>`_
+GENDER value, the sex code and the gender identity text or None."""
+
+# `§ 3.4 <http://tools.ietf.org/html/rfc6350#section-3.4>`_ escapes.
+escapes = {'\\\\': '\\', '\\,': ',', '\\;': ';', '\\n': '\n', '\\N': '\n'}
+
+escape_re = re.compile(r'\\.', flags=re.DOTALL)
+
+token_re = re.compile(r'\\.|[;,]|[^\\;,]+', flags=re.DOTALL)
+
+def decode_text(value):
+    """Return the text `value` with its escapes decoded."""
+    if '\\' not in value:
+        return value
+    return escape_re.sub(lambda mo: escapes.get(mo.group(), mo.group()[1]), value)
+
+def decode_list(value):
+    """Return a tuple of the decoded texts in the comma separated
+    `value`."""
+    if '\\' not in value:
+        return tuple(value.split(','))
+    return tuple([c[0] if c else '' for c in split_value(value, ',')])
+
+def split_value(value, separators=';,'):
+    """Split a compound `value` in a single pass and return a list of its
+    components. Each component is split on the first of `separators`,
+    and is a tuple of the decoded texts split on the second separator,
+    if any; an empty component is an empty tuple. Escaped separators do
+    not split the value."""
+    major = separators[0]
+    minor = separators[1] if len(separators) > 1 else None
+    if '\\' not in value:
+        if minor is None:
+            return [(c,) if c else () for c in value.split(major)]
+        return [tuple(c.split(minor)) if c else () for c in value.split(major)]
+
+    ret = []
+    component = []
+    text = []
+    for token in token_re.findall(value):
+        if token == major:
+            component.append(''.join(text))
+            ret.append(tuple(component) if component != [''] else ())
+            component = []
+            text = []
+        elif token == minor:
+            component.append(''.join(text))
+            text = []
+        elif token[0] == '\\':
+            text.append(escapes.get(token, token[1:]))
+        else:
+            text.append(token)
+    component.append(''.join(text))
+    ret.append(tuple(component) if component != [''] else ())
+    return ret
+
+def decode_structured(value, cls):
+    """Return the `cls` named tuple of the components of `value`, which
+    may have fewer components than `cls` but not more."""
+    components = split_value(value)
+    size = len(cls._fields)
+    if len(components) > size:
+        raise ValueError('Invalid {0} value with {1} components, expected {2}: "{3:.30s}...".'.format(
+                cls.__name__, len(components), size, value))
+    if len(components) < size:
+        components.extend([()] * (size - len(components)))
+    return cls._make(components)
+
+def decode_organization(value):
+    components = split_value(value, ';')
+    return Organization(components[0][0] if components[0] else '',
+            tuple([c[0] if c else '' for c in components[1:]]))
+
+def decode_gender(value):
+    sex, sep, identity = value.partition(';')
+    if len(sex) > 1 or sex not in 'MFONU':
+        raise ValueError("Invalid GENDER value `{0}`.".format(value))
+    return Gender(sex, decode_text(identity) if identity else None)
+
+value_decoders = {
+    'N': lambda value: decode_structured(value, Name),
+    'ADR': lambda value: decode_structured(value, Address),
+    'ORG': decode_organization,
+    'CATEGORIES': decode_list,
+    'NICKNAME': decode_list,
+    'GENDER': decode_gender,
+}
+
+def register_value_decoder(name, decoder):
+    """Register the callable `decoder` that will be given the value string
+    of every property `name`, in any case, and return its typed value."""
+    value_decoders[name.upper()] = decoder
+
+def decode_value(name, value):
+    """Return the typed value of the value string `value` of the property
+    `name`, or `value` if there is no decoder for the property."""
+    decoder = value_decoders.get(name.upper())
+    if decoder is None:
+        return value
+    return decoder(value)
@@ -10,93 +10,503 @@ if sys.version_info < (3, 2):
     raise Exception("rfc6350 requires Python 3.2 or higher.")
 import logging
 import re
-import string
+import mmap
+import collections
+import copy
+import tempfile
 
 from .property import *
+from .property import contentline_name
+from .writer import vcard_to_bytes
+from .blob import *
+from .blob import BlobWriter, SpilledLine
 from .parameter import *
-import pyietflib.iso8601
 
-__all__ = ['parse_vcard', 'vCard']
+__all__ = ['parse_vcard', 'vcard_generator', 'vCardParser', 'vCard',
+    'ContentLineUnfolder', 'vCardFeedParser', 'ParseReport', 'ParseError']
 __log__ = logging.getLogger('rfc6350')
 
 
 
-def parse_vcard(stream):
+def parse_vcard(stream, lazy=False, properties=None, intern=False, spill_size=None):
     """Given a binary `stream` that is UTF-8 encoded and RFC 6350
-    folded parse and return a single vCard from that stream."""
-    state = 'start'
-    vcard = None
-    contentline_parser = None
-    for line, linenum in contentline_generator(stream):
-        if state == 'content':
-            if re.match('^END:VCARD\r\n$', line):
-                state = 'end'
-                contentline_parser = None
-                vcard.validate()
-                return vcard
+    folded parse and return a single vCard from that stream.
+
+    If `lazy` is true then property values and parameters are parsed
+    when they are first used (see `Property`). If `properties` is given
+    then only the properties with those names are parsed (see
+    `vCardParser`). If `intern` is true then equal parameters are shared
+    between properties and vCards (see `intern_parameter`). If
+    `spill_size` is given then large binary values of a stream that is
+    read in chunks are kept in temporary files (see
+    `ContentLineUnfolder`)."""
+    for vcard in vcard_generator(stream, lazy=lazy, properties=properties, intern=intern,
+            spill_size=spill_size):
+        return vcard
+    raise ValueError('Invalid vCard stream END contentline not found before EOF.')
+
+
+def vcard_generator(stream, lazy=False, properties=None, report=None, intern=False,
+        validator=None, spill_size=None):
+    """Given a binary `stream` that is UTF-8 encoded and RFC 6350
+    folded generate each vCard in that stream. Only the vCard currently
+    being parsed is held in memory. See `parse_vcard` for `lazy`,
+    `properties`, `intern`, and `spill_size`.
+
+    If `report` is a `ParseReport` then an invalid vCard does not stop
+    the generator: the error is added to `report`, the content lines up
+    to the next BEGIN:VCARD are skipped, and parsing continues with that
+    vCard.
+
+    If `validator` is a `vCardValidator` then every vCard is validated as
+    it is parsed (see `vCardParser`)."""
+    parser = vCardParser(lazy=lazy, properties=properties, intern=intern, validator=validator)
+    skipping = False
+    for line, linenum, offset in unfold_stream(stream, strict=report is None, spill_size=spill_size):
+        if skipping:
+            if line != 'BEGIN:VCARD\r\n':
+                report.skipped = report.skipped + 1
+                continue
+            skipping = False
+        try:
+            if isinstance(line, ValueError):
+                raise line
+            vcard = parser.contentline(line, linenum)
+        except ValueError as err:
+            if report is None:
+                raise
+            report.append(ParseError(parser.card_index(), linenum, offset, err))
+            parser.reset()
+            if line == 'BEGIN:VCARD\r\n':
+                # The vCard was not ended, and this line begins the next.
+                parser.contentline(line, linenum)
             else:
-                assert contentline_parser
-                prop = contentline_parser(line, linenum)
-                if prop.name not in vcard:
-                    vcard[prop.name] = []
-                vcard[prop.name].append(prop)
-
-        elif state == 'start':
-            if not re.match('^BEGIN:VCARD\r\n$', line):
-                raise ValueError('Invalid vCard BEGIN content-line[{0}]: "{1:.30s}...".'.format(linenum, line))
-            state = 'version'
+                skipping = True
             continue
+        if vcard is not None:
+            if report is not None:
+                report.vcards = report.vcards + 1
+            yield vcard
+    try:
+        parser.close()
+    except ValueError as err:
+        if report is None:
+            raise
+        report.append(ParseError(parser.card_index(), linenum, offset, err))
+
+
+
+ParseError = collections.namedtuple('ParseError', 'card line offset error')
+ParseError.__doc__ = """An invalid vCard found while parsing with a
+`ParseReport`: the index of the vCard in the stream, the line number and
+byte offset of the content line where the error was found, and the
+`ValueError`."""
+
+class ParseReport(list):
+    """The list of `ParseError` for each invalid vCard found while
+    parsing a stream (see `vcard_generator`).
+
+    Properties
+    ----------
+    vcards
+        The number of valid vCards.
+
+    skipped
+        The number of content lines skipped after the errors.
+    """
+    def __init__(self):
+        self.vcards = 0
+        self.skipped = 0
+
+
 
-        elif state == 'version':
+class vCardParser():
+    """Builds `vCard` objects from unfolded content lines as they are
+    given to `contentline`. The parser moves through the states 'start',
+    'version', 'content', and 'end' for each vCard, and returns to 'start'
+    so that any number of vCards may be parsed in sequence. What is built
+    from the content lines of each vCard is given by `begin_vcard`,
+    `add_contentline`, and `end_vcard`, which may be overridden.
+
+    If `lazy` is true then property values and parameters are parsed
+    when they are first used (see `Property`).
+
+    If `properties` is an iterable of property names then any content
+    line for a property not in `properties` is skipped by its name alone,
+    before the content line is parsed. A vCard that contains none of the
+    `properties` will be empty.
+
+    If `intern` is true then equal parameters are shared between
+    properties and vCards (see `intern_parameter`).
+
+    If `validator` is a `vCardValidator` then it is given each property
+    and vCard as they are parsed, and it collects the problems found.
+    """
+    def __init__(self, lazy=False, properties=None, intern=False, validator=None):
+        self.lazy = lazy
+        self.intern = intern
+        self.validator = validator
+        if properties is not None:
+            properties = frozenset([p.upper() for p in properties])
+        self.properties = properties
+        self.skipped = 0
+        self.count = 0
+        self.state = 'start'
+        self.vcard = None
+        self.contentline_parser = None
+
+    def contentline(self, line, linenum):
+        """Process a single unfolded content `line` and return the vCard
+        when its END content line is reached, otherwise `None`."""
+        if self.state == 'content':
+            if line == 'END:VCARD\r\n':
+                self.state = 'end'
+                self.contentline_parser = None
+                return self.end_vcard()
+            elif line == 'BEGIN:VCARD\r\n':
+                raise ValueError('Invalid vCard missing END:VCARD before BEGIN content-line[{0}].'.format(linenum))
+            elif self.properties is not None and contentline_name(line) not in self.properties:
+                self.skipped = self.skipped + 1
+            else:
+                assert self.contentline_parser
+                self.add_contentline(line, linenum)
+
+        elif self.state in ('start', 'end'):
+            if line != 'BEGIN:VCARD\r\n':
+                raise ValueError('Invalid vCard BEGIN content-line[{0}]: "{1:.30s}...".'.format(linenum, line))
+            self.count = self.count + 1
+            self.state = 'version'
+
+        elif self.state == 'version':
             mo = re.match(r'^VERSION:(?P<version>.+)\r\n$', line)
             if not mo:
                 raise ValueError('Invalid vCard VERSION content-line[{0}]: "{1:.30s}...".'.format(linenum, line))
-            state = 'content'
             version = mo.group('version')
             if version == '4.0':
-                vcard = vCard()
-                contentline_parser = property_from_contentline
+                self.skipped = 0
+                self.contentline_parser = property_from_contentline
+                self.begin_vcard(version)
             else:
                 raise ValueError('Invalid or unknown vCard version {0} on line {1}: "{2:.30s}...".'.format(version, linenum, line))
-    raise ValueError('Invalid vCard stream END contentline not found before EOF.')
+            self.state = 'content'
+        return None
+
+    def begin_vcard(self, version):
+        """Start a new vCard after its VERSION content line."""
+        self.vcard = vCard()
+        if self.validator is not None:
+            self.validator.begin(self.card_index())
+
+    def add_contentline(self, line, linenum):
+        """Add the property of the content `line` to the vCard."""
+        prop = self.contentline_parser(line, linenum, lazy=self.lazy, intern=self.intern)
+        if prop.name not in self.vcard:
+            self.vcard[prop.name] = []
+        self.vcard[prop.name].append(prop)
+        if self.validator is not None:
+            self.validator.property(prop, linenum, line)
+
+    def end_vcard(self):
+        """Finish the vCard at its END content line and return it."""
+        vcard = self.vcard
+        self.vcard = None
+        if not self.skipped:
+            vcard.validate()
+        if self.validator is not None:
+            self.validator.end(vcard, complete=not self.skipped)
+        return vcard
+
+    def close(self):
+        """Signal the end of the content lines, this will raise
+        `ValueError` if a vCard has been started but not ended."""
+        if self.state not in ('start', 'end'):
+            raise ValueError('Invalid vCard stream END contentline not found before EOF.')
 
+    def reset(self):
+        """Discard the vCard being parsed, the next content line must be
+        a BEGIN content line."""
+        self.state = 'start'
+        self.vcard = None
+        self.contentline_parser = None
 
+    def card_index(self):
+        """Return the index of the vCard being parsed, counting every
+        BEGIN content line; between vCards this is the index of the next
+        vCard."""
+        if self.state in ('start', 'end'):
+            return self.count
+        return self.count - 1
 
-def contentline_generator(stream):
-    """Generate unfolded and decoded content lines from the stream."""
-    linenum = 0
+
+
+class vCardFeedParser():
+    """Incremental parser that is given a binary stream in arbitrary
+    chunks with `feed`, which may split content lines and UTF-8
+    sequences anywhere. Only the unfinished content line and the vCard
+    being parsed are kept in memory.
+
+    Each completed vCard is given to `callback`, or if there is no
+    callback it is queued until it is taken with `read_vcards`. See
+    `parse_vcard` for `lazy`, `properties`, `intern`, and `spill_size`.
+    """
+    def __init__(self, callback=None, lazy=False, properties=None, intern=False, spill_size=None):
+        self.callback = callback
+        self.vcards = collections.deque()
+        self.unfolder = ContentLineUnfolder(spill_size=spill_size)
+        self.parser = vCardParser(lazy=lazy, properties=properties, intern=intern)
+
+    def feed(self, data):
+        """Parse the next chunk of `data` and return the number of vCards
+        that it completed."""
+        return self.contentlines(self.unfolder.feed(data))
+
+    def close(self):
+        """Signal the end of the stream and return the number of vCards
+        completed. This will raise `ValueError` if the stream ends in the
+        middle of a content line or a vCard."""
+        count = self.contentlines(self.unfolder.close())
+        self.parser.close()
+        return count
+
+    def read_vcards(self):
+        """Generate, and remove, each queued vCard."""
+        while self.vcards:
+            yield self.vcards.popleft()
+
+    def contentlines(self, lines):
+        count = 0
+        for line, linenum, offset in lines:
+            vcard = self.parser.contentline(line, linenum)
+            if vcard is not None:
+                count = count + 1
+                if self.callback is not None:
+                    self.callback(vcard)
+                else:
+                    self.vcards.append(vcard)
+        return count
+
+
+
+contentline_end_re = re.compile(rb'\r\n(?![ \t])')
+
+fold_re = re.compile(rb'\r\n[ \t]')
+
+# The content line up to the colon before the value.
+contentline_head_re = re.compile(rb'(?:[^":]|"[^"]*")*:')
+
+def contentline_generator(stream, chunksize=65536):
+    """Generate unfolded and decoded content lines from the stream.
+
+    The `stream` may be a binary file-like object, which will be read
+    `chunksize` bytes at a time, an object that supports the buffer
+    protocol (e.g. `bytes`, `memoryview`, or `mmap`), or an iterable of
+    `bytes` chunks. Each item is a tuple of the content line and the line
+    number that it started on.
+    """
+    for line, linenum, offset in unfold_stream(stream, chunksize):
+        yield (line, linenum)
+
+
+def unfold_stream(stream, chunksize=65536, strict=True, spill_size=None):
+    """Generate a tuple of unfolded content line, line number, and byte
+    offset for every content line in `stream` (see `contentline_generator`
+    for the types of streams allowed).
+
+    If `strict` is false then an invalid content line does not raise
+    `ValueError`, instead the error is generated in place of the line.
+    If `spill_size` is given then large values are kept in temporary
+    files (see `ContentLineUnfolder`); this does not apply to a `stream`
+    that supports the buffer protocol, which is already in memory."""
+    if isinstance(stream, (bytes, bytearray, memoryview, mmap.mmap)):
+        for item in unfold_buffer(stream, strict=strict):
+            yield item
+        return
+
+    unfolder = ContentLineUnfolder(strict, spill_size)
+    if hasattr(stream, 'read'):
+        chunk = stream.read(chunksize)
+        while chunk:
+            for item in unfolder.feed(chunk):
+                yield item
+            chunk = stream.read(chunksize)
+    else:
+        for chunk in stream:
+            for item in unfolder.feed(chunk):
+                yield item
+    for item in unfolder.close():
+        yield item
+
+
+def unfold_buffer(buffer, pos=0, endpos=None, linenum=1, strict=True):
+    """Generate a tuple of unfolded content line, line number, and byte
+    offset for every content line in `buffer` between `pos` and `endpos`.
+    The content lines are found in bulk without copying the buffer, so
+    `buffer` may be a `memoryview` or `mmap` of an entire file. See
+    `unfold_stream` for `strict`."""
+    if endpos is None:
+        endpos = len(buffer)
+    start = pos
+    for mo in contentline_end_re.finditer(buffer, pos, endpos):
+        end = mo.end()
+        line, count = decode_contentline(buffer[start:end], linenum, strict)
+        if line is not None:
+            yield (line, linenum, start)
+        linenum = linenum + count
+        start = end
+    if start < endpos:
+        err = ValueError('Invalid line ending on line {0}: {1!r:.30}...'.format(linenum, bytes(buffer[start:start + 30])))
+        if strict:
+            raise err
+        yield (err, linenum, start)
+
+
+def decode_contentline(raw, linenum, strict=True):
+    """Unfold and decode a single `raw` content line that ends in CRLF,
+    returning the decoded line and the number of physical lines that it
+    spans. The line will be `None` if it is a blank line. If `strict` is
+    false then the `ValueError` is returned in place of an invalid
+    line."""
+    if isinstance(raw, memoryview):
+        raw = raw.tobytes()
+    if not strict:
+        try:
+            return decode_contentline(raw, linenum)
+        except ValueError as err:
+            return (err, raw.count(b'\r\n'))
+    if len(raw) == 2:
+        return (None, 1)
+    count = 1
+    if raw.find(b'\r\n', 0, -2) >= 0:
+        raw, folds = fold_re.subn(b'', raw)
+        count = count + folds
+    if raw.find(b'\r', 0, -2) >= 0 or raw.find(b'\n', 0, -2) >= 0:
+        raise ValueError('Invalid line ending on line {0}: {1!r:.30}...'.format(linenum, raw))
+    if raw[0] in b' \t':
+        raise ValueError('Invalid line folding on line {0}: {1!r:.30}...'.format(linenum, raw))
     try:
-        unfold = None
-        unfoldline = 0
-        for line in stream:
-            linenum = linenum + 1
-            if line[-2:] != b'\r\n':
-                raise ValueError('Invalid line ending on line {0}: "{1:.30s}...".'.format(linenum, line))
-            line = line[:-2]
-            if not line[:-2]:
-                continue
+        return (raw.decode('UTF-8'), count)
+    except UnicodeDecodeError as err:
+        raise ValueError('Invalid UTF-8 encoded stream on line {0}: {1!r:.30}...'.format(linenum, raw))
+
+
+
+class ContentLineUnfolder():
+    """Unfold content lines from a binary stream that arrives in arbitrary
+    chunks. Only the unfinished content line at the end of the data given
+    to `feed` is kept in memory. See `unfold_stream` for `strict`.
+
+    If `spill_size` is given then the value of a PHOTO, LOGO, SOUND, or
+    KEY content line (see `spill_properties`) longer than
+    `spill_size` bytes is written to a temporary file, that is shared by
+    all the values spilled by this unfolder, as it arrives, and the
+    content line is a `SpilledLine`, with '...' in place of the
+    value, that has the value as a `Blob`.
+    """
+    def __init__(self, strict=True, spill_size=None):
+        self.strict = strict
+        self.spill_size = spill_size
+        self.buffer = bytearray()
+        self.linenum = 1
+        self.offset = 0
+        self.searchpos = 0
+        self.spill = None
+        self.spill_file = None
+
+    def feed(self, data):
+        """Add `data` to the unfolder and return a list of tuples of
+        unfolded content line, line number, and byte offset for every
+        content line completed by `data`."""
+        self.buffer.extend(data)
+        return self.unfold(False)
 
-            if line[0] in b' \t':
-                if not unfold:
-                    raise ValueError('Invalid line folding on line {0}: "{1:.30s}...".'.format(linenum, line))
-                while line[0] in b' \t':
-                    line = line[1:]
-                unfold.extend(line)
-            elif not unfold:
-                unfold = bytearray(line)
-                unfoldline = linenum
+    def close(self):
+        """Return the list of remaining content lines, this will raise
+        `ValueError` if the final line does not end in CRLF."""
+        return self.unfold(True)
+
+    def unfold(self, final):
+        buffer = self.buffer
+        size = len(buffer)
+        lines = []
+        start = 0
+        for mo in contentline_end_re.finditer(buffer, self.searchpos):
+            end = mo.end()
+            if end == size and not final:
+                break
+            if self.spill is None and self.spill_size is not None and end - start > self.spill_size:
+                start = self.start_spill(buffer, start)
+            if self.spill is not None:
+                lines.append(self.end_spill(buffer[start:end - 2]))
             else:
-                unfold.extend(b'\r\n')
-                yield (unfold.decode("UTF-8"), unfoldline)
-                unfold = bytearray(line)
-                unfoldline = linenum
-        else:
-            if unfold:
-                unfold.extend(b'\r\n')
-                yield (unfold.decode("UTF-8"), unfoldline)
-    except UnicodeDecodeError as err:
-        print(line)
-        raise ValueError('Invalid UTF-8 encoded stream on line {0}: "{1:.30s}...".'.format(linenum, line))
+                line, count = decode_contentline(buffer[start:end], self.linenum, self.strict)
+                if line is not None:
+                    lines.append((line, self.linenum, self.offset + start))
+                self.linenum = self.linenum + count
+            start = end
+        if final and start < size:
+            err = ValueError('Invalid line ending on line {0}: {1!r:.30}...'.format(self.linenum, bytes(buffer[start:start + 30])))
+            if self.strict:
+                raise err
+            lines.append((err, self.linenum, self.offset + start))
+            self.spill = None
+            start = size
+        if self.spill is None and self.spill_size is not None and size - start > self.spill_size:
+            start = self.start_spill(buffer, start)
+        if self.spill is not None and size - start > 2:
+            # The last two bytes may be the CRLF that ends the line.
+            self.feed_spill(buffer[start:size - 2])
+            start = size - 2
+        del buffer[:start]
+        self.offset = self.offset + start
+        self.searchpos = max(len(buffer) - 2, 0)
+        return lines
+
+    def start_spill(self, buffer, start):
+        """Start spilling the value of the content line at `start` in
+        `buffer` if it is for one of the `spill_properties`, and
+        return the offset of the value."""
+        mo = contentline_head_re.match(buffer, start)
+        if mo is None:
+            return start
+        head, folds = fold_re.subn(b'', buffer[start:mo.end()])
+        try:
+            head = head.decode('UTF-8')
+        except UnicodeDecodeError:
+            return start
+        if contentline_name(head) not in spill_properties:
+            return start
+        if self.spill_file is None:
+            self.spill_file = tempfile.TemporaryFile()
+        self.spill = (SpilledLine(head + '...\r\n'), BlobWriter(self.spill_file), self.linenum,
+                self.offset + start, folds)
+        self.spill_error = None
+        return mo.end()
+
+    def feed_spill(self, data):
+        if self.spill_error is None:
+            try:
+                self.spill[1].feed(data)
+            except ValueError as err:
+                self.spill_error = err
+
+    def end_spill(self, data):
+        """Return the content line item for the spilled content line that
+        ends with `data`."""
+        self.feed_spill(data)
+        line, writer, linenum, offset, folds = self.spill
+        self.spill = None
+        if self.spill_error is None:
+            try:
+                line.blob = writer.close()
+            except ValueError as err:
+                self.spill_error = err
+        self.linenum = self.linenum + 1 + folds + writer.folds
+        if self.spill_error is not None:
+            err = ValueError('Invalid value on line {0}: {1}'.format(linenum, self.spill_error))
+            if self.strict:
+                raise err
+            return (err, linenum, offset)
+        return (line, linenum, offset)
 
 
 
@@ -109,11 +519,34 @@ class vCard(dict):
         self.version = version
 
     def __str__(self):
-        raise NotImplementedError()
+        return vcard_to_bytes(self).decode('UTF-8')
+
+    def __bytes__(self):
+        return vcard_to_bytes(self)
 
     def __repr__(self):
         return 'parse_vcard(r"""{0}""")'.format(str(self))
 
+    def __reduce__(self):
+        # The version is given to the constructor and the properties are
+        # set as dict items; other attributes are kept as the state.
+        state = dict([(k, v) for k, v in self.__dict__.items() if k != 'version'])
+        return (type(self), (self.version,), state or None, None, iter(self.items()))
+
+    def __copy__(self):
+        ret = type(self)(self.version)
+        ret.__dict__.update(self.__dict__)
+        dict.update(ret, self)
+        return ret
+
+    def __deepcopy__(self, memo):
+        ret = type(self)(self.version)
+        memo[id(self)] = ret
+        ret.__dict__.update(copy.deepcopy(self.__dict__, memo))
+        for name, props in self.items():
+            ret[name] = [copy.deepcopy(p, memo) for p in props]
+        return ret
+
     def validate(self):
         """Check that the vCard is valid IAW RFC 6350."""
         if len(self) == 0:
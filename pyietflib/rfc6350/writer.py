@@ -0,0 +1,92 @@
+#!/usr/bin/env python
+# -*- coding: UTF-8 -*-
+"""Write `vCard <http://tools.ietf.org/html/rfc6350>`_ objects to a
+binary stream as UTF-8 encoded and folded content lines."""
+__copyright__ = """Copyright 2011 Lance Finn Helsten (helsten@acm.org)"""
+from .__meta__ import (__version__, __author__, __license__)
+
+import sys
+if sys.version_info < (3, 2):
+    raise Exception("rfc6350 requires Python 3.2 or higher.")
+import logging
+
+__all__ = ['fold_contentline', 'vcard_to_bytes', 'write_vcards', 'vCardWriter']
+__log__ = logging.getLogger('rfc6350')
+
+
+def fold_contentline(line, maxline=75):
+    """Encode a single content `line`, that ends in CRLF, into UTF-8 and
+    fold it so that no line is longer than `maxline` octets excluding the
+    CRLF, as recommended by `RFC 6350 § 3.2
+    <http://tools.ietf.org/html/rfc6350#section-3.2>`_. A line is never
+    folded in the middle of a multi-octet UTF-8 sequence."""
+    data = line.encode('UTF-8')
+    end = len(data) - 2
+    if end <= maxline:
+        return data
+    parts = []
+    start = 0
+    limit = maxline
+    while end - start > limit:
+        cut = start + limit
+        while (data[cut] & 0xC0) == 0x80:
+            cut = cut - 1
+        parts.append(data[start:cut])
+        start = cut
+        # Folded lines start with a space that counts toward the limit.
+        limit = maxline - 1
+    parts.append(data[start:])
+    return b'\r\n '.join(parts)
+
+
+def vcard_to_bytes(vcard):
+    """Return the UTF-8 encoded and folded representation of `vcard`."""
+    ret = [b'BEGIN:VCARD\r\n', fold_contentline('VERSION:{0}\r\n'.format(vcard.version))]
+    for props in vcard.values():
+        for prop in props:
+            ret.append(fold_contentline(str(prop)))
+    ret.append(b'END:VCARD\r\n')
+    return b''.join(ret)
+
+
+def write_vcards(vcards, stream, buffersize=65536):
+    """Write every vCard in the iterable `vcards` to the binary `stream`
+    and return the number of vCards written."""
+    writer = vCardWriter(stream, buffersize)
+    count = 0
+    for vcard in vcards:
+        writer.write(vcard)
+        count = count + 1
+    writer.flush()
+    return count
+
+
+class vCardWriter():
+    """Writes vCards to a binary `stream`. The encoded vCards are
+    collected until there are at least `buffersize` bytes, then they are
+    written to `stream` in a single call. The writer must be flushed, or
+    used as a context manager, to write the final vCards.
+    """
+    def __init__(self, stream, buffersize=65536):
+        self.stream = stream
+        self.buffersize = buffersize
+        self.buffer = bytearray()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.flush()
+
+    def write(self, vcard):
+        """Add the encoded `vcard` to the buffer, writing the buffer to
+        the stream if it is full."""
+        self.buffer.extend(vcard_to_bytes(vcard))
+        if len(self.buffer) >= self.buffersize:
+            self.flush()
+
+    def flush(self):
+        """Write any buffered vCards to the stream."""
+        if self.buffer:
+            self.stream.write(self.buffer)
+            self.buffer = bytearray()